@@ -0,0 +1,305 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import time                                                      # ステージごとの処理時間計測
+import asyncio                                                   # ステージの並行実行・有界キュー
+import logging                                                   # ログ出力用
+from typing import Any, Dict, List                               # 型ヒント用
+from selenium.common.exceptions import WebDriverException        # ドライバ異常の判定用
+
+from installer.src.flow.detail_page_flow import DetailPageFlow   # 1ページ分の抽出処理
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+_DONE = object()  # キューの終端を表す目印
+
+
+# **********************************************************************************
+# class定義
+class MeasuredQueue(asyncio.Queue):
+    """
+    投入のたびに待ち件数を記録する有界キュー（最大・平均の滞留件数を計測）
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.depth = {"max": 0, "samples": 0, "total": 0}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    async def put(self, item) -> None:
+        """
+        満杯なら空くまで待ってから投入し（背圧）、投入後の待ち件数を記録する
+        """
+        await super().put(item)
+        size = self.qsize()
+        self.depth["max"] = max(self.depth["max"], size)
+        self.depth["samples"] += 1
+        self.depth["total"] += size
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def average_depth(self) -> float:
+        """
+        投入時点の平均待ち件数を返す
+        """
+        return self.depth["total"] / self.depth["samples"] if self.depth["samples"] else 0.0
+
+
+# **********************************************************************************
+# class定義
+class AsyncPipelineFlow:
+    """
+    一覧巡回 → 詳細抽出 → シート書き込み の3ステージを、有界キューでつないで並行実行するフロークラス
+
+    - 一覧ステージ: 条件を順に巡回し、一覧1ページ分の詳細URLが見つかるたびに詳細キューへ流す
+      （条件をまたいで同じオークションは1回だけ流す）。条件の巡回が終わると書き込みキューへ流す
+    - 詳細ステージ: 複数ワーカーがプールのドライバ・HTTPで詳細を抽出する
+      （ドライバは1件ごとに返却し、一覧ステージのSelenium取得と取り合っても止まらないようにする）
+    - 書き込みステージ: 条件の順番どおりに、詳細が解決するたびにマイクロバッチで書き込む
+      （抽出結果は、そのキーを参照する条件をすべて書き終えた時点で手放す）
+    - キューが満杯なら前段が待つ（背圧）。Selenium・HTTP・gspreadの同期処理はスレッドで実行する
+    - ステージごとの処理件数・所要時間とキューの滞留件数をstatsに保持しログ出力する
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, main_flow, detail_queue_size: int = 200, write_queue_size: int = 4, detail_workers: int = 2):
+        """
+        コンストラクタ
+        :param main_flow: 一覧巡回・抽出部品・書き込みを提供するMainFlow
+        :param detail_queue_size: 詳細キューの上限（超えると一覧ステージが待つ）
+        :param write_queue_size: 書き込みキューの上限（条件数。超えると一覧ステージが待つ）
+        :param detail_workers: 詳細ステージのワーカー数
+        """
+        self.main_flow = main_flow
+        self.detail_queue_size = detail_queue_size
+        self.write_queue_size = write_queue_size
+        self.detail_workers = max(1, detail_workers)
+        self.stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def run(self, conditions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        パイプラインを実行し、ステージ・キューの統計を返す
+        """
+        return asyncio.run(self._run(conditions))
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def _stage_stats() -> Dict[str, Any]:
+        return {"items": 0, "seconds": 0.0, "max_seconds": 0.0}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def _record(stage: Dict[str, Any], started: float) -> None:
+        """
+        1件分の処理時間をステージ統計へ加算する
+        """
+        elapsed = time.perf_counter() - started
+        stage["items"] += 1
+        stage["seconds"] += elapsed
+        stage["max_seconds"] = max(stage["max_seconds"], elapsed)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    async def _run(self, conditions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        flow = self.main_flow
+        loop = asyncio.get_running_loop()
+        detail_queue = MeasuredQueue(self.detail_queue_size)
+        write_queue = MeasuredQueue(self.write_queue_size)
+        stages = {"list": self._stage_stats(), "detail": self._stage_stats(), "write": self._stage_stats()}
+        records: Dict[str, Dict[str, Any]] = {}   # 重複判定キー → 抽出結果（書き込み待ちの分だけ保持）
+        resolved: Dict[str, asyncio.Event] = {}   # 重複判定キー → 抽出完了（失敗含む）の通知
+        refs: Dict[str, int] = {}                 # 重複判定キー → そのキーをまだ書いていない条件数
+        seen = set()                              # 詳細ステージへ流した（または復元した）重複判定キー
+        extracted = set()                         # 抽出結果を得られた重複判定キー
+        requested = 0                             # 条件ごとの詳細URLの延べ件数
+
+        # 全条件が書き終えたキーの抽出結果を手放す（後から同じキーを参照する条件が現れたら取り直す）
+        def release(keys: List[str]) -> None:
+            for key in keys:
+                refs[key] -= 1
+                if refs[key] == 0:
+                    del refs[key]
+                    records.pop(key, None)
+                    resolved.pop(key, None)
+
+        # 前回の実行で抽出済みのレコードがあれば、詳細ステージへ流さずに使う
+        async def enqueue(urls: List[str]) -> None:
+            fresh = {}
+            for url in urls:
+                key = flow.dedup_key(url)
+                if key not in resolved and key not in fresh:
+                    # 途中経過の読み込みを待つ間に、同じキーが別のページから重ねて流れないよう先に登録する
+                    fresh[key] = url
+                    resolved[key] = asyncio.Event()
+                    seen.add(key)
+            restored = await asyncio.to_thread(flow.checkpoint.load_records, fresh) if flow.checkpoint and fresh else {}
+            for key, url in fresh.items():
+                if key in restored:
+                    records[key] = restored[key]
+                    extracted.add(key)
+                    resolved[key].set()
+                else:
+                    await detail_queue.put((key, url))
+
+        # 一覧ステージ（巡回はスレッドで行い、1ページごとに見つかったURLをイベントループ側で詳細キューへ流す）
+        async def list_stage() -> None:
+            nonlocal requested
+            try:
+                for idx, row in enumerate(conditions):
+                    plan = flow.prepare_condition(idx, row)
+                    if plan is None:
+                        continue
+                    started = time.perf_counter()
+
+                    def on_page_urls(urls: List[str]) -> None:
+                        asyncio.run_coroutine_threadsafe(enqueue(urls), loop).result()
+
+                    crawl = await asyncio.to_thread(flow.crawl_plan, plan, on_page_urls)
+                    plan["crawl"] = crawl
+                    requested += len(crawl["urls"])
+                    # 書き込みステージが書き終えるまで抽出結果を残すよう参照を数える
+                    for key in map(flow.dedup_key, crawl["urls"]):
+                        refs[key] = refs.get(key, 0) + 1
+                    # 途中経過から復元した巡回結果や、先の条件の書き込み後に手放したURLなど、未解決のURLをまとめて流す
+                    await enqueue([url for url in crawl["urls"] if flow.dedup_key(url) not in resolved])
+                    self._record(stages["list"], started)
+                    await write_queue.put(plan)
+            finally:
+                for _ in range(self.detail_workers):
+                    await detail_queue.put(_DONE)
+                await write_queue.put(_DONE)
+
+        # 詳細ステージ（ワーカーごとにDetailPageFlowを持ち、Seleniumが必要になった時点でプールからドライバを借りて1件ごとに返す）
+        async def detail_worker() -> None:
+            leased = []
+
+            def provide_driver():
+                driver = flow.driver_pool.acquire()
+                leased.append(driver)
+                return driver
+
+            detail_flow = DetailPageFlow(
+                fetcher=flow.http_fetcher,
+                driver_provider=provide_driver,
+                collect_metrics=flow.config.REPORT_PAGE_METRICS,
+                rate_limiters=flow.rate_limiters,
+                store=flow.auction_store,
+                force_refresh=flow.config.AUCTION_STORE_FORCE_REFRESH,
+                archive=flow.archive
+            )
+            try:
+                while True:
+                    item = await detail_queue.get()
+                    if item is _DONE:
+                        break
+                    key, url = item
+                    started = time.perf_counter()
+                    try:
+                        record = await asyncio.to_thread(detail_flow.extract_detail, url)
+                        records[key] = record
+                        extracted.add(key)
+                        if leased:
+                            flow.driver_pool.record_page(leased[0])
+                        if flow.checkpoint:
+                            await asyncio.to_thread(flow.checkpoint.save_record, key, url, record)
+                    except Exception as e:
+                        logger.warning(f"詳細抽出失敗 {url}: {e}")
+                        if isinstance(e, WebDriverException) and leased:
+                            # ドライバ自体の異常なので返却（リサイクル）し、次に必要になった時点で借り直す
+                            flow.driver_pool.release(leased.pop(), error=True)
+                            detail_flow.detach_driver()
+                    finally:
+                        self._record(stages["detail"], started)
+                        resolved[key].set()
+                        if leased:
+                            # 1件ごとに返却する（一覧ステージのSelenium取得が、空きを待ったまま止まらないように）
+                            flow.driver_pool.release(leased.pop())
+                            detail_flow.detach_driver()
+            finally:
+                if detail_flow.selenium_util is not None:
+                    detail_flow.selenium_util.log_stats()
+                for driver in leased:
+                    flow.driver_pool.release(driver)
+
+        # 書き込みステージ（条件の順番どおり、詳細が解決した順にマイクロバッチで書き込む）
+        async def write_stage() -> None:
+            while True:
+                plan = await write_queue.get()
+                if plan is _DONE:
+                    break
+                started = time.perf_counter()
+                keys = [flow.dedup_key(url) for url in plan["crawl"]["urls"]]
+                try:
+                    sink = await asyncio.to_thread(flow.open_plan_sink, plan)
+                except Exception as e:
+                    flow.summary["write_failures"] += 1
+                    logger.error(f"{plan['idx']+1}行目: 書き込み準備失敗: {e}")
+                    release(keys)
+                    continue
+                if sink is None:
+                    release(keys)
+                    continue
+                try:
+                    for key in keys:
+                        # 次の詳細を待つ間も、溜まった行は経過時間でフラッシュする
+                        while not resolved[key].is_set():
+                            timeout = sink.seconds_until_due()
+                            try:
+                                await asyncio.wait_for(resolved[key].wait(), timeout)
+                            except asyncio.TimeoutError:
+                                await asyncio.to_thread(sink.poll)
+                        if key in records:
+                            await asyncio.to_thread(flow.add_plan_row, plan, sink, key, records[key])
+                finally:
+                    await asyncio.to_thread(flow.finish_plan_sink, plan, sink)
+                    release(keys)
+                self._record(stages["write"], started)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            list_stage(),
+            write_stage(),
+            *(detail_worker() for _ in range(self.detail_workers))
+        )
+        elapsed = time.perf_counter() - started
+
+        flow.summary.update(
+            conditions=stages["list"]["items"],
+            detail_urls=requested,
+            unique_urls=len(seen),
+            extracted=len(extracted)
+        )
+        self.stats = {
+            "seconds": elapsed,
+            "stages": stages,
+            "queues": {
+                "detail": {"max": detail_queue.depth["max"], "average": detail_queue.average_depth()},
+                "write": {"max": write_queue.depth["max"], "average": write_queue.average_depth()},
+            },
+        }
+        self.log_stats()
+        return self.stats
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        ステージごとの平均・最大処理時間とキューの滞留件数をログ出力する
+        """
+        for name, stage in self.stats.get("stages", {}).items():
+            average = stage["seconds"] / stage["items"] if stage["items"] else 0.0
+            logger.info(
+                f"パイプライン[{name}]: {stage['items']}件 | 平均{average:.2f}秒 | 最大{stage['max_seconds']:.2f}秒"
+            )
+        for name, depth in self.stats.get("queues", {}).items():
+            logger.info(f"キュー[{name}]: 最大滞留{depth['max']}件 | 平均滞留{depth['average']:.1f}件")
+        logger.info(f"パイプライン完了: {self.stats.get('seconds', 0.0):.1f}秒")
+# **********************************************************************************
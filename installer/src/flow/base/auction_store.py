@@ -0,0 +1,119 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import json                                     # 抽出結果の保存形式
+import logging                                  # ログ出力用
+import os                                       # 保存先ディレクトリの作成
+import sqlite3                                  # ローカル保存用DB
+import threading                                # 複数ワーカーからの同時アクセス制御
+import time                                     # 保存時刻の記録
+from typing import Any, Dict, Optional          # 型ヒント用
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class AuctionStore:
+    """
+    抽出済みの詳細ページ結果を、オークションIDをキーにSQLiteへ保存するクラス
+
+    - 終了済みオークションの内容は変わらないため、一度抽出した結果は次回以降そのまま使い回せる
+    - 1つの接続を複数ワーカースレッドで共有する（ロックで直列化）
+    - ヒット・ミス・保存件数をstatsに保持する
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS auctions (
+            auction_id TEXT PRIMARY KEY,
+            url        TEXT NOT NULL,
+            record     TEXT NOT NULL,
+            stored_at  REAL NOT NULL
+        )
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, path: str = "installer/data/auction_store.sqlite3"):
+        """
+        コンストラクタ（保存先ファイルが無ければ作成する）
+        :param path: SQLiteファイルのパス（":memory:" でメモリ上に作成）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+        try:
+            directory = os.path.dirname(path)
+            if path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # 並列実行では全プロセスが同じストアへ書くため、ロック中は最大30秒待つ
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+            logger.info(f"抽出結果ストアを開きました: {path}")
+        except Exception as e:
+            logger.error(f"抽出結果ストアを開けません: {path} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def get(self, auction_id: str) -> Optional[Dict[str, Any]]:
+        """
+        保存済みの抽出結果を返す（無ければNone）。呼び出しごとにヒット/ミスを数える
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM auctions WHERE auction_id = ?", (auction_id,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def put(self, auction_id: str, url: str, record: Dict[str, Any]) -> None:
+        """
+        抽出結果を保存する（同じオークションIDは上書き）
+        """
+        payload = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO auctions (auction_id, url, record, stored_at) VALUES (?, ?, ?, ?)",
+                (auction_id, url, payload, time.time())
+            )
+            self._conn.commit()
+            self.stats["writes"] += 1
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def count(self) -> int:
+        """
+        保存済みの件数を返す
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM auctions").fetchone()[0]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        ヒット・ミス・保存件数をログ出力する
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0.0
+        logger.info(
+            f"抽出結果ストア統計: ヒット={self.stats['hits']}件 | ミス={self.stats['misses']}件"
+            f"(ヒット率{hit_rate:.1f}%) | 保存={self.stats['writes']}件 | 総件数={self.count()}件"
+        )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        DB接続を閉じる
+        """
+        with self._lock:
+            self._conn.close()
+# **********************************************************************************
@@ -0,0 +1,238 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import json                                     # 保存形式
+import logging                                  # ログ出力用
+import os                                       # 保存先ディレクトリの作成
+import sqlite3                                  # 途中経過の永続化（トランザクションで書きかけを残さない）
+import threading                                # 複数ワーカーからの同時アクセス制御
+import time                                     # 更新時刻の記録
+from datetime import datetime                   # 最新商品の終了日時の復元
+from typing import Any, Dict, Iterable, Optional, Set  # 型ヒント用
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class CheckpointStore:
+    """
+    実行途中の経過を検索条件ごとにSQLiteへ記録し、中断後の再開（--resume）で使うクラス
+
+    - 一覧巡回の結果（詳細URL・巡回ページ数）: 条件の巡回が最後まで終わった時点で記録
+    - 抽出済みレコード: 詳細ページ1件の抽出が終わるたびに記録
+    - 書き込み済みレコード: 条件のバッチ書き込みが成功するたびに記録（再開時は未書き込み分だけ書く）
+    - 書き込み済み行数: 条件の書き込みが終わった時点で記録（再開時に二重書き込みしない）
+    - 新規実行（再開でない）ではreset()で前回の経過を消してから使う
+    """
+
+    QUERY_CHUNK = 500  # IN句1回あたりのキー数
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS checkpoint_conditions (
+            condition_key TEXT PRIMARY KEY,
+            crawl         TEXT NOT NULL,
+            pages_visited INTEGER NOT NULL,
+            rows_written  INTEGER,
+            updated_at    REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS checkpoint_records (
+            record_key TEXT PRIMARY KEY,
+            url        TEXT NOT NULL,
+            record     TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS checkpoint_written (
+            condition_key TEXT NOT NULL,
+            record_key    TEXT NOT NULL,
+            PRIMARY KEY (condition_key, record_key)
+        )
+        """,
+    )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, path: str = "installer/data/crawl_state.sqlite3"):
+        """
+        コンストラクタ（保存先ファイルが無ければ作成する）
+        :param path: SQLiteファイルのパス（":memory:" でメモリ上に作成）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            directory = os.path.dirname(path)
+            if path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # 処理済み位置・検索条件キャッシュと同じファイルを複数プロセスで共有するため、ロック中は最大30秒待つ
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+        except Exception as e:
+            logger.error(f"チェックポイントの保存先を開けません: {path} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def condition_key(keyword: str, ws_name: str, start_date, end_date) -> str:
+        """
+        検索条件を一意に表すキーを返す
+        """
+        return f"{keyword}|{ws_name}|{start_date}|{end_date}"
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def reset(self) -> None:
+        """
+        前回実行の経過を全て消す（新規実行の開始時に呼ぶ）
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoint_conditions")
+            self._conn.execute("DELETE FROM checkpoint_records")
+            self._conn.execute("DELETE FROM checkpoint_written")
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def save_crawl(self, condition_key: str, crawl: Dict[str, Any], pages_visited: int) -> None:
+        """
+        条件の一覧巡回結果（{"urls", "complete", "newest"}）を記録する
+        """
+        newest = crawl.get("newest")
+        payload = dict(crawl, newest=dict(newest, end_time=newest["end_time"].isoformat()) if newest else None)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_conditions "
+                "(condition_key, crawl, pages_visited, rows_written, updated_at) VALUES (?, ?, ?, NULL, ?)",
+                (condition_key, json.dumps(payload, ensure_ascii=False), pages_visited, time.time())
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def load_crawl(self, condition_key: str) -> Optional[Dict[str, Any]]:
+        """
+        記録済みの一覧巡回結果を返す（無ければNone）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT crawl FROM checkpoint_conditions WHERE condition_key = ?", (condition_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        crawl = json.loads(row[0])
+        if crawl.get("newest"):
+            crawl["newest"]["end_time"] = datetime.fromisoformat(crawl["newest"]["end_time"])
+        return crawl
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def save_record(self, record_key: str, url: str, record: Dict[str, Any]) -> None:
+        """
+        抽出済みレコードを1件記録する（ワーカースレッドから呼ばれる）
+        """
+        payload = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_records (record_key, url, record, updated_at) VALUES (?, ?, ?, ?)",
+                (record_key, url, payload, time.time())
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def load_records(self, record_keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        指定キーのうち記録済みのレコードを {キー: レコード} で返す
+        """
+        keys = list(dict.fromkeys(record_keys))
+        records = {}
+        with self._lock:
+            # SQLiteのプレースホルダ数上限を超えないよう分割して問い合わせる
+            for start in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[start:start + self.QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT record_key, record FROM checkpoint_records WHERE record_key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                records.update((key, json.loads(record)) for key, record in rows)
+        return records
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def save_written(self, condition_key: str, record_keys: Iterable[str]) -> None:
+        """
+        条件のうち書き込みが済んだレコードを記録する（バッチ書き込みの成功ごとに呼ぶ）
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_written (condition_key, record_key) VALUES (?, ?)",
+                [(condition_key, key) for key in record_keys]
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def load_written(self, condition_key: str) -> Set[str]:
+        """
+        条件のうち書き込み済みのレコードのキーを返す
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_key FROM checkpoint_written WHERE condition_key = ?", (condition_key,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def mark_written(self, condition_key: str, rows_written: int) -> None:
+        """
+        条件の書き込み完了（書き込んだ行数）を記録する
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE checkpoint_conditions SET rows_written = ?, updated_at = ? WHERE condition_key = ?",
+                (rows_written, time.time(), condition_key)
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def is_written(self, condition_key: str) -> bool:
+        """
+        条件の書き込みが完了済みか判定する
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rows_written FROM checkpoint_conditions WHERE condition_key = ?", (condition_key,)
+            ).fetchone()
+        return row is not None and row[0] is not None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def summary(self) -> Dict[str, int]:
+        """
+        記録済みの条件数・巡回ページ数・レコード数・書き込み行数を返す
+        """
+        with self._lock:
+            conditions, pages, written = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(pages_visited), 0), COALESCE(SUM(rows_written), 0) FROM checkpoint_conditions"
+            ).fetchone()
+            records = self._conn.execute("SELECT COUNT(*) FROM checkpoint_records").fetchone()[0]
+        return {"conditions": conditions, "pages_visited": pages, "records": records, "rows_written": written}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        DB接続を閉じる
+        """
+        with self._lock:
+            self._conn.close()
+# **********************************************************************************
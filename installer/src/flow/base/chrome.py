@@ -10,12 +10,46 @@ logger = logging.getLogger(__name__)  # このモジュール専用のロガー
 # **********************************************************************************
 # class定義
 class Chrome:
+    # 軽量モードで無効化するChromeの機能（スクレイピングに不要なバックグラウンド処理）
+    LEAN_ARGUMENTS = [
+        "--disable-extensions",
+        "--disable-gpu",
+        "--disable-dev-shm-usage",
+        "--disable-background-networking",
+        "--disable-sync",
+        "--disable-default-apps",
+        "--disable-notifications",
+        "--mute-audio",
+        "--no-first-run",
+        "--blink-settings=imagesEnabled=false",
+        "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    ]
+
+    # 軽量モードでCDPによりブロックするURLパターン（画像・動画・フォント・広告/計測系ホスト）
+    # ※ 画像URLはimgのsrc属性から読むだけなので、ダウンロードを止めても取得項目に影響しない
+    LEAN_BLOCKED_URLS = [
+        "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.mp4", "*.webm", "*.m3u8",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*googletagmanager.com*",
+        "*google-analytics.com*",
+        "*yads.c.yimg.jp*",
+        "*yjtag.yahoo.co.jp*",
+        "*b92.yahoo.co.jp*",
+        "*facebook.net*",
+        "*criteo.*",
+    ]
+
     @staticmethod  # インスタンス化せずクラス名で直接呼び出し可能な静的メソッドにする
     # ------------------------------------------------------------------------------
     # 関数定義
-    def get_driver():
+    def get_driver(lean: bool = False):
         """
         Selenium Managerを使ってChromeDriverを起動し、driverオブジェクトを返す。
+        lean=Trueの場合は軽量モード（画像・メディア・フォント・広告計測のブロック、eager読み込み、
+        不要機能の無効化）で起動する。
         エラー時はloggerで記録しraiseで伝播。
         """
         try:
@@ -26,8 +60,26 @@ class Chrome:
             # 必要なら他のオプションも追加可能（例：User-Agent偽装、プロキシ設定など拡張性あり）
             options.add_argument("--headless=new")  # ヘッドレスモード（画面描画せず処理を高速化＆サーバー上でも実行可能）
 
+            if lean:
+                # DOM構築完了（DOMContentLoaded）で操作を返す。画像等のサブリソース完了を待たない
+                options.page_load_strategy = "eager"
+                for argument in Chrome.LEAN_ARGUMENTS:
+                    options.add_argument(argument)
+                # 画像・通知の読み込みをプロファイル設定でも無効化
+                options.add_experimental_option("prefs", {
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.default_content_setting_values.notifications": 2,
+                })
+
             driver = webdriver.Chrome(options=options)  # Selenium 4.6以降はSelenium Managerで自動的にドライバ管理
-            logger.info("ChromeDriverを起動しました。")  # 正常起動時はログ出力
+
+            if lean:
+                # CDPのネットワーク層でURLパターンをブロック（フォント・広告・計測スクリプト等）
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Chrome.LEAN_BLOCKED_URLS})
+                logger.info("ChromeDriverを軽量モードで起動しました。")
+            else:
+                logger.info("ChromeDriverを起動しました。")  # 正常起動時はログ出力
             return driver  # ブラウザ制御用のWebDriverオブジェクトを返却
 
         except WebDriverException as e:  # ドライバ起動失敗・異常時
@@ -36,4 +88,4 @@ class Chrome:
 
         except Exception as e:  # その他すべての想定外の例外
             logger.error(f"予期しないエラー: {e}")  # 障害調査に役立つよう詳細出力
-            raise  # 上記同様、伝播
\ No newline at end of file
+            raise  # 上記同様、伝播
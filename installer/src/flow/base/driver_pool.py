@@ -0,0 +1,233 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import queue                                  # 待機中ドライバの保管（スレッド安全なキュー）
+import time                                   # 返却待ちのタイムアウト計測
+import threading                              # 複数ワーカーからの同時貸出に備えたロック
+import logging                                # ログ出力用（貸出・再起動状況の記録）
+from contextlib import contextmanager         # with文で貸出→返却を自動化するため
+from typing import Callable, Dict, Optional   # 型ヒント用
+from selenium.webdriver.remote.webdriver import WebDriver  # ドライバ型ヒント用
+
+from installer.src.flow.base.chrome import Chrome  # 実際のChrome起動処理
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class DriverPool:
+    """
+    起動済み（ウォーム）のChromeドライバを複数保持し、検索条件や詳細ワーカーへ貸し出すプールクラス
+
+    - 条件ごとのChrome起動・終了コストを無くすため、ドライバを使い回す
+    - 一定ページ数を処理したドライバ、またはエラーが起きたドライバは破棄して作り直す（リサイクル）
+    - 貸出回数・起動回数・リサイクル回数を統計として保持し、実行終了時にログ出力する
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 200,
+        driver_factory: Optional[Callable[[], WebDriver]] = None
+    ):
+        """
+        コンストラクタ
+        :param size: 同時に保持するドライバの最大数
+        :param max_pages: 1ドライバで処理するページ数の上限（超えたらリサイクル）
+        :param driver_factory: ドライバ生成関数（省略時はChrome.get_driver）
+        """
+        if size < 1:
+            raise ValueError(f"ドライバプールのサイズは1以上である必要があります: {size}")
+        self.size = size                                  # 最大保持数
+        self.max_pages = max_pages                        # リサイクルまでのページ数
+        self._factory = driver_factory or Chrome.get_driver  # ドライバ生成関数
+        self._idle: "queue.LifoQueue[WebDriver]" = queue.LifoQueue()  # 待機中ドライバ（直近に使ったものを優先）
+        self._pages: Dict[int, int] = {}                  # id(driver) → 処理ページ数
+        self._broken: set = set()                         # エラーで破棄予定のドライバid
+        self._created = 0                                 # 現在生存しているドライバ数
+        self._lock = threading.Lock()                     # 統計・生存数更新用のロック
+        self._closed = False                              # close済みフラグ
+        self.stats = {"leases": 0, "launches": 0, "recycles": 0}  # プール統計
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _launch(self) -> WebDriver:
+        """
+        新しいドライバを起動し、ページ数カウンタを初期化する
+        """
+        driver = self._factory()
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.stats["launches"] += 1
+        logger.debug(f"ドライバ起動: 生存数={self._created}/{self.size}")
+        return driver
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def warm_up(self) -> None:
+        """
+        最大数までドライバを事前起動し、待機キューへ入れておく
+        """
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    break
+                self._created += 1
+            try:
+                self._idle.put(self._launch())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        logger.info(f"ドライバプール準備完了: {self.size}台")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        ドライバを1台借りる（待機中があればそれを、なければ上限まで新規起動、上限なら返却待ち）
+        :param timeout: 返却待ちの最大秒数（Noneなら無制限）
+        :return: WebDriver
+        """
+        if self._closed:
+            raise RuntimeError("ドライバプールは既にcloseされています")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_launch = self._created < self.size
+                if can_launch:
+                    self._created += 1
+            if can_launch:
+                try:
+                    driver = self._launch()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                break
+
+            # 上限まで貸出中なので返却を待つ（リサイクルで枠が空いた場合に備え短い間隔で再確認）
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"ドライバの返却待ちがタイムアウトしました: {timeout}秒")
+            try:
+                driver = self._idle.get(timeout=0.5)
+                break
+            except queue.Empty:
+                continue
+
+        with self._lock:
+            self.stats["leases"] += 1
+        return driver
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def record_page(self, driver: WebDriver, count: int = 1) -> None:
+        """
+        ドライバが処理したページ数を加算する（リサイクル判定に使用）
+        """
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + count
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def mark_broken(self, driver: WebDriver) -> None:
+        """
+        ドライバを異常扱いにし、返却時に必ずリサイクルさせる
+        """
+        with self._lock:
+            self._broken.add(id(driver))
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def release(self, driver: WebDriver, error: bool = False) -> None:
+        """
+        借りたドライバを返却する。エラー時・ページ数上限到達時は破棄する
+        :param driver: 返却するドライバ
+        :param error: Trueなら異常とみなしてリサイクル
+        """
+        with self._lock:
+            pages = self._pages.get(id(driver), 0)
+            broken = error or id(driver) in self._broken
+            recycle = broken or pages >= self.max_pages or self._closed
+
+        if not recycle:
+            self._idle.put(driver)
+            return
+
+        reason = "エラー" if broken else ("close済み" if self._closed else f"{pages}ページ処理")
+        logger.info(f"ドライバをリサイクルします（理由: {reason}）")
+        self._quit(driver)
+        with self._lock:
+            self._created -= 1
+            if not self._closed:
+                self.stats["recycles"] += 1
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        with文でドライバを借りる。ブロック内で例外が出た場合はリサイクルして再送出する
+            with pool.lease() as driver:
+                driver.get(url)
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, error=True)
+            raise
+        else:
+            self.release(driver)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _quit(self, driver: WebDriver) -> None:
+        """
+        ドライバを終了する（終了時の例外はログのみ）
+        """
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._broken.discard(id(driver))
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"ドライバ終了時にエラー: {e}")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        待機中のドライバを全て終了する（貸出中のものは返却時に終了される）
+        """
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+            with self._lock:
+                self._created -= 1
+        logger.info("ドライバプールをcloseしました")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        プール統計（貸出・起動・リサイクル回数）をログ出力する
+        """
+        logger.info(
+            f"ドライバプール統計: 貸出={self.stats['leases']}回 | "
+            f"起動={self.stats['launches']}回 | リサイクル={self.stats['recycles']}回"
+        )
+# **********************************************************************************
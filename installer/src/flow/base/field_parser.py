@@ -0,0 +1,121 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                       # ログ出力用
+from typing import Any, Dict, Iterable, Optional     # 型ヒント用
+
+from installer.src.utils.text_utils import AuctionIdExtractor  # URLからオークションIDを抽出
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class DetailFieldParser:
+    """
+    詳細ページから取り出した生テキストを、各項目の値に整形する純粋関数ユーティリティクラス
+
+    - Selenium経由・HTTP(lxml)経由のどちらで取得したテキストにも同じルールを適用する
+    - ページアクセスは一切しない（副作用なし）
+    """
+
+    PREFERRED_IMAGE_KEY = "i-img1200x900"   # 優先する高解像度画像のURL識別子
+    END_DATE_KEYWORDS = ("終了", "時")        # 終了日時テキストの判定キーワード
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def parse_title(text: Optional[str]) -> Optional[str]:
+        """
+        タイトル文字列の前後空白を除去する（空ならNone）
+        """
+        title = (text or "").strip()
+        return title or None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def parse_price(text: Optional[str]) -> Optional[int]:
+        """
+        価格テキスト（例: "51,700円"）からカンマ・"円"を除去してintで返す（取得できなければNone）
+        """
+        price_text = (text or "").strip().replace(",", "").replace("円", "").strip()
+        if not price_text:
+            return None
+        try:
+            return int(price_text)
+        except ValueError:
+            logger.warning(f"価格テキストを数値化できません: {text!r}")
+            return None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def pick_image_url(cls, srcs: Iterable[Optional[str]], fallback: Optional[str] = None) -> Optional[str]:
+        """
+        画像URL候補から1200x900サイズを優先して1つ選ぶ（無ければfallbackを返す）
+        :param srcs: ページ内imgのsrc一覧
+        :param fallback: 優先画像が無い場合に使う従来セレクタの画像URL
+        """
+        for src in srcs:
+            if src and cls.PREFERRED_IMAGE_KEY in src:
+                return src
+        return fallback or None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def pick_end_date(cls, texts: Iterable[Optional[str]]) -> Optional[str]:
+        """
+        候補テキストの中から「終了」または「時」を含む最初のものを終了日時として返す
+        """
+        for text in texts:
+            text = (text or "").strip()
+            if any(keyword in text for keyword in cls.END_DATE_KEYWORDS):
+                return text
+        return None
+
+
+# **********************************************************************************
+# class定義
+class ListFieldParser:
+    """
+    一覧ページの商品カード1件分の生データを、構造化された辞書に整形する純粋関数ユーティリティクラス
+
+    - Selenium（一括スクリプト）経由・HTTP(lxml)経由のどちらにも同じ整形ルールを適用する
+    """
+
+    # 1件として扱うために必須の項目
+    REQUIRED_ITEM_FIELDS = ("url", "end_time")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def build_item(
+        url: Optional[str],
+        end_time: Optional[str],
+        title: Optional[str] = None,
+        price_text: Optional[str] = None,
+        auction_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        商品カード1件分の値を整形して辞書で返す
+        :return: {"url", "auction_id", "end_time", "title", "price"}（取れなかった項目はNone）
+        """
+        url = (url or "").strip() or None
+        return {
+            "url": url,
+            "auction_id": (auction_id or "").strip() or AuctionIdExtractor.extract(url),
+            "end_time": (end_time or "").strip() or None,
+            "title": DetailFieldParser.parse_title(title),
+            "price": DetailFieldParser.parse_price(price_text),
+        }
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def is_complete(cls, item: Dict[str, Any]) -> bool:
+        """
+        商品カードに必須項目（URL・終了日時）が揃っているか判定する
+        """
+        return all(item.get(name) for name in cls.REQUIRED_ITEM_FIELDS)
+# **********************************************************************************
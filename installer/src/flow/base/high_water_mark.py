@@ -0,0 +1,114 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                  # ログ出力用
+import os                                       # 保存先ディレクトリの作成
+import sqlite3                                  # ローカル保存用DB
+import threading                                # 同時アクセス制御
+import time                                     # 更新時刻の記録
+from datetime import date, datetime             # 日付・日時の型
+from typing import Any, Dict, Optional          # 型ヒント用
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class HighWaterMarkStore:
+    """
+    検索条件（キーワード＋出力先シート）ごとに、処理済みの最新オークションを記録するクラス
+
+    - 記録内容: 最新の終了日時・オークションID・処理済み範囲の開始日（covered_from）
+    - 「covered_from 〜 最新の終了日時」の期間は全件処理済みという意味で、
+      次回は一覧の巡回をこの位置で打ち切れる（新しく終了したオークションだけ取得する）
+    - 検索期間の開始日が covered_from より前に広がった場合は、未処理の期間があるため記録を使わない
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS high_water_marks (
+            keyword      TEXT NOT NULL,
+            ws_name      TEXT NOT NULL,
+            end_time     TEXT NOT NULL,
+            auction_id   TEXT,
+            covered_from TEXT NOT NULL,
+            updated_at   REAL NOT NULL,
+            PRIMARY KEY (keyword, ws_name)
+        )
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, path: str = "installer/data/crawl_state.sqlite3"):
+        """
+        コンストラクタ（保存先ファイルが無ければ作成する）
+        :param path: SQLiteファイルのパス（":memory:" でメモリ上に作成）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            directory = os.path.dirname(path)
+            if path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # チェックポイントと同じファイルを複数プロセスで共有するため、WALにしてロック中は最大30秒待つ
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+        except Exception as e:
+            logger.error(f"処理済み位置の保存先を開けません: {path} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def get(self, keyword: str, ws_name: str, start_date: date) -> Optional[Dict[str, Any]]:
+        """
+        検索条件の処理済み位置を返す（未記録、または開始日が処理済み範囲より前に広がった場合はNone）
+        :return: {"end_time": datetime, "auction_id": str|None, "covered_from": date}
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT end_time, auction_id, covered_from FROM high_water_marks WHERE keyword = ? AND ws_name = ?",
+                (keyword, ws_name)
+            ).fetchone()
+        if row is None:
+            return None
+        mark = {
+            "end_time": datetime.fromisoformat(row[0]),
+            "auction_id": row[1],
+            "covered_from": date.fromisoformat(row[2]),
+        }
+        if start_date < mark["covered_from"]:
+            logger.info(f"検索開始日が処理済み範囲より前のため全件巡回します: {keyword} | {ws_name}")
+            return None
+        return mark
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def save(
+        self,
+        keyword: str,
+        ws_name: str,
+        end_time: datetime,
+        auction_id: Optional[str],
+        covered_from: date
+    ) -> None:
+        """
+        検索条件の処理済み位置を保存する（既存の記録は上書き）
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO high_water_marks "
+                "(keyword, ws_name, end_time, auction_id, covered_from, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (keyword, ws_name, end_time.isoformat(), auction_id, covered_from.isoformat(), time.time())
+            )
+            self._conn.commit()
+        logger.info(f"処理済み位置を更新: {keyword} | {ws_name} | {end_time} ({auction_id})")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        DB接続を閉じる
+        """
+        with self._lock:
+            self._conn.close()
+# **********************************************************************************
@@ -0,0 +1,157 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                 # ログ出力用
+from typing import Any, Dict, List, Optional   # 型ヒント用
+from lxml import etree, html as lxml_html      # 高速HTMLパーサ（コンパイル済みXPathを使用）
+
+from installer.src.flow.base.field_parser import DetailFieldParser, ListFieldParser  # 生テキスト→値の整形ルール
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def _has_class(*names: str) -> str:
+    """
+    CSSのクラス指定（.a.b）と同じ判定をするXPath条件式を返す
+    """
+    return " and ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in names
+    )
+
+
+# **********************************************************************************
+# class定義
+class HtmlParser:
+    """
+    HTTPで取得したHTMLから、Seleniumクラスと同じ項目を抽出するパーサクラス
+
+    - 一覧ページ: 終了日時・詳細URL（Selenium.get_auction_end_dates / get_auction_urls 相当）、
+      商品カード単位の構造化データ（Selenium.get_list_items 相当）
+    - 詳細ページ: タイトル・価格・画像URL・終了日時（get_title / get_price / get_image_url / get_detail_end_date 相当）
+    - セレクタはクラス定義時に一度だけXPathへコンパイルして使い回す
+    - 取得できなかった項目はNone（または空リスト）で返し、フォールバック判定は呼び出し側で行う
+    """
+
+    # 一覧ページ用セレクタ（li.Product単位のカードと、カード内の .Product__time / a.Product__titleLink）
+    LIST_CARDS = etree.XPath(f"//li[{_has_class('Product')}]")
+    CARD_LINK = etree.XPath(f".//a[{_has_class('Product__titleLink')}]")
+    CARD_TIME = etree.XPath(f".//*[{_has_class('Product__time')}]")
+    CARD_PRICE = etree.XPath(f".//*[{_has_class('Product__priceValue')}]")
+    LIST_END_DATES = etree.XPath(f"//*[{_has_class('Product__time')}]")
+    LIST_URLS = etree.XPath(f"//a[{_has_class('Product__titleLink')}]/@href")
+    LIST_NEXT_URL = etree.XPath(f"//li[{_has_class('Pager__list--next')}]//a/@href")
+
+    # 詳細ページ用セレクタ（Selenium側と同じクラス名）
+    DETAIL_TITLE = etree.XPath(f"//h1[{_has_class('gv-u-fontSize16--_aSkEz8L_OSLLKFaubKB')}]")
+    DETAIL_PRICE = etree.XPath(f"//span[{_has_class('sc-1f0603b0-2', 'kxUAXU')}]")
+    DETAIL_IMAGES = etree.XPath("//img/@src")
+    DETAIL_FALLBACK_IMAGE = etree.XPath(f"//img[{_has_class('sc-7f8d3a42-4', 'gOFKtZ')}]/@src")
+    DETAIL_END_DATES = etree.XPath(
+        f"//span[{_has_class('gv-u-fontSize12--s5WnvVgDScOXPWU7Mgqd', 'gv-u-colorTextGray--OzMlIYwM3n8ZKUl0z2ES')}]"
+    )
+
+    # 詳細ページで必須の項目（1つでも欠けたらSeleniumへフォールバック）
+    REQUIRED_DETAIL_FIELDS = ("title", "price", "image_url", "end_date")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def _document(html: str, base_url: Optional[str] = None):
+        """
+        HTML文字列をlxmlのドキュメントへ変換（base_url指定時は相対リンクを絶対URL化）
+        """
+        doc = lxml_html.fromstring(html)
+        if base_url:
+            doc.make_links_absolute(base_url)
+        return doc
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def _texts(elements) -> List[str]:
+        """
+        要素リストから空でないテキストだけを取り出す
+        """
+        texts = []
+        for el in elements:
+            text = el.text_content().strip()
+            if text:
+                texts.append(text)
+        return texts
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def parse_list_page(self, html: str, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        一覧ページのHTMLから終了日時リスト・詳細URLリスト・「次へ」リンクを抽出する
+        :return: {"end_dates": [...], "urls": [...], "next_url": str|None}
+        """
+        doc = self._document(html, base_url)
+        end_dates = self._texts(self.LIST_END_DATES(doc))
+        urls = [href for href in self.LIST_URLS(doc) if href]
+        next_urls = self.LIST_NEXT_URL(doc)
+        logger.debug(f"一覧ページ解析: 終了日時={len(end_dates)}件 | URL={len(urls)}件")
+        return {"end_dates": end_dates, "urls": urls, "next_url": next_urls[0] if next_urls else None}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def parse_list_items(self, html: str, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        一覧ページのHTMLから商品カード単位の構造化データを抽出する（Selenium.get_list_items相当）
+        :return: {"items": [{"url", "auction_id", "end_time", "title", "price"}, ...], "next_url": str|None}
+        """
+        doc = self._document(html, base_url)
+        items = []
+        for card in self.LIST_CARDS(doc):
+            links = self.CARD_LINK(card)
+            link = links[0] if links else None
+            times = self._texts(self.CARD_TIME(card))
+            prices = self._texts(self.CARD_PRICE(card))
+            item = ListFieldParser.build_item(
+                url=link.get("href") if link is not None else None,
+                end_time=times[0] if times else None,
+                title=(link.get("title") or link.text_content()) if link is not None else None,
+                price_text=prices[0] if prices else None,
+                auction_id=link.get("data-auction-id") if link is not None else None,
+            )
+            if item["url"]:
+                items.append(item)
+        next_urls = self.LIST_NEXT_URL(doc)
+        logger.debug(f"一覧ページ解析（カード単位）: {len(items)}件")
+        return {"items": items, "next_url": next_urls[0] if next_urls else None}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def parse_detail_page(self, html: str, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        詳細ページのHTMLからタイトル・価格・画像URL・終了日時を抽出する
+        :return: {"title": str|None, "price": int|None, "image_url": str|None, "end_date": str|None}
+        """
+        doc = self._document(html, base_url)
+        titles = self._texts(self.DETAIL_TITLE(doc))
+        prices = self._texts(self.DETAIL_PRICE(doc))
+        fallback_images = self.DETAIL_FALLBACK_IMAGE(doc)
+
+        fields = {
+            "title": DetailFieldParser.parse_title(titles[0] if titles else None),
+            "price": DetailFieldParser.parse_price(prices[0] if prices else None),
+            "image_url": DetailFieldParser.pick_image_url(
+                self.DETAIL_IMAGES(doc),
+                fallback=fallback_images[0] if fallback_images else None
+            ),
+            "end_date": DetailFieldParser.pick_end_date(self._texts(self.DETAIL_END_DATES(doc))),
+        }
+        logger.debug(f"詳細ページ解析: {fields}")
+        return fields
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def missing_fields(cls, fields: Dict[str, Any]) -> List[str]:
+        """
+        詳細ページ解析結果のうち、値が取れていない必須項目名を返す
+        """
+        return [name for name in cls.REQUIRED_DETAIL_FIELDS if fields.get(name) in (None, "")]
+# **********************************************************************************
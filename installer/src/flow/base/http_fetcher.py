@@ -0,0 +1,124 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                   # ログ出力用（取得状況・エラーの記録）
+import re                                        # ページタイトルの抽出（ブロック画面判定）
+import requests                                  # HTTPクライアント（keep-aliveセッション）
+from requests.adapters import HTTPAdapter        # コネクションプール設定用
+from urllib3.util.retry import Retry             # 一時的な通信エラー時の自動再試行
+
+from installer.src.flow.base.rate_limiter import BlockedPageError, HostRateLimiters  # ホスト単位のリクエスト間隔制御
+from installer.src.flow.base.page_archive import PageArchive                         # 取得ページの保存・オフライン再生
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class HttpFetcher:
+    """
+    ヘッドレスChromeを使わずにページHTMLを取得するHTTPクライアントクラス
+
+    - requests.Sessionを1つ保持し、keep-alive接続をコネクションプールで使い回す
+    - 接続エラーや5xxは数回まで自動再試行
+    - 取得失敗時はエラーログ＋raise（呼び出し側でSeleniumへフォールバックする想定）
+    - リクエスト前にホスト単位のレート制御トークンを取得し、応答結果（403/429・ブロック画面・エラー）を報告する
+    - PageArchiveを渡すと取得したHTMLを保存し、再生モードではネットワークの代わりにアーカイブから返す
+    """
+
+    DEFAULT_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "ja,en-US;q=0.8,en;q=0.6",
+    }
+
+    TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)  # ブロック画面判定用
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 15.0,
+        retries: int = 2,
+        rate_limiters: HostRateLimiters = None,
+        archive: PageArchive = None
+    ):
+        """
+        コンストラクタ
+        :param pool_size: ホストごとに保持するkeep-alive接続数（並行ワーカー数以上を推奨）
+        :param timeout: 1リクエストのタイムアウト秒
+        :param retries: 接続エラー・5xx時の再試行回数
+        :param rate_limiters: ホスト単位のレート制御（Seleniumと共有する。省略時はこのインスタンス専用）
+        :param archive: 取得ページの保存先（再生モードならネットワークにアクセスしない）
+        """
+        self.timeout = timeout
+        self.rate_limiters = rate_limiters or HostRateLimiters()
+        self.archive = archive
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def fetch(self, url: str) -> str:
+        """
+        指定URLのHTMLを取得して文字列で返す
+        :param url: 取得するページのURL
+        :return: HTML文字列
+        :raises BlockedPageError: 403/429やアクセス制限画面を検知した場合
+        :raises ArchiveMissError: 再生モードでアーカイブに無いURLの場合
+        """
+        if self.archive and self.archive.replay:
+            return self.archive.load(url)
+        self.rate_limiters.acquire(url)
+        try:
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException:
+                self.rate_limiters.on_error(url)
+                raise
+            if response.status_code in HostRateLimiters.BLOCK_STATUS_CODES:
+                self.rate_limiters.on_error(url)
+                raise BlockedPageError(f"アクセス制限を検知しました: HTTP {response.status_code}")
+            try:
+                response.raise_for_status()
+            except requests.HTTPError:
+                if response.status_code >= 500:
+                    self.rate_limiters.on_error(url)
+                raise
+            # Content-Typeに文字コードが無い場合も文字化けしないよう推定値を使う
+            if not response.encoding or response.encoding.lower() == "iso-8859-1":
+                response.encoding = response.apparent_encoding
+            text = response.text
+            title = self.TITLE_PATTERN.search(text)
+            if title and HostRateLimiters.is_blocked_text(title.group(1)):
+                self.rate_limiters.on_error(url)
+                raise BlockedPageError("アクセス制限画面を検知しました")
+            self.rate_limiters.on_success(url)
+            if self.archive:
+                self.archive.save(url, text)
+            logger.debug(f"HTTP取得成功: {url} ({len(response.content)} bytes)")
+            return text
+        except Exception as e:
+            logger.error(f"HTTP取得失敗: {url} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        セッション（コネクションプール）を閉じる
+        """
+        self.session.close()
+# **********************************************************************************
@@ -0,0 +1,187 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import hashlib                                  # 内容ハッシュ（保存ファイル名）
+import logging                                  # ログ出力用
+import os                                       # 保存先ディレクトリ・ファイル操作
+import sqlite3                                  # URL → ハッシュ の索引
+import threading                                # 複数ワーカーからの同時アクセス制御
+import time                                     # 保存時刻の記録
+from typing import Iterator, Optional, Tuple  # 型ヒント用
+
+try:
+    import zstandard                            # ページHTMLの圧縮（アーカイブ使用時のみ必要）
+except ImportError:  # アーカイブを使わない環境では未インストールでも動かせるようにする
+    zstandard = None
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class ArchiveMissError(Exception):
+    """
+    再生モードで、要求されたURLがアーカイブに無いことを表す例外
+    """
+
+
+# **********************************************************************************
+# class定義
+class PageArchive:
+    """
+    取得した一覧・詳細ページのHTMLをzstd圧縮で保存し、オフラインで再生するためのクラス
+
+    - 本体はHTMLのSHA-256をファイル名にして保存（同じ内容は1回だけ保存される）
+    - URL → ハッシュ の索引をSQLiteで持ち、同じURLは最新の取得内容で上書きする
+    - replay=True の場合、HttpFetcher・Seleniumはネットワークの代わりにここからHTMLを読む
+    - セレクタが壊れた際に、保存済みページでパーサを再実行・計測できる（iter_pages）
+    """
+
+    COMPRESSION_LEVEL = 10  # zstdの圧縮レベル（HTMLは繰り返しが多く、10前後で十分縮む）
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            url        TEXT PRIMARY KEY,
+            digest     TEXT NOT NULL,
+            kind       TEXT NOT NULL,
+            size       INTEGER NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, root: str = "installer/data/archive", replay: bool = False):
+        """
+        コンストラクタ（保存先が無ければ作成する）
+        :param root: アーカイブの保存先ディレクトリ
+        :param replay: Trueならネットワークの代わりにアーカイブからページを返す再生モード
+        """
+        if zstandard is None:
+            raise ImportError("ページアーカイブには zstandard が必要です（pip install zstandard）")
+        self.root = root
+        self.replay = replay
+        self._lock = threading.Lock()
+        self.stats = {"saved": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0, "replayed": 0, "missed": 0}
+        try:
+            os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+            # 並列実行では各プロセスが同じ索引へ書くため、WALにしてロック中は最大30秒待つ
+            self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+            logger.info(f"ページアーカイブを開きました: {root}（{'再生' if replay else '記録'}モード）")
+        except Exception as e:
+            logger.error(f"ページアーカイブを開けません: {root} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def classify(url: str) -> str:
+        """
+        URLからページ種別（"detail" / "list"）を判定する
+        """
+        return "detail" if "/auction/" in url else "list"
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _object_path(self, digest: str) -> str:
+        """
+        ハッシュ値から本体ファイルのパスを返す（先頭2文字でディレクトリを分ける）
+        """
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.html.zst")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def save(self, url: str, html: str) -> str:
+        """
+        ページHTMLを保存し、索引を更新する
+        :return: 保存内容のハッシュ値
+        """
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest)
+        stored = 0
+        if not os.path.exists(path):
+            compressed = zstandard.ZstdCompressor(level=self.COMPRESSION_LEVEL).compress(raw)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(temp_path, path)  # 書きかけのファイルを読まれないよう置き換えで確定
+            stored = len(compressed)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, digest, kind, size, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, self.classify(url), len(raw), time.time())
+            )
+            self._conn.commit()
+            if stored:
+                self.stats["saved"] += 1
+                self.stats["raw_bytes"] += len(raw)
+                self.stats["stored_bytes"] += stored
+            else:
+                self.stats["deduplicated"] += 1
+        return digest
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _read(self, digest: str) -> str:
+        """
+        ハッシュ値の本体を読み込み、展開したHTMLを返す
+        """
+        with open(self._object_path(digest), "rb") as f:
+            return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def load(self, url: str) -> str:
+        """
+        URLの保存済みHTMLを返す（再生モード用）
+        :raises ArchiveMissError: アーカイブに無いURLの場合
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                self.stats["missed"] += 1
+                raise ArchiveMissError(f"アーカイブに無いURLです: {url}")
+            self.stats["replayed"] += 1
+        return self._read(row[0])
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def iter_pages(self, kind: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        保存済みページを (URL, HTML) で順に返す（パーサの再実行・計測用）
+        :param kind: "detail" / "list" で絞り込み（Noneなら全件）
+        """
+        with self._lock:
+            if kind:
+                rows = self._conn.execute("SELECT url, digest FROM pages WHERE kind = ? ORDER BY url", (kind,)).fetchall()
+            else:
+                rows = self._conn.execute("SELECT url, digest FROM pages ORDER BY url").fetchall()
+        for url, digest in rows:
+            yield url, self._read(digest)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        保存・重複・圧縮率・再生件数をログ出力する
+        """
+        ratio = self.stats["stored_bytes"] / self.stats["raw_bytes"] * 100 if self.stats["raw_bytes"] else 0.0
+        logger.info(
+            f"ページアーカイブ統計: 保存={self.stats['saved']}件(圧縮後{ratio:.1f}%) | 同一内容={self.stats['deduplicated']}件 | "
+            f"再生={self.stats['replayed']}件 | 未保存={self.stats['missed']}件"
+        )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        索引DBの接続を閉じる
+        """
+        with self._lock:
+            self._conn.close()
+# **********************************************************************************
@@ -0,0 +1,167 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                                   # ログ出力用
+from collections import deque                                    # 先読み中ページの管理
+from concurrent.futures import Future, ThreadPoolExecutor        # 複数ページの同時取得
+from typing import Any, Callable, Dict, Iterator, List, Tuple    # 型ヒント用
+
+from installer.src.flow.base.url_builder import UrlBuilder       # ページURLの生成
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class Paginator:
+    """
+    検索結果の一覧ページを、「次へ」クリックではなく開始位置（bパラメータ）からURLを直接組み立てて巡回するクラス
+
+    - 1ページの件数はサイト上限（UrlBuilder.MAX_PAGE_SIZE）まで指定可能
+    - concurrency>1 なら後続ページを先読みで同時取得し、結果はページ順に返す
+    - 件数が1ページ分に満たないページ（空ページ含む）を最終ページとして巡回を終了する
+    - 呼び出し側がforループを途中で抜ければ、それ以降のページは取得しない（先読み分のみ無駄になる）
+    - seek_first_pageで、終了日時の新しい順に並んだ結果から対象期間の先頭ページを
+      ギャロッピング探索＋二分探索で直接求められる（探索で取得したページは巡回時に再取得しない）
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        url_builder: UrlBuilder,
+        page_loader: Callable[[str], List[Dict[str, Any]]],
+        per_page: int = UrlBuilder.MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        max_pages: int = 100
+    ):
+        """
+        コンストラクタ
+        :param url_builder: ページURLを生成するUrlBuilder
+        :param page_loader: ページURLを受け取り商品カードのリストを返す関数（複数スレッドから呼ばれる）
+        :param per_page: 1ページの件数（n パラメータ）
+        :param concurrency: 同時に取得するページ数（1なら逐次取得）
+        :param max_pages: 巡回するページ数の上限（暴走防止）
+        """
+        self.url_builder = url_builder
+        self.page_loader = page_loader
+        self.per_page = max(1, min(per_page, UrlBuilder.MAX_PAGE_SIZE))
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.pages_fetched = 0  # 直近の巡回で取得したページ数（先読み分を含む）
+        self.probes = 0         # 直近のseek_first_pageで取得したページ数
+        self._cache: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}  # 探索で取得済みのページ
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def page_url(self, keyword: str, page_index: int) -> str:
+        """
+        0始まりのページ番号からページURLを返す
+        """
+        return self.url_builder.build_page_url(keyword, page_index, per_page=self.per_page)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def is_last_page(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        1ページ分に満たない（空を含む）ページなら最終ページと判定する
+        """
+        return len(items) < self.per_page
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _probe(self, keyword: str, page_index: int) -> List[Dict[str, Any]]:
+        """
+        探索用に1ページ取得し、巡回時に使い回せるようキャッシュする
+        """
+        key = (keyword, page_index)
+        if key not in self._cache:
+            self._cache[key] = self.page_loader(self.page_url(keyword, page_index))
+            self.probes += 1
+            logger.debug(f"探索ページ取得: {keyword} | {page_index + 1}ページ目 | {len(self._cache[key])}件")
+        return self._cache[key]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def seek_first_page(self, keyword: str, is_before_window: Callable[[List[Dict[str, Any]]], bool]) -> int:
+        """
+        is_before_window（ページ全体が対象期間より新しいならTrue）がFalseになる最初のページ番号を返す
+        結果は終了日時の新しい順なので、判定は「True…True, False…False」と単調に並ぶ前提で、
+        0, 1, 3, 7, 15… とページ番号を倍々に広げて（ギャロッピング）境界を挟み、間を二分探索する
+        :param keyword: 検索キーワード
+        :param is_before_window: 商品カードのリストを受け取り、全件が対象期間より新しければTrueを返す関数
+        :return: 巡回を開始すべきページ番号（0始まり）
+        """
+        self.probes = 0
+
+        # 判定がFalseのページ（空・最終ページを含む）が見つかるまで倍々に探索
+        lo = -1  # 対象期間より新しいと確定した最後のページ
+        hi = 0   # 判定がFalseになったページ（上限）
+        while True:
+            if hi >= self.max_pages:
+                hi = self.max_pages
+                break
+            items = self._probe(keyword, hi)
+            if not items or not is_before_window(items):
+                break
+            lo = hi
+            if self.is_last_page(items):
+                # 最終ページまで全て対象期間より新しい
+                hi = lo + 1
+                break
+            hi = hi * 2 + 1
+
+        # lo（True）と hi（False）の間を二分探索して境界を求める
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            items = self._probe(keyword, mid)
+            if items and is_before_window(items):
+                lo = mid
+            else:
+                hi = mid
+
+        logger.info(f"開始ページ探索: {keyword} | 開始={hi + 1}ページ目 | 探索取得={self.probes}ページ")
+        return hi
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def iter_pages(self, keyword: str, start_page: int = 0) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        start_pageから順に (ページ番号, 商品カードのリスト) を返すジェネレータ
+        :param keyword: 検索キーワード
+        :param start_page: 巡回を開始するページ番号（0始まり）
+        """
+        self.pages_fetched = 0
+        end_page = start_page + self.max_pages
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="list-page") as executor:
+            in_flight = deque()  # (ページ番号, Future) をページ順に保持
+            next_page = start_page
+            try:
+                while True:
+                    # 同時取得数まで先読みを投入
+                    while len(in_flight) < self.concurrency and next_page < end_page:
+                        cached = self._cache.pop((keyword, next_page), None)
+                        if cached is not None:
+                            # 探索で取得済みのページは再取得しない
+                            future = Future()
+                            future.set_result(cached)
+                        else:
+                            future = executor.submit(self.page_loader, self.page_url(keyword, next_page))
+                        in_flight.append((next_page, future))
+                        next_page += 1
+                    if not in_flight:
+                        logger.warning(f"ページ数上限({self.max_pages})に達したため巡回を終了: {keyword}")
+                        return
+
+                    page_index, future = in_flight.popleft()
+                    items = future.result()
+                    self.pages_fetched += 1
+                    logger.debug(f"一覧ページ取得: {keyword} | {page_index + 1}ページ目 | {len(items)}件")
+                    yield page_index, items
+                    if self.is_last_page(items):
+                        return
+            finally:
+                # 途中終了時は未着手の先読みを取り消す（実行中のものは完了を待って破棄）
+                for _, future in in_flight:
+                    future.cancel()
+                self._cache.clear()
+# **********************************************************************************
@@ -0,0 +1,256 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import os                                       # 保存先ディレクトリ・ファイル操作
+import re                                       # IMAGE関数からのURL取り出し・パーティション名の整形
+import time                                     # 取得時刻の記録
+import uuid                                     # 出力ファイル名（プロセス・実行をまたいで衝突しない）
+import hashlib                                  # パーティション名の衝突回避
+import logging                                  # ログ出力用
+import threading                                # 複数スレッドからの追加を排他制御
+from datetime import date, datetime             # 終了日の型変換
+from typing import Any, Dict, List, Optional, Tuple  # 型ヒント用
+import pandas as pd                             # コンパクション時の重複除去
+
+try:
+    import pyarrow as pa                        # 列指向の表データ（Parquet出力時のみ必要）
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet出力を使わない環境では未インストールでも動かせるようにする
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class ParquetSink:
+    """
+    抽出結果を分析用にParquetファイルへ追記するクラス（シート書き込みとは別の出力先）
+
+    - 終了月・検索条件でパーティション分けする（root/end_month=YYYY-MM/condition=<条件>/part-*.parquet）
+      pyarrow.dataset / DuckDB / pandas からHive形式のパーティションとしてそのまま読める
+    - 実行ごと・flushごとに新しいファイルを書く（既存ファイルは書き換えない）
+    - 小さなファイルが増えたパーティションは compact() で1ファイルにまとめる（同じオークションの重複も除く）
+    """
+
+    IMAGE_URL = re.compile(r'^=IMAGE\("([^"]*)"')  # IMAGE関数の第1引数（画像URL）
+    COMPRESSION = "zstd"
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, root: str = "installer/data/parquet", rows_per_file: int = 100000):
+        """
+        コンストラクタ（保存先が無ければ作成する）
+        :param root: 出力先ディレクトリ
+        :param rows_per_file: 1パーティションのバッファがこの行数に達したらファイルに書き出す
+        """
+        if pa is None:
+            raise ImportError("Parquet出力には pyarrow が必要です（pip install pyarrow）")
+        self.root = root
+        self.rows_per_file = max(1, rows_per_file)
+        self._lock = threading.Lock()
+        self._buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.stats = {"rows": 0, "files": 0, "skipped": 0}
+        self.schema = pa.schema([
+            ("end_date", pa.date32()),
+            ("title", pa.string()),
+            ("price", pa.int64()),
+            ("ct", pa.float64()),
+            ("1ct_price", pa.float64()),
+            ("image_url", pa.string()),
+            ("auction_id", pa.string()),
+            ("keyword", pa.string()),
+            ("ws_name", pa.string()),
+            ("condition_key", pa.string()),
+            ("scraped_at", pa.timestamp("s")),
+        ])
+        try:
+            os.makedirs(root, exist_ok=True)
+        except Exception as e:
+            logger.error(f"Parquetの出力先を作成できません: {root} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def condition_partition(keyword: str, ws_name: str) -> str:
+        """
+        検索条件をパーティションのディレクトリ名にする（使えない文字は_にし、衝突しないようハッシュを付ける）
+        """
+        text = f"{keyword}|{ws_name}"
+        slug = re.sub(r"[^\w\-]+", "_", text).strip("_")[:60]
+        return f"{slug}-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]}"
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def _end_date(cls, value: Any) -> Optional[date]:
+        """
+        抽出結果の日付（"'2025-06-27" など）をdateにする（解釈できなければNone）
+        """
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        text = str(value or "").lstrip("'").strip()
+        try:
+            return date.fromisoformat(text[:10])
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def _number(value: Any, cast) -> Any:
+        try:
+            return cast(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def add(self, record: Dict[str, Any], auction_id: Optional[str], keyword: str, ws_name: str, condition_key: str) -> None:
+        """
+        抽出結果1件を追加する（パーティションのバッファが rows_per_file 行に達したら書き出す）
+        :param record: DetailPageFlowの抽出結果（date, title, price, ct, 1ct_price, image）
+        """
+        end_date = self._end_date(record.get("date"))
+        if end_date is None:
+            with self._lock:
+                self.stats["skipped"] += 1
+            logger.debug(f"終了日が解釈できないためParquetへ出力しません: {record.get('date')}")
+            return
+        image = str(record.get("image") or "")
+        match = self.IMAGE_URL.match(image)
+        row = {
+            "end_date": end_date,
+            "title": record.get("title"),
+            "price": self._number(record.get("price"), int),
+            "ct": self._number(record.get("ct"), float),
+            "1ct_price": self._number(record.get("1ct_price"), float),
+            "image_url": match.group(1) if match else (image or None),
+            "auction_id": auction_id,
+            "keyword": keyword,
+            "ws_name": ws_name,
+            "condition_key": condition_key,
+            "scraped_at": datetime.now().replace(microsecond=0),
+        }
+        partition = (end_date.strftime("%Y-%m"), self.condition_partition(keyword, ws_name))
+        with self._lock:
+            buffer = self._buffers.setdefault(partition, [])
+            buffer.append(row)
+            if len(buffer) >= self.rows_per_file:
+                self._write_locked(partition, self._buffers.pop(partition))
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _partition_dir(self, partition: Tuple[str, str]) -> str:
+        end_month, condition = partition
+        return os.path.join(self.root, f"end_month={end_month}", f"condition={condition}")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _write_locked(self, partition: Tuple[str, str], rows: List[Dict[str, Any]]) -> None:
+        """
+        1パーティション分の行を新しいファイルに書き出す
+        """
+        directory = self._partition_dir(partition)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+        table = pa.Table.from_pylist(rows, schema=self.schema)
+        self._write_file(table, path)
+        self.stats["rows"] += len(rows)
+        self.stats["files"] += 1
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _write_file(self, table, path: str) -> None:
+        """
+        一時ファイルに書いてから置き換える（一時ファイルは.始まりのため、Datasetの読み込み対象にならない）
+        """
+        directory, name = os.path.split(path)
+        temp_path = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(table, temp_path, compression=self.COMPRESSION)
+        os.replace(temp_path, path)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def flush(self) -> None:
+        """
+        全パーティションのバッファを書き出す（条件の書き込み完了時・終了時に呼ぶ）
+        """
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+            for partition, rows in buffers.items():
+                if rows:
+                    self._write_locked(partition, rows)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def compact(self, small_file_bytes: int = 32 * 1024 * 1024, min_files: int = 2) -> Dict[str, int]:
+        """
+        小さなファイルが min_files 個以上あるパーティションを1ファイルにまとめる
+        同じ条件の同じオークション（auction_id）は最後に取得した行だけを残す
+        （実行中の書き込みとは並行させず、取得処理の合間に呼ぶ）
+        :return: {"partitions", "files_before", "files_after", "rows", "duplicates"}
+        """
+        self.flush()
+        summary = {"partitions": 0, "files_before": 0, "files_after": 0, "rows": 0, "duplicates": 0}
+        for directory, _, names in os.walk(self.root):
+            small = sorted(
+                os.path.join(directory, name) for name in names
+                if name.endswith(".parquet") and os.path.getsize(os.path.join(directory, name)) < small_file_bytes
+            )
+            if len(small) < min_files:
+                continue
+            table = pa.concat_tables([pq.read_table(path, schema=self.schema) for path in small])
+            frame = table.to_pandas()
+            before = len(frame)
+            keyed = frame["auction_id"].notna()
+            latest = frame[keyed].sort_values("scraped_at", kind="stable").drop_duplicates(
+                ["auction_id", "condition_key"], keep="last"
+            )
+            frame = pd.concat([latest, frame[~keyed]])
+            frame = frame.sort_values(["end_date", "auction_id"], na_position="last")
+            compacted = pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+
+            path = os.path.join(directory, f"part-compacted-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+            self._write_file(compacted, path)
+            for old in small:
+                os.remove(old)
+
+            summary["partitions"] += 1
+            summary["files_before"] += len(small)
+            summary["files_after"] += 1
+            summary["rows"] += compacted.num_rows
+            summary["duplicates"] += before - compacted.num_rows
+        logger.info(
+            f"Parquetコンパクション: {summary['partitions']}パーティション | "
+            f"{summary['files_before']}→{summary['files_after']}ファイル | {summary['rows']}行 | 重複除去={summary['duplicates']}行"
+        )
+        return summary
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def dataset(self):
+        """
+        出力全体をパーティション付きのpyarrow Datasetとして返す（分析用。end_month・conditionで絞り込める）
+        """
+        return ds.dataset(self.root, format="parquet", partitioning="hive")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        logger.info(
+            f"Parquet出力統計: {self.stats['rows']}行 | {self.stats['files']}ファイル | 終了日不明で除外={self.stats['skipped']}件"
+        )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        残りのバッファを書き出す
+        """
+        self.flush()
+# **********************************************************************************
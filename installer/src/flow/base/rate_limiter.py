@@ -0,0 +1,251 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                  # ログ出力用
+import threading                                # 複数ワーカーからの同時アクセス制御
+import time                                     # 待機・時刻計測用
+from typing import Any, Dict, Optional          # 型ヒント用
+from urllib.parse import urlparse               # URLからホスト名を取り出す
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class BlockedPageError(Exception):
+    """
+    アクセス制限（403/429やブロック画面）を検知したことを表す例外
+    """
+
+
+# **********************************************************************************
+# class定義
+class RateLimiter:
+    """
+    1ホスト分のリクエスト間隔を制御するトークンバケット（AIMD方式で速度を自動調整）
+
+    - acquire()でトークンを1つ予約し、足りなければ補充されるまで待つ（待ち順は予約順）
+    - 正常応答ごとに速度を加算的に上げ（+increase）、エラー・タイムアウト・ブロック検知で乗算的に下げる（×decrease）
+    - 同時実行中のリクエストが一斉に失敗しても、減速は1リクエスト間隔につき1回までにする
+    - 現在の速度・待ち時間などの統計をstatsに保持する
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 5.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        burst: float = 1.0
+    ):
+        """
+        コンストラクタ
+        :param rate: 開始時の速度（リクエスト/秒）
+        :param min_rate: 減速時の下限（リクエスト/秒）
+        :param max_rate: 加速時の上限（リクエスト/秒）
+        :param increase: 正常応答1回ごとに加算する速度
+        :param decrease: エラー時に速度へ掛ける係数（0〜1）
+        :param burst: 待たずに連続で出せるリクエスト数（バケット容量）
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = max(min_rate, min(rate, max_rate))
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,          # acquire回数
+            "waited": 0,            # 待ちが発生した回数
+            "wait_seconds": 0.0,    # 待ち時間の合計
+            "max_wait": 0.0,        # 最大の待ち時間
+            "successes": 0,         # 正常応答の報告回数
+            "errors": 0,            # エラー・ブロックの報告回数
+            "decreases": 0,         # 実際に減速した回数
+            "lowest_rate": self.rate,  # 期間中の最低速度
+        }
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _refill(self, now: float) -> None:
+        """
+        経過時間分のトークンを補充する（ロック取得中に呼ぶ）
+        """
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def acquire(self) -> float:
+        """
+        トークンを1つ予約し、必要な時間だけ待ってから戻る
+        :return: 実際に待った秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0  # 先に予約（マイナスなら後続は更に後ろで待つ）
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.stats["requests"] += 1
+            if wait > 0:
+                self.stats["waited"] += 1
+                self.stats["wait_seconds"] += wait
+                self.stats["max_wait"] = max(self.stats["max_wait"], wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def on_success(self) -> None:
+        """
+        正常応答を報告する（速度を加算的に上げる）
+        """
+        with self._lock:
+            self.stats["successes"] += 1
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def on_error(self) -> bool:
+        """
+        エラー・タイムアウト・ブロック検知を報告する（速度を乗算的に下げる）
+        :return: 実際に減速した場合True
+        """
+        with self._lock:
+            self.stats["errors"] += 1
+            now = time.monotonic()
+            if now - self._last_decrease < 1.0 / self.rate:
+                return False  # 同じ間隔内の失敗はまとめて1回の減速とする
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)  # 貯まっていた分も使わせず、次は新しい間隔で待たせる
+            self._last_decrease = now
+            self.stats["decreases"] += 1
+            self.stats["lowest_rate"] = min(self.stats["lowest_rate"], self.rate)
+            return True
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在の速度と統計のコピーを返す
+        """
+        with self._lock:
+            snapshot = dict(self.stats)
+            snapshot["rate"] = self.rate
+            return snapshot
+
+
+# **********************************************************************************
+# class定義
+class HostRateLimiters:
+    """
+    ホストごとのRateLimiterを保持し、一覧・詳細・画像など全取得経路で共有するレジストリ
+
+    - URLのホスト名でRateLimiterを引き当てる（初回アクセス時に生成）
+    - HttpFetcher・Seleniumはこのクラス経由で acquire / on_success / on_error を呼ぶ
+    - 応答テキストがブロック画面かどうかの簡易判定（is_blocked_text）も提供する
+    """
+
+    BLOCK_STATUS_CODES = (403, 429)  # アクセス制限とみなすHTTPステータス
+    BLOCK_PAGE_MARKERS = (            # ブロック画面とみなす文言（ページタイトルで判定）
+        "アクセスが制限",
+        "アクセスを制限",
+        "Access Denied",
+        "Too Many Requests",
+    )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, **limiter_options):
+        """
+        コンストラクタ
+        :param limiter_options: 各ホストのRateLimiterに渡す設定（rate, min_rate, max_rate 等）
+        """
+        self.limiter_options = limiter_options
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def for_url(self, url: Optional[str]) -> RateLimiter:
+        """
+        URLのホストに対応するRateLimiterを返す（ホスト不明時は空文字キーで共有）
+        """
+        host = (urlparse(url).hostname or "") if url else ""
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = RateLimiter(**self.limiter_options)
+                self._limiters[host] = limiter
+            return limiter
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def acquire(self, url: Optional[str]) -> float:
+        """
+        URLのホストのトークンを取得する（待った秒数を返す）
+        """
+        wait = self.for_url(url).acquire()
+        if wait > 0:
+            logger.debug(f"レート制御で待機: {wait:.2f}秒 | {url}")
+        return wait
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def on_success(self, url: Optional[str]) -> None:
+        """
+        URLのホストへの正常応答を報告する
+        """
+        self.for_url(url).on_success()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def on_error(self, url: Optional[str]) -> None:
+        """
+        URLのホストへのエラー・ブロックを報告する
+        """
+        limiter = self.for_url(url)
+        if limiter.on_error():
+            logger.info(f"レート制御で減速: {urlparse(url).hostname if url else ''} → {limiter.rate:.2f} req/s")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def is_blocked_text(cls, text: Optional[str]) -> bool:
+        """
+        ページタイトルがブロック画面の文言を含むか判定する
+        """
+        return bool(text) and any(marker in text for marker in cls.BLOCK_PAGE_MARKERS)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        ホスト名 → 速度・統計 の辞書を返す
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {host: limiter.snapshot() for host, limiter in limiters.items()}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        ホストごとの現在速度・待ち時間をログ出力する
+        """
+        for host, stats in self.snapshot().items():
+            average_wait = stats["wait_seconds"] / stats["requests"] if stats["requests"] else 0.0
+            logger.info(
+                f"レート制御統計[{host or '-'}]: 現在={stats['rate']:.2f} req/s | 最低={stats['lowest_rate']:.2f} req/s | "
+                f"リクエスト={stats['requests']}回 | 待機={stats['waited']}回(平均{average_wait:.2f}秒/最大{stats['max_wait']:.2f}秒) | "
+                f"エラー={stats['errors']}回(減速{stats['decreases']}回)"
+            )
+# **********************************************************************************
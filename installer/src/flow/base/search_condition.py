@@ -0,0 +1,128 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                  # ログ出力用
+from datetime import date                       # 開始日・終了日の型
+from typing import Any, Dict, List, Optional    # 型ヒント用
+
+from installer.src.flow.base.utils import DateConverter  # 開始日・終了日の変換
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class SearchCondition:
+    """
+    検索条件シート（Master）1行分を、日付変換・キーワード連結まで済ませた形で保持するクラス
+
+    - start_date / end_date は date 型（変換できなかった場合は None で、理由を error に持つ）
+    - keyword は search_1～search_5 を空白区切りで連結したもの
+    - ws_name は出力先シート名（列が無い場合は None）
+    - get(列名, 既定値) で元の行の値を参照できる（dictの行を受け取っていた処理との互換用）
+    - プロセス間で受け渡せる（pickle可能）
+    """
+
+    KEYWORD_COLUMNS = [f"search_{i}" for i in range(1, 6)]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        row_number: int,
+        keyword: str,
+        ws_name: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        raw: Dict[str, Any],
+        error: Optional[str] = None
+    ):
+        """
+        コンストラクタ
+        :param row_number: シート上の行番号（ヘッダーが1行目のため、1件目は2）
+        :param raw: シートから取得した元の行（{列名: 値}）
+        :param error: 日付変換に失敗した場合のエラー内容
+        """
+        self.row_number = row_number
+        self.keyword = keyword
+        self.ws_name = ws_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.raw = raw
+        self.error = error
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def from_record(cls, row_number: int, record: Dict[str, Any]) -> "SearchCondition":
+        """
+        シートの1行（{列名: 値}）から検索条件を作る（日付変換に失敗しても例外にせず error に記録）
+        """
+        keyword = " ".join([str(record.get(column, "")) for column in cls.KEYWORD_COLUMNS]).strip()
+        start_date = end_date = error = None
+        try:
+            start_date = DateConverter.convert(record.get("start_date"))
+            end_date = DateConverter.convert(record.get("end_date"))
+        except Exception as e:
+            start_date = end_date = None
+            error = str(e)
+        return cls(row_number, keyword, record.get("ws_name"), start_date, end_date, dict(record), error)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def parse_all(cls, records: List[Dict[str, Any]]) -> List["SearchCondition"]:
+        """
+        get_all_records の結果をまとめて検索条件にする
+        """
+        return [cls.from_record(number, record) for number, record in enumerate(records, start=2)]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        元の行の値を返す（dict.get と同じ）
+        """
+        return self.raw.get(key, default)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        保存用の辞書にする（日付はISO形式の文字列）
+        """
+        return {
+            "row_number": self.row_number,
+            "keyword": self.keyword,
+            "ws_name": self.ws_name,
+            "start_date": self.start_date.isoformat() if self.start_date else None,
+            "end_date": self.end_date.isoformat() if self.end_date else None,
+            "raw": self.raw,
+            "error": self.error,
+        }
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchCondition":
+        """
+        to_dict で保存した辞書から復元する（日付の再変換は行わない）
+        """
+        return cls(
+            data["row_number"],
+            data["keyword"],
+            data["ws_name"],
+            date.fromisoformat(data["start_date"]) if data["start_date"] else None,
+            date.fromisoformat(data["end_date"]) if data["end_date"] else None,
+            data["raw"],
+            data["error"],
+        )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __repr__(self) -> str:
+        return (
+            f"SearchCondition(row={self.row_number}, keyword={self.keyword!r}, ws_name={self.ws_name!r}, "
+            f"start_date={self.start_date}, end_date={self.end_date})"
+        )
+# **********************************************************************************
@@ -0,0 +1,123 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import json                                     # 検索条件の保存形式
+import hashlib                                  # シート内容の指紋
+import logging                                  # ログ出力用
+import os                                       # 保存先ディレクトリの作成
+import sqlite3                                  # ローカル保存用DB
+import threading                                # 同時アクセス制御
+import time                                     # 更新時刻の記録
+from datetime import date                       # 日付変換した年の判定
+from typing import Any, Dict, List, Optional    # 型ヒント用
+
+from installer.src.flow.base.search_condition import SearchCondition  # 保存・復元する検索条件
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class SearchConditionCache:
+    """
+    検索条件シートから読み込んだ検索条件を、シート内容の指紋と一緒にローカルへ保存するクラス
+
+    - 記録内容: シート内容の指紋・変換済みの検索条件
+    - 読み込んだシートの指紋が前回と同じなら、日付変換をやり直さずに保存済みの検索条件を使い回せる
+    - スプレッドシートの更新日時（Drive APIの modifiedTime）は出力先シートへの書き込みでも変わるため使わない
+    - DateConverterは年を実行時の年で補うため、変換した年と今年が違う記録は使わない
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS search_condition_cache (
+            spreadsheet_id TEXT NOT NULL,
+            sheet_name     TEXT NOT NULL,
+            fingerprint    TEXT NOT NULL,
+            conditions     TEXT NOT NULL,
+            converted_year INTEGER NOT NULL,
+            updated_at     REAL NOT NULL,
+            PRIMARY KEY (spreadsheet_id, sheet_name)
+        )
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, path: str = "installer/data/crawl_state.sqlite3"):
+        """
+        コンストラクタ（保存先ファイルが無ければ作成する）
+        :param path: SQLiteファイルのパス（":memory:" でメモリ上に作成）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            directory = os.path.dirname(path)
+            if path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # チェックポイントと同じファイルを共有するため、WALにしてロック中は最大30秒待つ
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+        except Exception as e:
+            logger.error(f"検索条件キャッシュの保存先を開けません: {path} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def fingerprint(records: List[Dict[str, Any]]) -> str:
+        """
+        シートから取得したレコードの指紋（内容が同じなら同じ値）を返す
+        """
+        text = json.dumps(records, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def load(self, spreadsheet_id: str, sheet_name: str) -> Optional[Dict[str, Any]]:
+        """
+        保存済みの検索条件を返す（未保存・読めない・去年以前に変換した場合はNone）
+        :return: {"fingerprint": str, "conditions": List[SearchCondition]}
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, conditions FROM search_condition_cache "
+                "WHERE spreadsheet_id = ? AND sheet_name = ? AND converted_year = ?",
+                (spreadsheet_id, sheet_name, date.today().year)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            conditions = [SearchCondition.from_dict(data) for data in json.loads(row[1])]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"保存済みの検索条件を読めないため破棄します: {sheet_name} | {e}")
+            return None
+        return {"fingerprint": row[0], "conditions": conditions}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def save(
+        self,
+        spreadsheet_id: str,
+        sheet_name: str,
+        fingerprint: str,
+        conditions: List[SearchCondition]
+    ) -> None:
+        """
+        検索条件を指紋と一緒に保存する（同じシートの記録は置き換える）
+        """
+        data = json.dumps([condition.to_dict() for condition in conditions], ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_condition_cache "
+                "(spreadsheet_id, sheet_name, fingerprint, conditions, converted_year, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (spreadsheet_id, sheet_name, fingerprint, data, date.today().year, time.time())
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+# **********************************************************************************
@@ -2,9 +2,10 @@
 # import
 # ★ 各種標準ライブラリ・外部ライブラリをインポート（動作に必須）
 import time                # スリープ・タイミング調整用
-import re                  # 正規表現（未使用だがテンプレとして用意されている）
+import re                  # 正規表現（再生モードで<head>タグの位置を探す）
 import logging             # ログ出力用（開発・運用・障害解析で重要）
-import random              # ランダム値生成（人間らしい挙動のため）
+import uuid                # ドキュメント識別用マーカーの生成
+import html as html_lib    # 再生モードで差し込む<base>タグのURLエスケープ
 import time                # 再インポート（上記と重複だがバグではない。整理する場合は片方だけでOK）
 
 # Selenium関連。Webブラウザ自動操作に使う
@@ -19,37 +20,148 @@ from selenium.webdriver.support.ui import WebDriverWait        # 明示的な待
 from selenium.webdriver.support import expected_conditions as EC # 出現条件の指定
 from selenium.webdriver.common.by import By                    # 検索方法の定数
 
+from installer.src.flow.base.field_parser import DetailFieldParser, ListFieldParser  # 生データの整形ルール
+from installer.src.flow.base.rate_limiter import BlockedPageError, HostRateLimiters  # ホスト単位のリクエスト間隔制御
+from installer.src.flow.base.page_archive import PageArchive                         # 取得ページの保存・オフライン再生
+
 # ロガーのセットアップ（エラーや進捗を出力するため。呼び出し元でlevel設定推奨）
 logger = logging.getLogger(__name__)
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
 
-# ------------------------------------------------------------------------------
-# 関数定義
-def random_sleep(min_seconds=0.5, max_seconds=1.5):
-    """人間らしさを出すためのランダムスリープ
-
-    :param min_seconds: 最小スリープ秒（float）
-    :param max_seconds: 最大スリープ秒（float）
-    :return: なし（time.sleepを呼ぶだけ）
-    """
-    sleep_time = random.uniform(min_seconds, max_seconds)  # min〜max間の小数で乱数生成
-    logger.debug(f"ランダムスリープ: {sleep_time:.2f}秒")  # デバッグ用にスリープ秒をログ出力
-    time.sleep(sleep_time)  # 指定秒数スリープ。ボット対策＆サーバー負荷分散
-
 # **********************************************************************************
 # class定義
 # Seleniumによるスクレイピング操作をラップするクラス（全ブラウザ共通の操作を集約）
 class Selenium:
 
+    # 一覧ページの商品カードのセレクタ
+    LIST_CARD_SELECTOR = "li.Product"
+
+    # 商品カードごとにURL・ID・終了日時・タイトル・価格をまとめて返すスクリプト（1回の往復で全件取得）
+    LIST_ITEMS_SCRIPT = """
+        const cards = document.querySelectorAll(arguments[0]);
+        return Array.from(cards).map(card => {
+            const link = card.querySelector("a.Product__titleLink");
+            const time = card.querySelector(".Product__time");
+            const price = card.querySelector(".Product__priceValue");
+            return {
+                url: link ? link.href : null,
+                auction_id: link ? link.getAttribute("data-auction-id") : null,
+                end_time: time ? time.textContent : null,
+                title: link ? (link.getAttribute("title") || link.textContent) : null,
+                price_text: price ? price.textContent : null,
+            };
+        });
+    """
+
+    # 詳細ページの各項目のセレクタ
+    DETAIL_TITLE_SELECTOR = "h1.gv-u-fontSize16--_aSkEz8L_OSLLKFaubKB"
+    DETAIL_PRICE_SELECTOR = "span.sc-1f0603b0-2.kxUAXU"
+    DETAIL_FALLBACK_IMAGE_SELECTOR = "img.sc-7f8d3a42-4.gOFKtZ"
+    DETAIL_END_DATE_SELECTOR = "span.gv-u-fontSize12--s5WnvVgDScOXPWU7Mgqd.gv-u-colorTextGray--OzMlIYwM3n8ZKUl0z2ES"
+
+    # 詳細ページの必要項目と全画像URL候補を1回の往復でまとめて返すスクリプト（値の整形はPython側で行う）
+    DETAIL_SNAPSHOT_SCRIPT = """
+        const text = sel => { const el = document.querySelector(sel); return el ? el.innerText : null; };
+        const fallback = document.querySelector(arguments[2]);
+        return {
+            title: text(arguments[0]),
+            price_text: text(arguments[1]),
+            image_srcs: Array.from(document.images).map(img => img.src).filter(src => src),
+            fallback_image: fallback ? fallback.src : null,
+            end_date_texts: Array.from(document.querySelectorAll(arguments[3])).map(el => el.innerText),
+        };
+    """
+
+    # readyStateが待機対象の状態（arguments[1]）ならドキュメント識別マーカーを埋め込んで返すスクリプト（未到達ならnull）
+    # マーカーはページ遷移で消えるため、「同じドキュメントのままか」の判定にも使える
+    READY_SCRIPT = """
+        if (!arguments[1].includes(document.readyState)) { return null; }
+        if (!window.__yasDocId) { window.__yasDocId = arguments[0]; }
+        return window.__yasDocId;
+    """
+    DOC_ID_SCRIPT = "return window.__yasDocId || null;"
+
+    # 表示中ページの転送バイト数（HTML＋サブリソース）とDOMContentLoadedまでの時間を返すスクリプト
+    PAGE_METRICS_SCRIPT = """
+        const nav = performance.getEntriesByType("navigation")[0];
+        const resources = performance.getEntriesByType("resource");
+        let bytes = nav ? (nav.transferSize || 0) : 0;
+        for (const r of resources) { bytes += r.transferSize || 0; }
+        return {
+            bytes: bytes,
+            resources: resources.length,
+            dom_ms: nav ? (nav.domContentLoadedEventEnd - nav.startTime) : null,
+        };
+    """
+
     # ------------------------------------------------------------------------------
     # 関数定義
     # コンストラクタ（chromeインスタンスを受け取る）
-    def __init__(self, chrome: WebDriver):
+    def __init__(
+        self,
+        chrome: WebDriver,
+        collect_metrics: bool = False,
+        rate_limiters: HostRateLimiters = None,
+        archive: PageArchive = None
+    ):
         """
         Seleniumユーティリティクラスの初期化
         :param chrome: 事前に生成済みのwebdriver.Chromeインスタンス
+        :param collect_metrics: Trueならget()のたびに転送バイト数・読込時間を計測する（1往復追加）
+        :param rate_limiters: ホスト単位のレート制御（HTTP取得と共有する。省略時はこのインスタンス専用）
+        :param archive: 取得ページの保存先（再生モードならネットワークの代わりにここから読み込む）
         """
         self.chrome = chrome  # クラス全体で使うためインスタンス変数へ保存
+        self.collect_metrics = collect_metrics  # ページごとの転送量計測の有無
+        self.rate_limiters = rate_limiters or HostRateLimiters()  # 遷移前にトークンを取得して間隔を制御
+        self.archive = archive  # 取得ページの保存・再生
+        self._ready_states = self._ready_states_for(chrome)  # 読み込み完了とみなすreadyState
+        # ページ遷移の追跡（遷移ごとに1回だけreadyStateを待つ）
+        self._needs_ready = True     # 初回は表示中ページの状態が不明なので1回待つ
+        self._doc_id = None          # 直近に待機完了したドキュメントの識別マーカー
+        self._page = {"url": None, "lookups": 0, "skipped": 0, "saved_seconds": 0.0}  # 現ページの待機統計
+        self._poll_total = 0.0       # 読込済みページへのreadyState確認1回の実測合計秒
+        self._poll_count = 0         # 上記の実測回数
+        self._replay_driver = None   # 再生モードでネットワークを遮断済みのドライバ
+        self.stats = {
+            "navigations": 0,        # 追跡したページ遷移数
+            "ready_waits": 0,        # 実際にreadyStateを待った回数
+            "ready_skips": 0,        # 同じページのため待機を省略した回数
+            "wait_seconds": 0.0,     # 実際の待機に使った秒数
+            "saved_seconds": 0.0,    # 省略により節約できた推定秒数
+            "page_loads": 0,         # get()による読込回数
+            "load_seconds": 0.0,     # get()の所要秒数の合計
+            "measured_pages": 0,     # 転送量を計測したページ数
+            "bytes": 0,              # 計測したページの転送バイト数合計
+        }
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 読み込み完了とみなすreadyStateの一覧
+    @staticmethod
+    def _ready_states_for(chrome: WebDriver) -> list:
+        """
+        eager読み込み（軽量モード）のドライバはDOM構築完了（interactive）で待機を終える
+        （completeまで待つと画像等のサブリソースを待たない利点が無くなるため）
+        """
+        capabilities = getattr(chrome, "capabilities", None) or {}
+        eager = capabilities.get("pageLoadStrategy") == "eager"
+        return ["interactive", "complete"] if eager else ["complete"]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 操作対象のドライバを差し替え
+    def use_driver(self, chrome: WebDriver) -> None:
+        """
+        プールから借り直したドライバに切り替える（待機・読込の統計と確認時間の実測値は引き継ぐ）
+        表示中のページは分からないため、次の要素取得では読み込み完了を待つ
+        """
+        self._log_page_stats()
+        self.chrome = chrome
+        self._ready_states = self._ready_states_for(chrome)
+        self._needs_ready = True
+        self._doc_id = None
+        self._page = {"url": None, "lookups": 0, "skipped": 0, "saved_seconds": 0.0}
 
     # ========================
     # 基底メソッド（全画面で共通利用できる操作）
@@ -67,8 +179,8 @@ class Selenium:
         :return: WebElement（取得できなければ例外）
         """
         try:
-            # ページの読み込み完了まで待機（JSやAjaxで非同期にロードされるケース対応）
-            self.wait_for_page_complete()
+            # ページ遷移後の初回だけ読み込み完了を待つ（同じページでの2回目以降は省略）
+            self.ensure_ready()
 
             # 指定された検索方法・値の要素が出現するまで最大timeout秒間待つ
             element = WebDriverWait(self.chrome, timeout).until(
@@ -95,7 +207,7 @@ class Selenium:
         :return: List[WebElement]
         """
         try:
-            self.wait_for_page_complete()  # ページ全体のロード待ち
+            self.ensure_ready()  # ページ遷移後の初回だけロード待ち
             WebDriverWait(self.chrome, timeout).until(
                 EC.presence_of_element_located((by, value))
             )
@@ -113,33 +225,213 @@ class Selenium:
     # 任意の要素をクリック
     def click(self, by, value, timeout=10):
         """
-        指定セレクタで要素を取得し、その要素をクリック。人間ぽくランダムスリープ付き
+        指定セレクタで要素を取得し、その要素をクリック。
+        クリックで遷移する可能性があるため、表示中ホストのレート制御トークンを取得してからクリックする
         :param by: 検索方法
         :param value: セレクタ値
         :param timeout: タイムアウト秒
         """
+        url = self._current_url()
         try:
             element = self.find_one(by, value, timeout)  # 指定要素を取得
+            self.rate_limiters.acquire(url)              # 固定のランダムスリープに代わり、ホストの状況に応じた間隔で待つ
             element.click()                              # クリック操作
             logger.debug(f"クリック成功: by={by}, value={value}")
-            random_sleep()  # クリック後に一瞬止める（不自然な連打を防ぐ）
+            self._detect_navigation()  # クリックでページ遷移したか（マーカーが消えたか）を確認
+            self.rate_limiters.on_success(url)
         except Exception as e:
+            if isinstance(e, (TimeoutException, WebDriverException)):
+                self.rate_limiters.on_error(url)
             logger.error(f"クリック失敗: by={by}, value={value}, error={e}")
             raise
 
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 指定URLへ遷移（遷移として記録し、次の要素取得時に1回だけロード待ちさせる）
+    def get(self, url: str) -> None:
+        """
+        ページ遷移はこのメソッド経由で行う（driver.getを直接呼ぶと遷移を追跡できない）
+        遷移前にホストのレート制御トークンを取得し、結果（タイムアウト・ブロック画面を含む）を報告する
+        :param url: 遷移先URL
+        アーカイブ指定時は表示したDOMを保存し、再生モードではアーカイブのHTMLを空ページに流し込んで表示する
+        :raises BlockedPageError: アクセス制限画面が表示された場合
+        :raises ArchiveMissError: 再生モードでアーカイブに無いURLの場合
+        """
+        if self.archive and self.archive.replay:
+            self._replay(url)
+            return
+        self.rate_limiters.acquire(url)
+        started = time.perf_counter()
+        try:
+            self.chrome.get(url)
+        except (TimeoutException, WebDriverException):
+            self.rate_limiters.on_error(url)
+            raise
+        elapsed = time.perf_counter() - started
+        self._mark_navigation(url)
+        if HostRateLimiters.is_blocked_text(self.chrome.title):
+            self.rate_limiters.on_error(url)
+            raise BlockedPageError(f"アクセス制限画面を検知しました: {url}")
+        self.rate_limiters.on_success(url)
+        self.stats["page_loads"] += 1
+        self.stats["load_seconds"] += elapsed
+        if self.collect_metrics:
+            self._record_page_metrics(url, elapsed)
+        if self.archive:
+            self.archive.save(url, self.chrome.page_source)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # アーカイブのHTMLをブラウザに表示（再生モード）
+    def _replay(self, url: str) -> None:
+        """
+        保存済みHTMLを about:blank に CDP の Page.setDocumentContent で流し込む（ネットワークアクセス・レート制御なし）
+        - data URLはURL長の上限（約2MB）を超えうるうえ、相対リンクが元のURLで解決されないため使わない
+        - <base href="元のURL"> を差し込み、リンク・画像のURLを記録時と同じ絶対URLに解決させる
+        - 画像・スクリプト等のサブリソースがネットワークへ出ないよう、ドライバごとに全URLを遮断する
+        """
+        html = self.archive.load(url)
+        if self._replay_driver is not self.chrome:
+            self.chrome.execute_cdp_cmd("Network.enable", {})
+            self.chrome.execute_cdp_cmd("Network.setBlockedURLs", {"urls": ["*"]})
+            self._replay_driver = self.chrome
+        self.chrome.get("about:blank")
+        frame_id = self.chrome.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+        self.chrome.execute_cdp_cmd("Page.setDocumentContent", {"frameId": frame_id, "html": self._with_base(html, url)})
+        self._mark_navigation(url)
+        logger.debug(f"アーカイブから再生: {url}")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # HTMLの<head>直後に<base href>を差し込む
+    @staticmethod
+    def _with_base(html: str, url: str) -> str:
+        """
+        相対URLが元のページURLで解決されるよう <base href="url"> を差し込んだHTMLを返す（<head>が無ければ先頭に置く）
+        """
+        base = f'<base href="{html_lib.escape(url, quote=True)}">'
+        match = re.search(r"<head(?:\s[^>]*)?>", html, re.IGNORECASE)
+        if match:
+            return html[:match.end()] + base + html[match.end():]
+        return base + html
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 表示中ページの転送量・読込時間を計測して集計
+    def _record_page_metrics(self, url: str, elapsed: float) -> None:
+        """
+        Performance APIから転送バイト数を取得し、ページごとにdebugログ、全体はstatsへ集計する
+        """
+        try:
+            metrics = self.chrome.execute_script(self.PAGE_METRICS_SCRIPT) or {}
+        except Exception as e:
+            logger.debug(f"ページ計測失敗: {url} | {e}")
+            return
+        page_bytes = int(metrics.get("bytes") or 0)
+        self.stats["measured_pages"] += 1
+        self.stats["bytes"] += page_bytes
+        logger.debug(
+            f"ページ計測: {url} | 転送={page_bytes / 1024:.1f}KB | リソース={metrics.get('resources')}件 | "
+            f"get={elapsed:.2f}秒 | DOMContentLoaded={metrics.get('dom_ms')}ms"
+        )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # ページ遷移を記録（前ページの待機統計をログに出し、待機フラグを立てる）
+    def _mark_navigation(self, url=None) -> None:
+        """
+        遷移を記録し、次回のensure_readyで読み込み完了を待つようにする
+        """
+        self._log_page_stats()
+        self._needs_ready = True
+        self._doc_id = None
+        self._page = {"url": url, "lookups": 0, "skipped": 0, "saved_seconds": 0.0}
+        self.stats["navigations"] += 1
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 表示中ページの待機省略統計をログ出力
+    def _log_page_stats(self) -> None:
+        if self._page["skipped"]:
+            logger.debug(
+                f"待機省略: {self._page['url']} | 要素取得={self._page['lookups']}回 | "
+                f"省略={self._page['skipped']}回 | 節約≒{self._page['saved_seconds']:.3f}秒"
+            )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # クリック等の後、ドキュメントが入れ替わったかをマーカーで判定
+    def _detect_navigation(self) -> None:
+        """
+        識別マーカーが消えていれば別ドキュメントへ遷移したとみなして記録する
+        """
+        if self._needs_ready:
+            return
+        try:
+            current = self.chrome.execute_script(self.DOC_ID_SCRIPT)
+        except Exception:
+            current = None
+        if current != self._doc_id:
+            self._mark_navigation(self._current_url())
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 現在URLの取得（ログ用。失敗してもNone）
+    def _current_url(self):
+        try:
+            return self.chrome.current_url
+        except Exception:
+            return None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 遷移後の初回だけ読み込み完了を待つ
+    def ensure_ready(self, timeout=10) -> None:
+        """
+        直近の遷移後にまだ待っていなければwait_for_page_completeで待ち、待機済みなら何もしない
+        （省略した回数と、読込済みページへのreadyState確認1回分の実測時間から節約時間を集計）
+        """
+        self._page["lookups"] += 1
+        if not self._needs_ready:
+            saved = self._poll_total / self._poll_count if self._poll_count else 0.0
+            self._page["skipped"] += 1
+            self._page["saved_seconds"] += saved
+            self.stats["ready_skips"] += 1
+            self.stats["saved_seconds"] += saved
+            return
+        self.wait_for_page_complete(timeout)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # readyStateを1回確認（完了ならマーカーを返す）
+    def _poll_ready(self, driver):
+        """
+        READY_SCRIPTを1回実行し、完了していればドキュメント識別マーカーを返す（未完了はNone）
+        """
+        started = time.perf_counter()
+        doc_id = driver.execute_script(self.READY_SCRIPT, uuid.uuid4().hex, self._ready_states)
+        if doc_id:
+            # 読込済みページへの確認1回にかかる時間（=待機省略1回あたりの節約時間）として記録
+            self._poll_total += time.perf_counter() - started
+            self._poll_count += 1
+        return doc_id
+
     # ------------------------------------------------------------------------------
     # 関数定義
     # ページのロード（読み込み）が終わるまで待機
     def wait_for_page_complete(self, timeout=10):
         """
         JavaScript上のreadyStateが"complete"になるまで待つ（画面描画＆DOM構築終了を判定）
+        eager読み込みのドライバでは"interactive"（DOM構築完了）になった時点で待機を終える
+        完了時にドキュメント識別マーカーを記録し、同じページでは以降の待機を省略させる
         :param timeout: タイムアウト秒
         :return: なし（例外発生時はraise）
         """
+        started = time.perf_counter()
         try:
-            WebDriverWait(self.chrome, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            self._doc_id = WebDriverWait(self.chrome, timeout).until(self._poll_ready)
+            self._needs_ready = False
+            self.stats["ready_waits"] += 1
             logger.debug("ページロード完了")
         except TimeoutException:
             logger.error("ページのロードがタイムアウトしました")
@@ -147,6 +439,27 @@ class Selenium:
         except Exception as e:
             logger.error(f"wait_for_page_complete失敗: error={e}")
             raise
+        finally:
+            self.stats["wait_seconds"] += time.perf_counter() - started
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 待機統計のログ出力
+    def log_stats(self) -> None:
+        """
+        遷移数・実待機回数・省略回数・節約推定秒をログ出力する
+        """
+        self._log_page_stats()
+        logger.info(
+            f"ページ待機統計: 遷移={self.stats['navigations']}回 | 待機={self.stats['ready_waits']}回"
+            f"({self.stats['wait_seconds']:.2f}秒) | 省略={self.stats['ready_skips']}回"
+            f"(節約≒{self.stats['saved_seconds']:.2f}秒)"
+        )
+        if self.stats["page_loads"]:
+            message = f"ページ読込統計: 平均get={self.stats['load_seconds'] / self.stats['page_loads']:.2f}秒"
+            if self.stats["measured_pages"]:
+                message += f" | 平均転送={self.stats['bytes'] / self.stats['measured_pages'] / 1024:.1f}KB/ページ"
+            logger.info(message)
 
     # ------------------------------------------------------------------------------
     # 関数定義
@@ -181,8 +494,8 @@ class Selenium:
         try:
             # 商品タイトルのリンク要素を全て取得（CSS: a.Product__titleLink）
             elements = self.find_many(By.CSS_SELECTOR, "a.Product__titleLink")
-            # それぞれのhref属性（URL）だけをリスト化
-            urls = [el.get_attribute("href") for el in elements if el.get_attribute("href")]
+            # それぞれのhref属性（URL）だけをリスト化（get_attributeは1要素につき1回だけ呼ぶ）
+            urls = [href for href in (el.get_attribute("href") for el in elements) if href]
             if not urls:
                 logger.error("商品URLが取得できませんでした")
                 raise ValueError("商品URLが取得できませんでした")
@@ -192,6 +505,50 @@ class Selenium:
             logger.error(f"get_auction_urls失敗: {e}")
             raise
 
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 商品一覧画面：商品カード単位の情報を1回のスクリプト実行でまとめて取得
+    def get_list_items(self, timeout=10, allow_empty=False) -> list:
+        """
+        商品一覧画面の全商品カード（li.Product）から、URL・オークションID・終了日時・タイトル・現在価格を
+        1回のexecute_scriptでまとめて取得する（要素ごとのWebDriver往復を無くす）
+        カード単位で取得するため、終了日時とURLの対応がずれることは無い
+        :param allow_empty: Trueならカードが1枚も無いページ（最終ページの次など）で例外にせず空リストを返す
+        :return: List[dict]（{"url", "auction_id", "end_time", "title", "price"}、URLの無いカードは除外）
+        """
+        try:
+            self.ensure_ready(timeout)
+            # 少なくとも1枚のカードが描画されるまで待つ
+            try:
+                WebDriverWait(self.chrome, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.LIST_CARD_SELECTOR))
+                )
+            except TimeoutException:
+                if allow_empty:
+                    logger.debug("商品カードが無いページです")
+                    return []
+                raise
+            raw_items = self.chrome.execute_script(self.LIST_ITEMS_SCRIPT, self.LIST_CARD_SELECTOR) or []
+            items = [
+                ListFieldParser.build_item(
+                    url=raw.get("url"),
+                    end_time=raw.get("end_time"),
+                    title=raw.get("title"),
+                    price_text=raw.get("price_text"),
+                    auction_id=raw.get("auction_id"),
+                )
+                for raw in raw_items
+            ]
+            items = [item for item in items if item["url"]]
+            if not items and not allow_empty:
+                logger.error("商品カードが取得できませんでした")
+                raise ValueError("商品カードが取得できませんでした")
+            logger.debug(f"商品カード取得: {len(items)}件")
+            return items
+        except Exception as e:
+            logger.error(f"get_list_items失敗: {e}")
+            raise
+
     # ------------------------------------------------------------------------------
     # 関数定義
     # 商品詳細画面：タイトル取得
@@ -202,7 +559,7 @@ class Selenium:
         """
         try:
             # h1要素（指定クラス名）で商品タイトル取得
-            el = self.find_one(By.CSS_SELECTOR, "h1.gv-u-fontSize16--_aSkEz8L_OSLLKFaubKB")
+            el = self.find_one(By.CSS_SELECTOR, self.DETAIL_TITLE_SELECTOR)
             title = el.text.strip()
             if not title:
                 logger.error("タイトルが取得できませんでした")
@@ -223,7 +580,7 @@ class Selenium:
         """
         try:
             # 指定セレクタ（span.sc-1f0603b0-2.kxUAXU）で価格要素取得
-            el = self.find_one(By.CSS_SELECTOR, "span.sc-1f0603b0-2.kxUAXU")
+            el = self.find_one(By.CSS_SELECTOR, self.DETAIL_PRICE_SELECTOR)
             price_text = el.text.strip().replace(",", "").replace("円", "")  # カンマ・"円"除去
             if not price_text:
                 logger.error("価格が取得できませんでした")
@@ -253,7 +610,7 @@ class Selenium:
                     logger.info(f"✅ 優先画像URL取得(1200x900): {src}")  # ログ記録
                     return src
             # fallback: 上記で取得できなければ、従来のimgセレクタで一つ取得
-            el = self.find_one(By.CSS_SELECTOR, "img.sc-7f8d3a42-4.gOFKtZ")
+            el = self.find_one(By.CSS_SELECTOR, self.DETAIL_FALLBACK_IMAGE_SELECTOR)
             fallback_src = el.get_attribute("src")
             logger.warning(f"⚠️ fallback画像URL取得: {fallback_src}")
             return fallback_src
@@ -292,10 +649,7 @@ class Selenium:
         """
         try:
             # 指定クラス名のspan要素を全て取得
-            elements = self.chrome.find_elements(
-                By.CSS_SELECTOR,
-                "span.gv-u-fontSize12--s5WnvVgDScOXPWU7Mgqd.gv-u-colorTextGray--OzMlIYwM3n8ZKUl0z2ES"
-            )
+            elements = self.chrome.find_elements(By.CSS_SELECTOR, self.DETAIL_END_DATE_SELECTOR)
             # 複数要素のうち「終了」や「時」を含むものだけ返す
             for el in elements:
                 text = el.text.strip()
@@ -307,3 +661,53 @@ class Selenium:
         except Exception as e:
             logger.error(f"get_detail_end_date失敗: {e}")
             raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 商品詳細画面：必要項目を1回のスクリプト実行でまとめて取得
+    def get_detail_snapshot(self, timeout=10) -> dict:
+        """
+        詳細画面のタイトル・価格・全画像URL候補・終了日時候補テキストを1回のexecute_scriptで取得する
+        （値の整形はしない生データ。get_detail_fieldsで整形する）
+        :return: {"title", "price_text", "image_srcs", "fallback_image", "end_date_texts"}
+        """
+        try:
+            self.ensure_ready(timeout)
+            # タイトル要素の描画を1回だけ待ってから一括取得
+            WebDriverWait(self.chrome, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.DETAIL_TITLE_SELECTOR))
+            )
+            snapshot = self.chrome.execute_script(
+                self.DETAIL_SNAPSHOT_SCRIPT,
+                self.DETAIL_TITLE_SELECTOR,
+                self.DETAIL_PRICE_SELECTOR,
+                self.DETAIL_FALLBACK_IMAGE_SELECTOR,
+                self.DETAIL_END_DATE_SELECTOR,
+            ) or {}
+            logger.debug(f"詳細スナップショット取得: 画像候補={len(snapshot.get('image_srcs') or [])}件")
+            return snapshot
+        except Exception as e:
+            logger.error(f"get_detail_snapshot失敗: {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    # 商品詳細画面：スナップショットを整形して各項目の値で返す
+    def get_detail_fields(self, timeout=10) -> dict:
+        """
+        get_detail_snapshotの生データを、get_title / get_price / get_image_url / get_detail_end_date と
+        同じルール（価格のカンマ・円除去、1200x900画像優先、終了日時キーワード判定）でPython側で整形する
+        :return: {"title", "price", "image_url", "end_date"}（取れなかった項目はNone）
+        """
+        snapshot = self.get_detail_snapshot(timeout)
+        fields = {
+            "title": DetailFieldParser.parse_title(snapshot.get("title")),
+            "price": DetailFieldParser.parse_price(snapshot.get("price_text")),
+            "image_url": DetailFieldParser.pick_image_url(
+                snapshot.get("image_srcs") or [],
+                fallback=snapshot.get("fallback_image")
+            ),
+            "end_date": DetailFieldParser.pick_end_date(snapshot.get("end_date_texts") or []),
+        }
+        logger.debug(f"詳細項目取得: {fields}")
+        return fields
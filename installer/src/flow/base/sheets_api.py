@@ -0,0 +1,264 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import time                                                      # 予算の時間窓・待機
+import random                                                    # バックオフのゆらぎ
+import logging                                                   # ログ出力用
+import threading                                                 # 複数スレッドからの呼び出し制御
+from collections import Counter, deque                           # 呼び出し時刻の時間窓・API別件数
+from typing import Any, Callable, Dict, Hashable, Optional       # 型ヒント用
+
+import requests                                                  # 通信エラーの判定
+from gspread.exceptions import APIError                          # Sheets APIのエラー応答
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class _InFlight:
+    """
+    実行中の呼び出し1件（同じキーの呼び出しが結果を共有するための入れ物）
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+# **********************************************************************************
+# class定義
+class SheetsApiGate:
+    """
+    gspreadのAPI呼び出しを1か所に通し、クォータ超過で処理を落とさないためのクラス
+
+    - 1分あたりの呼び出し予算（直近60秒の呼び出し数）を超えないよう呼び出し前に待つ
+    - 429（クォータ超過）・5xx・通信エラーは、ゆらぎ付き指数バックオフで再試行する
+      （Retry-Afterがあれば従う）。待機中は他スレッドの呼び出しも止め、まとめて再開する
+    - 繰り返すと結果が変わる呼び出し（values.append）は idempotent=False で呼ぶ。
+      サーバー側で反映済みかもしれない5xx・通信エラーでは再試行せず、429（未反映）だけ再試行する
+    - coalesce_key を指定した読み込みは、同じキーの呼び出しが実行中ならその結果を共有する
+    - 呼び出し数・再試行数・待機秒数をstatsに集計する（プロセス内で共有: shared()）
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    WINDOW_SECONDS = 60.0
+
+    _shared: Optional["SheetsApiGate"] = None
+    _shared_lock = threading.Lock()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 64.0
+    ):
+        """
+        コンストラクタ
+        :param requests_per_minute: 1分あたりの呼び出し予算
+        :param max_retries: 再試行の最大回数（超えたら例外を送出）
+        :param base_delay: 1回目の再試行までの基準秒数（以降2倍ずつ）
+        :param max_delay: 再試行までの最大秒数
+        """
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._calls: deque = deque()          # 直近の呼び出し時刻
+        self._paused_until = 0.0              # バックオフ中はこの時刻まで全呼び出しを止める
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self.stats: Dict[str, Any] = {
+            "requests": 0, "retries": 0, "failures": 0, "coalesced": 0,
+            "throttled": 0, "throttle_seconds": 0.0, "backoff_seconds": 0.0, "by_name": Counter(),
+        }
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def shared(cls) -> "SheetsApiGate":
+        """
+        プロセス内で共有するインスタンスを返す（未設定なら既定値で作る）
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def configure(cls, **options) -> "SheetsApiGate":
+        """
+        共有インスタンスを指定の設定で作り直す（プロセス開始時に1回呼ぶ）
+        """
+        with cls._shared_lock:
+            cls._shared = cls(**options)
+            return cls._shared
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def install(cls, gate: "SheetsApiGate") -> None:
+        """
+        指定のインスタンスを共有インスタンスにする（一時的に差し替えた設定を戻す場合など）
+        """
+        with cls._shared_lock:
+            cls._shared = gate
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def wait_for_budget(self) -> float:
+        """
+        予算に空きができるまで（バックオフ中なら再開まで）待つ。予算は消費しない
+        :return: 待った秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._delay_locked(time.monotonic())
+            if delay <= 0:
+                break
+            time.sleep(delay)
+            waited += delay
+        if waited:
+            with self._lock:
+                self.stats["throttled"] += 1
+                self.stats["throttle_seconds"] += waited
+        return waited
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _delay_locked(self, now: float) -> float:
+        """
+        呼び出しまでに待つべき秒数を返す（ロック取得済みで呼ぶ）
+        """
+        while self._calls and now - self._calls[0] >= self.WINDOW_SECONDS:
+            self._calls.popleft()
+        delay = self._paused_until - now
+        if len(self._calls) >= self.requests_per_minute:
+            delay = max(delay, self._calls[0] + self.WINDOW_SECONDS - now)
+        return delay
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _acquire(self) -> None:
+        """
+        予算を1回分消費する（空きが無ければ待つ）
+        """
+        while True:
+            self.wait_for_budget()
+            with self._lock:
+                now = time.monotonic()
+                if self._delay_locked(now) <= 0:
+                    self._calls.append(now)
+                    self.stats["requests"] += 1
+                    return
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def _retry_after(cls, error: Exception, idempotent: bool = True) -> Optional[float]:
+        """
+        再試行すべきエラーなら待機秒数の指定（Retry-After。無ければ0）を、再試行しないならNoneを返す
+        :param idempotent: Falseなら429（クォータ超過で未反映）だけを再試行対象にする
+        """
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return 0.0 if idempotent else None
+        if isinstance(error, APIError):
+            response = getattr(error, "response", None)
+            status = getattr(response, "status_code", None)
+            if status in (cls.RETRY_STATUS_CODES if idempotent else (429,)):
+                try:
+                    return float(response.headers.get("Retry-After", 0))
+                except (TypeError, ValueError):
+                    return 0.0
+        return None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def call(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args,
+        coalesce_key: Optional[Hashable] = None,
+        idempotent: bool = True,
+        **kwargs
+    ) -> Any:
+        """
+        予算・再試行の制御下でAPI呼び出しを実行する
+        :param name: 集計用の呼び出し名（"append_rows" など）
+        :param fn: gspreadのメソッド
+        :param coalesce_key: 指定時、同じキーの呼び出しが実行中ならその結果を共有する（読み込み専用）
+        :param idempotent: Falseなら反映済みかもしれない失敗（5xx・通信エラー）では再試行しない（追記など）
+        """
+        if coalesce_key is None:
+            return self._call(name, fn, args, kwargs, idempotent)
+
+        with self._lock:
+            inflight = self._inflight.get(coalesce_key)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[coalesce_key] = _InFlight()
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.result
+        try:
+            inflight.result = self._call(name, fn, args, kwargs, idempotent)
+            return inflight.result
+        except BaseException as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(coalesce_key, None)
+            inflight.done.set()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _call(self, name: str, fn: Callable[..., Any], args, kwargs, idempotent: bool = True) -> Any:
+        attempt = 0
+        while True:
+            self._acquire()
+            with self._lock:
+                self.stats["by_name"][name] += 1
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                retry_after = self._retry_after(e, idempotent)
+                if retry_after is None or attempt >= self.max_retries:
+                    with self._lock:
+                        self.stats["failures"] += 1
+                    raise
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                delay = max(retry_after, delay / 2 + random.uniform(0, delay / 2))
+                attempt += 1
+                with self._lock:
+                    self.stats["retries"] += 1
+                    self.stats["backoff_seconds"] += delay
+                    # 他スレッドの呼び出しも同じ時刻まで止め、クォータ回復前に連打しない
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                logger.warning(f"Sheets API {name} が失敗したため {delay:.1f}秒後に再試行します（{attempt}/{self.max_retries}）: {e}")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        呼び出し数・再試行数・待機秒数をログ出力する
+        """
+        stats = self.stats
+        logger.info(
+            f"Sheets API統計: 呼び出し={stats['requests']}回 | 再試行={stats['retries']}回 | 失敗={stats['failures']}回 | "
+            f"共有={stats['coalesced']}回 | 予算待ち={stats['throttled']}回({stats['throttle_seconds']:.1f}秒) | "
+            f"バックオフ={stats['backoff_seconds']:.1f}秒 | 内訳={dict(stats['by_name'])}"
+        )
+# **********************************************************************************
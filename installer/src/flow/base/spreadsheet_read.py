@@ -2,11 +2,16 @@
 # import
 import os                  # OSファイル操作用（認証ファイルの存在チェックなどに使用）
 import logging             # ログ出力用（進捗・エラー記録）
-from typing import List, Dict, Any  # 型ヒント用：List/Dict/Any
+import threading           # プロセス共通キャッシュの排他制御（書き込みスレッドからも参照される）
+from typing import List, Dict, Any, Optional, Tuple  # 型ヒント用：List/Dict/Any/Optional/Tuple
 import pandas as pd        # データ処理・テーブル化（DataFrame）用途
 import gspread             # Google Sheets APIラッパー
 from google.oauth2.service_account import Credentials  # サービスアカウント認証用
-from gspread.exceptions import GSpreadException        # gspread専用例外（API失敗時など）
+from gspread.exceptions import GSpreadException, WorksheetNotFound  # gspread専用例外（API失敗時・シート無し）
+
+from installer.src.flow.base.sheets_api import SheetsApiGate  # API呼び出しの予算・再試行制御
+from installer.src.flow.base.search_condition import SearchCondition  # 日付変換済みの検索条件
+from installer.src.flow.base.search_condition_cache import SearchConditionCache  # 検索条件のローカル保存
 
 logger = logging.getLogger(__name__)  # このファイル専用ロガー（上位でlevel設定が必要）
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
@@ -19,10 +24,26 @@ class SpreadsheetReader:
     Googleスプレッドシートからデータフレーム形式で検索条件情報を取得するクラス
 
     - サービスアカウント認証を用いた安全なAPI利用
-    - データ取得はdictリストまたはDataFrameとして取得可能
+    - データ取得はdictリストまたはDataFrameとして取得可能（同じインスタンスでは1回だけ取得）
+    - load_conditions は日付変換済みの SearchCondition を返し、シートの内容が前回と同じなら
+      ローカル保存した変換済みの検索条件を使い回す（SearchConditionCache）
     - エラー時は全てログ記録＋raise
+    - 認証済みクライアント・Spreadsheet・Worksheetはプロセス内で共有キャッシュし、
+      インスタンスを作り直しても認証やメタデータ取得を繰り返さない
+      （シートが見つからない場合はそのスプレッドシートのキャッシュを捨てて取り直す）
     """
 
+    # プロセス共通のキャッシュ（認証ファイル → クライアント、(認証ファイル, ID) → Spreadsheet、(認証ファイル, ID, シート名) → Worksheet）
+    _clients: Dict[str, gspread.Client] = {}
+    _spreadsheets: Dict[Tuple[str, str], gspread.Spreadsheet] = {}
+    _worksheets: Dict[Tuple[str, str, str], gspread.Worksheet] = {}
+    _cache_lock = threading.RLock()
+    _backend = None  # 差し替え用のクライアント（LocalSheetsBackend等）。Noneなら本物のGoogle Sheetsを使う
+    cache_stats = {
+        "authorize": 0, "open_spreadsheet": 0, "worksheet_hits": 0, "worksheet_misses": 0, "invalidated": 0,
+        "conditions_unchanged": 0, "conditions_loaded": 0,
+    }
+
     # ------------------------------------------------------------------------------
     # 関数定義
     def __init__(
@@ -43,13 +64,30 @@ class SpreadsheetReader:
         self.worksheet_name = worksheet_name      # シート名
         self.credentials_path = credentials_path  # 認証ファイルパス
         self._client = None                      # gspread認証済みクライアント（初回アクセス時にセット）
+        self._records = None                     # 取得済みのシート内データ（get_search_conditions / get_dataframe で共有）
 
     # ------------------------------------------------------------------------------
     # 関数定義
     def _authorize(self):
         """
         Google Sheets APIの認証（gspreadクライアント生成）。
-        サービスアカウント認証ファイルが必要。初回アクセス時だけ呼ばれる。
+        サービスアカウント認証ファイルが必要。同じ認証ファイルではプロセス内で1回だけ認証する。
+        """
+        if self._backend is not None:
+            self._client = self._backend
+            return
+        with self._cache_lock:
+            client = self._clients.get(self.credentials_path)
+            if client is not None:
+                self._client = client
+                return
+            self._authorize_new()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _authorize_new(self):
+        """
+        サービスアカウントで新たに認証し、共有キャッシュへ登録する
         """
         logger.info("Google Sheets APIの認証処理を開始します。")
         try:
@@ -70,11 +108,45 @@ class SpreadsheetReader:
             )
             # gspread認証済みクライアント生成
             self._client = gspread.authorize(credentials)
+            self._clients[self.credentials_path] = self._client
+            self.cache_stats["authorize"] += 1
             logger.info("Google Sheets APIの認証に成功しました。")
         except Exception as e:
             logger.error(f"Google認証時にエラー: {e}")
             raise
 
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _fetch_records(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        シート内の全データ（1行=1レコード）を取得する（同じインスタンスでは2回目以降は取得済みの結果を返す）
+        :param refresh: Trueなら取得済みでもシートから取り直す
+        """
+        if self._records is not None and not refresh:
+            return self._records
+
+        # 初回のみ認証
+        if self._client is None:
+            logger.debug("まだ認証されていないため、認証処理を実施します。")
+            self._authorize()
+
+        # 指定IDのスプレッドシートの指定シートのWorksheet取得（キャッシュ済みなら再利用）
+        worksheet = self.get_worksheet(self.worksheet_name)
+        logger.info(f"スプレッドシート[{self.spreadsheet_id}]・シート[{self.worksheet_name}]からデータを取得します。")
+
+        # 全レコードを辞書リスト形式で取得
+        records = SheetsApiGate.shared().call(
+            "get_all_records", worksheet.get_all_records,
+            coalesce_key=("get_all_records", self.credentials_path, self.spreadsheet_id, self.worksheet_name)
+        )
+        logger.info(f"データの取得が完了しました。取得件数: {len(records)}件")
+        if records:
+            logger.debug(f"先頭レコード例: {records[0]}")  # 1件目を例としてデバッグ出力
+        else:
+            logger.warning("スプレッドシートのデータが空です。")
+        self._records = records
+        return records
+
     # ------------------------------------------------------------------------------
     # 関数定義
     def get_search_conditions(self) -> List[Dict[str, Any]]:
@@ -84,29 +156,39 @@ class SpreadsheetReader:
         """
         logger.info("検索条件データの取得処理を開始します。")
         try:
-            # 初回のみ認証
-            if self._client is None:
-                logger.debug("まだ認証されていないため、認証処理を実施します。")
-                self._authorize()
-
-            # 指定IDのスプレッドシートを開き、指定シートのWorksheet取得
-            spreadsheet = self._client.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(self.worksheet_name)
-            logger.info(f"スプレッドシート[{self.spreadsheet_id}]・シート[{self.worksheet_name}]からデータを取得します。")
-
-            # 全レコードを辞書リスト形式で取得
-            records = worksheet.get_all_records()
-            logger.info(f"データの取得が完了しました。取得件数: {len(records)}件")
-            if records:
-                logger.debug(f"先頭レコード例: {records[0]}")  # 1件目を例としてデバッグ出力
-            else:
-                logger.warning("スプレッドシートのデータが空です。")
-
-            # DataFrameで一旦整形し、recordsで返却（カラム順や整合性確保のため）
-            df = pd.DataFrame(records)
-            logger.debug(f"DataFrame情報: shape={df.shape}")
+            return self._fetch_records()  # [{カラム:値, ...}, ...]で返却
+        except GSpreadException as ge:
+            logger.error(f"gspread APIエラー: {ge}")
+            raise
+        except Exception as e:
+            logger.error(f"スプレッドシート読取時にエラー: {e}")
+            raise
 
-            return df.to_dict(orient="records")  # [{カラム:値, ...}, ...]で返却
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def load_conditions(self, cache: Optional[SearchConditionCache] = None) -> List[SearchCondition]:
+        """
+        検索条件を日付変換済みの SearchCondition のリストで返す
+        cache を渡すと、シートの内容が前回と同じなら日付変換をやり直さずに保存済みの検索条件を使い回す。
+        シートの読み込みは毎回1回だけ行う（スプレッドシートの更新日時は出力先シートへの書き込みでも変わり、
+        検索条件シートが変わったかの判定には使えないため、更新日時の確認で往復を増やさない）
+        :param cache: 検索条件の保存先（Noneなら毎回変換する）
+        """
+        logger.info("検索条件データの取得処理を開始します。")
+        try:
+            cached = cache.load(self.spreadsheet_id, self.worksheet_name) if cache else None
+            records = self._fetch_records(refresh=True)
+            fingerprint = SearchConditionCache.fingerprint(records)
+            if cached and cached["fingerprint"] == fingerprint:
+                self.cache_stats["conditions_unchanged"] += 1
+                logger.info("検索条件シートの内容は前回と同じため、変換済みの検索条件を使います。")
+                conditions = cached["conditions"]
+            else:
+                self.cache_stats["conditions_loaded"] += 1
+                conditions = SearchCondition.parse_all(records)
+            if cache:
+                cache.save(self.spreadsheet_id, self.worksheet_name, fingerprint, conditions)
+            return conditions
         except GSpreadException as ge:
             logger.error(f"gspread APIエラー: {ge}")
             raise
@@ -118,47 +200,125 @@ class SpreadsheetReader:
     # 関数定義
     def get_dataframe(self) -> pd.DataFrame:
         """
-        シート内データをpandas.DataFrame形式で返す
+        シート内データをpandas.DataFrame形式で返す（get_search_conditions で取得済みなら取り直さない）
         :return: DataFrame（1行1レコード）
         """
         logger.info("DataFrame形式で検索条件データを取得します。")
         try:
-            if self._client is None:
-                logger.debug("まだ認証されていないため、認証処理を実施します。")
-                self._authorize()
-            spreadsheet = self._client.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(self.worksheet_name)
-            logger.info(f"スプレッドシート[{self.spreadsheet_id}]・シート[{self.worksheet_name}]からデータを取得します。")
-
-            records = worksheet.get_all_records()
-            logger.info(f"データの取得が完了しました。取得件数: {len(records)}件")
-            if records:
-                logger.debug(f"先頭レコード例: {records[0]}")
-            else:
-                logger.warning("スプレッドシートのデータが空です。")
-
-            df = pd.DataFrame(records)
+            df = pd.DataFrame(self._fetch_records())
             logger.debug(f"DataFrame情報:shape={df.shape}")
             return df
-            print()  # ※このprint()は実行されません（returnの後なので死文）
         except Exception as e:
             logger.error(f"DataFrame取得時にエラー: {e}")
             raise
 
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def get_spreadsheet(self) -> gspread.Spreadsheet:
+        """
+        （認証後に）このIDのSpreadsheetオブジェクトを返す（プロセス内でキャッシュ）
+        """
+        if self._client is None:
+            self._authorize()
+        key = (self.credentials_path, self.spreadsheet_id)
+        with self._cache_lock:
+            spreadsheet = self._spreadsheets.get(key)
+            if spreadsheet is None:
+                spreadsheet = SheetsApiGate.shared().call(
+                    "open_by_key", self._client.open_by_key, self.spreadsheet_id, coalesce_key=("open_by_key", key)
+                )
+                self._spreadsheets[key] = spreadsheet
+                self.cache_stats["open_spreadsheet"] += 1
+            return spreadsheet
+
     # ------------------------------------------------------------------------------
     # 関数定義
     def get_worksheet(self, sheet_name: str) -> gspread.Worksheet:
         """
-        （認証後に）指定名のWorksheetオブジェクトを返す
+        （認証後に）指定名のWorksheetオブジェクトを返す（プロセス内でキャッシュ）
+        キャッシュしたスプレッドシートにシートが無い場合は、シートの追加・改名に備えて
+        スプレッドシートを開き直して1回だけ取り直す
         :param sheet_name: 取得したいシート名
         :return: gspread.Worksheetインスタンス
+        :raises WorksheetNotFound: 開き直してもシートが無い場合
         """
-        logger.info(f"ワークシート[{sheet_name}]を取得します。")
-        if self._client is None:
-            self._authorize()
+        key = (self.credentials_path, self.spreadsheet_id, sheet_name)
+        with self._cache_lock:
+            worksheet = self._worksheets.get(key)
+            if worksheet is not None:
+                self.cache_stats["worksheet_hits"] += 1
+                return worksheet
+            logger.info(f"ワークシート[{sheet_name}]を取得します。")
+            self.cache_stats["worksheet_misses"] += 1
+            try:
+                worksheet = self._fetch_worksheet(sheet_name)
+            except WorksheetNotFound:
+                logger.warning(f"ワークシート[{sheet_name}]が見つからないため、スプレッドシートを開き直します。")
+                self.invalidate(self.spreadsheet_id)
+                worksheet = self._fetch_worksheet(sheet_name)
+            self._worksheets[key] = worksheet
+            return worksheet
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _fetch_worksheet(self, sheet_name: str) -> gspread.Worksheet:
+        """
+        スプレッドシートのメタデータからシートを取得する（API呼び出し）
+        """
+        spreadsheet = self.get_spreadsheet()
+        return SheetsApiGate.shared().call("worksheet", spreadsheet.worksheet, sheet_name)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def use_backend(cls, backend) -> None:
+        """
+        読み書き先をGoogle Sheetsから差し替える（open_by_keyを持つクライアント互換のもの。Noneで元に戻す）
+        オフラインでの動作確認・書き込みの計測用。キャッシュは破棄する
+        """
+        with cls._cache_lock:
+            cls._backend = backend
+        cls.invalidate()
 
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def current_backend(cls):
+        """
+        差し替え中の読み書き先を返す（Google Sheetsを使っている場合はNone）
+        """
+        with cls._cache_lock:
+            return cls._backend
 
-        spreadsheet = self._client.open_by_key(self.spreadsheet_id)
-        worksheet = spreadsheet.worksheet(sheet_name)
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def invalidate(cls, spreadsheet_id: str = None, sheet_name: str = None) -> None:
+        """
+        キャッシュを破棄する
+        :param spreadsheet_id: 対象のスプレッドシートID（Noneなら全スプレッドシート）
+        :param sheet_name: 指定時はそのシートのWorksheetだけを破棄（Spreadsheetは残す）
+        """
+        with cls._cache_lock:
+            cls.cache_stats["invalidated"] += 1
+            for key in list(cls._worksheets):
+                if (spreadsheet_id is None or key[1] == spreadsheet_id) and (sheet_name is None or key[2] == sheet_name):
+                    del cls._worksheets[key]
+            if sheet_name is None:
+                for key in list(cls._spreadsheets):
+                    if spreadsheet_id is None or key[1] == spreadsheet_id:
+                        del cls._spreadsheets[key]
 
-        return worksheet
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def log_cache_stats(cls) -> None:
+        """
+        認証・スプレッドシート取得の回数とワークシートキャッシュの命中数をログ出力する
+        """
+        stats = cls.cache_stats
+        logger.info(
+            f"Sheetsキャッシュ統計: 認証={stats['authorize']}回 | スプレッドシート取得={stats['open_spreadsheet']}回 | "
+            f"ワークシート 命中={stats['worksheet_hits']}回 / 取得={stats['worksheet_misses']}回 | 破棄={stats['invalidated']}回 | "
+            f"検索条件 内容同一で変換済みを使用={stats['conditions_unchanged']}回 / 変換={stats['conditions_loaded']}回"
+        )
@@ -1,6 +1,11 @@
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
 # import
 import logging  # ログ出力用。エラーや進捗管理、デバッグ等で活用
+import re  # 追記結果の範囲（updatedRange）から開始行・最終行を取り出す
+import threading  # 保留中の行の排他制御（書き込みスレッドからも呼ばれる）
+from typing import Any, Dict, List  # 型ヒント用
+
+from installer.src.flow.base.sheets_api import SheetsApiGate  # API呼び出しの予算・再試行制御
 
 logger = logging.getLogger(__name__)  # このファイル専用のロガーインスタンスを取得
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
@@ -11,30 +16,238 @@ class SpreadsheetWriter:
     """
     Googleスプレッドシートなどのworksheet（gspread等）への
     行データ書き込みをサポートするユーティリティクラス
+
+    - add_rows で複数のworksheet分の行を溜め、commit でシートごとに values.append 1回で書き込む
+      （書き込み位置はAPI側が表の末尾に決めるため、A列を読んで空き行を探す必要が無い）
+    - 追記は INSERT_ROWS で行を挿入して書くため、空行で表が分かれていても後続の行を上書きしない
+    - シートごとの次の書き込み行（カーソル）をプロセス内で保持し、追記結果の開始行と食い違えば
+      手動編集として警告してカーソルを合わせ直す（確認は応答の updatedRange だけで行い、読み込みはしない）
+    - 値は USER_ENTERED で送るため、IMAGE関数などの数式はシート上で数式として評価される
+    - API呼び出し回数・書き込み行数を stats に集計する
+    - API呼び出しは全て SheetsApiGate を通す（クォータ超過・5xxは待って再試行。追記は429のみ再試行）。
+      commit は予算の空きを待ってから保留行を取り出すため、待っている間に追加された行も同じ呼び出しにまとまる
     """
 
+    # 書き込みたいカラムキーの順番
+    RECORD_KEYS = ["date", "title", "price", "ct", "1ct_price", "image"]
+
+    # シートごとの次の書き込み行（(スプレッドシートID, シートID) → 行番号）。プロセス内で共有する
+    _cursors: Dict[Any, int] = {}
+    _cursor_lock = threading.Lock()
+    UPDATED_RANGE_ROWS = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$")  # "'シート'!A11:F12" の開始行・最終行
+
     # ------------------------------------------------------------------------------
     # 関数定義
-    def __init__(self, worksheet):
+    def __init__(self, worksheet=None):
         """
         コンストラクタ
-        :param worksheet: 書き込み対象のworksheet（gspreadのWorksheet等を想定）
+        :param worksheet: 書き込み対象のworksheet（gspreadのWorksheet等を想定）。
+                          add_rows/append_rows でworksheetを省略した場合の書き込み先
         """
         self.worksheet = worksheet  # クラス内でworksheet操作するために保存
+        self._lock = threading.RLock()
+        self._pending: Dict[Any, Dict[str, Any]] = {}  # (スプレッドシートID, シートID) → {"worksheet", "rows"}
+        self.stats = {"calls": 0, "rows": 0, "commits": 0, "cursor_hits": 0, "cursor_resyncs": 0}
 
     # ------------------------------------------------------------------------------
     # 関数定義
     def find_first_empty_row(self):
         """
-        A列（1列目）の最初の空セルの行番号を返す  
-        （1行目はヘッダーとして無視し、2行目以降のみ対象）  
+        ※A列全体を取得するため、書き込みのたびには使わない（通常の書き込みは values.append で末尾に追記する）
+        A列（1列目）の最初の空セルの行番号を返す
+        （1行目はヘッダーとして無視し、2行目以降のみ対象）
         もし全て埋まっていれば、その下の行番号を返す
         :return: 書き込み開始するべき行番号（1始まり）
         """
-        col_values = self.worksheet.col_values(1)  # A列すべてのセル値をリストで取得
+        col_values = SheetsApiGate.shared().call("col_values", self.worksheet.col_values, 1)  # A列すべてのセル値をリストで取得
         # 1行目（ヘッダー）は飛ばして、2行目以降で空セルを探す
         for idx, val in enumerate(col_values[1:], start=2):  # enumerateで行番号と値をセットで取得（start=2で2行目始まり）
             if not val:  # 空セルを見つけたら
                 return idx  # その行番号を返す
         # もしA列に空きがなければ、データ末尾の「次の行」（append的に書き込む場合）
-        return len(col_values) + 1  # 既存最終行の次（空行）
\ No newline at end of file
+        return len(col_values) + 1  # 既存最終行の次（空行）
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def format_image_formula(url: str) -> str:
+        """
+        Google SheetsのIMAGE関数を作る（セルに画像を埋め込む用途。4はカスタムサイズ指定、80x80px）
+        """
+        return f'=IMAGE("{url}", 4, 80, 80)'
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @classmethod
+    def record_row(cls, record: Dict[str, Any]) -> List[Any]:
+        """
+        抽出結果1件（辞書）をシート書き込み用の1行（RECORD_KEYSの順）に変換する
+        （日付は先頭に'をつけて文字列化し日付変換を防止、画像URLはIMAGE関数に変換。
+          DetailPageFlowの抽出結果のように整形済みの値はそのまま使う）
+        """
+        row = [record.get(key, "") for key in cls.RECORD_KEYS]
+        if row[0] and not str(row[0]).startswith("'"):
+            row[0] = f"'{row[0]}"
+        if row[-1] and not str(row[-1]).startswith("="):
+            row[-1] = cls.format_image_formula(row[-1])
+        return row
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def add_rows(self, rows: List[List[Any]], worksheet=None) -> None:
+        """
+        書き込む行を保留に追加する（commitまで書き込まない）
+        :param rows: 行リストのリスト
+        :param worksheet: 書き込み先（省略時はコンストラクタのworksheet）
+        """
+        worksheet = worksheet or self.worksheet
+        if worksheet is None:
+            raise ValueError("書き込み先のworksheetが指定されていません")
+        if not rows:
+            return
+        key = (worksheet.spreadsheet.id, worksheet.id)
+        with self._lock:
+            pending = self._pending.setdefault(key, {"worksheet": worksheet, "rows": []})
+            pending["rows"].extend(rows)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def append_rows(self, rows: List[List[Any]], worksheet=None) -> int:
+        """
+        行を追加してすぐに書き込む（add_rows ＋ commit。他スレッドの行が割り込まないよう一括で行う）
+        :return: 書き込んだ行数
+        """
+        with self._lock:
+            self.add_rows(rows, worksheet)
+            return self.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def commit(self) -> int:
+        """
+        保留中の全シート分の行を、シートごとに values.append 1回で書き込む
+        失敗したシート以降の分は保留に戻してから例外を送出する
+        :return: 書き込んだ行数
+        """
+        # 予算待ち・バックオフ中に追加された行も今回の書き込みにまとめる
+        SheetsApiGate.shared().wait_for_budget()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            written = 0
+            remaining = list(pending.items())
+            while remaining:
+                _, entry = remaining[0]
+                try:
+                    written += self._append(entry["worksheet"], entry["rows"])
+                except Exception as e:
+                    logger.error(f"シート[{entry['worksheet'].title}]への書き込み失敗: {e}")
+                    # 未書き込み分（このシート以降）を保留に戻す
+                    for key, unwritten in remaining:
+                        restored = self._pending.setdefault(key, {"worksheet": unwritten["worksheet"], "rows": []})
+                        restored["rows"][:0] = unwritten["rows"]
+                    raise
+                remaining.pop(0)
+            if written:
+                self.stats["commits"] += 1
+            return written
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _append(self, worksheet, rows: List[List[Any]]) -> int:
+        """
+        1シート分の行を values.append 1回で末尾に追記する（書き込み位置はAPI側で決まるため読み込み不要）
+        """
+        # 追記は繰り返すと二重に書かれるため、未反映が確実な429だけ再試行する
+        # （INSERT_ROWS: 表の直後に行を挿入して書く。既定のOVERWRITEだと空行の下にある行を上書きしうる）
+        try:
+            response = SheetsApiGate.shared().call(
+                "append_rows", worksheet.append_rows, rows,
+                value_input_option="USER_ENTERED", insert_data_option="INSERT_ROWS",
+                table_range="A1", idempotent=False
+            )
+        except Exception:
+            self.forget_cursor(worksheet)
+            raise
+        self._count(1, len(rows))
+        self._check_cursor(worksheet, response)
+        return len(rows)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _check_cursor(self, worksheet, response: Any) -> None:
+        """
+        追記された範囲（updatedRange）の開始行をカーソルと比べ、最終行の次へカーソルを進める
+        開始行がカーソルと違えば、手動での行の追加・削除や空行で表が分かれたものとして警告し、合わせ直す
+        """
+        updated = ((response or {}).get("updates") or {}).get("updatedRange", "") if isinstance(response, dict) else ""
+        match = self.UPDATED_RANGE_ROWS.search(updated)
+        if not match:
+            self.forget_cursor(worksheet)  # 範囲が取れない応答では確認できないため、次回の追記から取り直す
+            return
+        start_row = int(match.group(1))
+        end_row = int(match.group(2) or match.group(1))
+        key = (worksheet.spreadsheet.id, worksheet.id)
+        with self._cursor_lock:
+            expected = self._cursors.get(key)
+            self._cursors[key] = end_row + 1
+        if expected is None:
+            return
+        if start_row == expected:
+            self.stats["cursor_hits"] += 1
+        else:
+            self.stats["cursor_resyncs"] += 1
+            logger.warning(
+                f"シート[{worksheet.title}]の追記位置が想定({expected}行目)と異なります: {updated} "
+                f"（手動での行の追加・削除、または空行で表が分かれている可能性があります）"
+            )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def forget_cursor(self, worksheet) -> None:
+        """
+        指定シートのカーソルを破棄する（次の追記結果から取り直す）
+        """
+        with self._cursor_lock:
+            self._cursors.pop((worksheet.spreadsheet.id, worksheet.id), None)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _count(self, calls: int, rows: int) -> None:
+        self.stats["calls"] += calls
+        self.stats["rows"] += rows
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def discard(self, worksheet) -> int:
+        """
+        指定シートの保留行を書き込まずに捨てる（呼び出し側で失敗として扱い、別途書き直す場合）
+        :return: 捨てた行数
+        """
+        with self._lock:
+            entry = self._pending.pop((worksheet.spreadsheet.id, worksheet.id), None)
+        self.forget_cursor(worksheet)
+        return len(entry["rows"]) if entry else 0
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def pending_rows(self) -> int:
+        """
+        保留中（未書き込み）の行数を返す
+        """
+        with self._lock:
+            return sum(len(entry["rows"]) for entry in self._pending.values())
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        API呼び出し回数・書き込み行数・1呼び出しあたりの行数をログ出力する
+        """
+        calls = self.stats["calls"]
+        per_call = self.stats["rows"] / calls if calls else 0.0
+        logger.info(
+            f"シート書き込み統計: API呼び出し={calls}回 | 書込={self.stats['rows']}行 | "
+            f"{per_call:.1f}行/呼び出し | コミット={self.stats['commits']}回 | "
+            f"追記位置の一致={self.stats['cursor_hits']}回 | ずれ検出={self.stats['cursor_resyncs']}回"
+        )
+# **********************************************************************************
@@ -0,0 +1,161 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import time                                                      # 経過時間によるフラッシュ判定
+import logging                                                   # ログ出力用
+import threading                                                 # バッファの排他制御
+from concurrent.futures import Future, ThreadPoolExecutor        # 書き込み用の専用スレッド
+from typing import Any, Callable, Dict, List, Optional           # 型ヒント用
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class StreamingSink:
+    """
+    受け取った行を小さなバッチにまとめ、抽出の途中でも順次書き込むクラス
+
+    - バッファが batch_rows 件に達したか、最初の行から flush_seconds 秒経ったらフラッシュする
+    - 書き込みは専用スレッドで行い、同時に書き込み中のバッチは最大1つ
+      （前のバッチが書き込み中なら、次のフラッシュはその完了を待つ）
+    - 保持する行は「バッファ（最大batch_rows件）＋書き込み中の1バッチ」に収まる
+    - バッチの書き込み失敗はそのバッチだけの失敗として記録し、以降のバッチは書き込みを続ける
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        write_batch: Callable[[List[Any]], None],
+        batch_rows: int = 100,
+        flush_seconds: float = 5.0,
+        on_flushed: Optional[Callable[[List[Any]], None]] = None,
+        name: str = ""
+    ):
+        """
+        コンストラクタ
+        :param write_batch: 1バッチ分の行を書き込む関数（失敗時は例外を送出する）
+        :param batch_rows: 1バッチの最大行数
+        :param flush_seconds: バッファの最初の行からこの秒数経ったらフラッシュする（0以下なら時間では判定しない）
+        :param on_flushed: バッチの書き込み成功後に、そのバッチの行を渡して呼ぶ関数（途中経過の記録用）
+        :param name: ログ出力用の名前
+        """
+        self.write_batch = write_batch
+        self.batch_rows = max(1, batch_rows)
+        self.flush_seconds = flush_seconds
+        self.on_flushed = on_flushed
+        self.name = name
+        self._lock = threading.Lock()
+        self._buffer: List[Any] = []
+        self._buffer_started: Optional[float] = None
+        self._inflight: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sink")
+        self._closed = False
+        self.stats: Dict[str, Any] = {
+            "rows": 0, "batches": 0, "failed_rows": 0, "failed_batches": 0,
+            "write_seconds": 0.0, "wait_seconds": 0.0, "max_buffered": 0,
+        }
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def add(self, row: Any) -> None:
+        """
+        1行を追加し、件数または経過時間が閾値に達していればフラッシュする
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"クローズ済みのシンクには追加できません: {self.name}")
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(row)
+            self.stats["max_buffered"] = max(self.stats["max_buffered"], len(self._buffer))
+            if len(self._buffer) >= self.batch_rows or self._is_due():
+                self._flush_locked()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def poll(self) -> None:
+        """
+        行の追加が途切れている間に呼び、経過時間が閾値に達していればフラッシュする
+        """
+        with self._lock:
+            if self._buffer and self._is_due():
+                self._flush_locked()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def seconds_until_due(self) -> Optional[float]:
+        """
+        時間によるフラッシュまでの残り秒数を返す（バッファが空、または時間で判定しない場合はNone）
+        """
+        with self._lock:
+            if not self._buffer or self.flush_seconds <= 0:
+                return None
+            return max(0.0, self.flush_seconds - (time.monotonic() - self._buffer_started))
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _is_due(self) -> bool:
+        return self.flush_seconds > 0 and time.monotonic() - self._buffer_started >= self.flush_seconds
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _flush_locked(self) -> None:
+        """
+        書き込み中のバッチの完了を待ってから、バッファを次のバッチとして書き込みスレッドへ渡す
+        """
+        self._wait_inflight()
+        batch, self._buffer, self._buffer_started = self._buffer, [], None
+        if batch:
+            self._inflight = self._executor.submit(self._write, batch)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _wait_inflight(self) -> None:
+        if self._inflight is None:
+            return
+        started = time.perf_counter()
+        self._inflight.result()  # _write内で例外を処理するため、ここでは送出されない
+        self.stats["wait_seconds"] += time.perf_counter() - started
+        self._inflight = None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _write(self, batch: List[Any]) -> None:
+        """
+        1バッチを書き込む（書き込みスレッドで実行）
+        """
+        started = time.perf_counter()
+        try:
+            self.write_batch(batch)
+        except Exception as e:
+            self.stats["failed_rows"] += len(batch)
+            self.stats["failed_batches"] += 1
+            logger.error(f"バッチ書き込み失敗[{self.name}]: {len(batch)}行 | {e}")
+            return
+        finally:
+            self.stats["write_seconds"] += time.perf_counter() - started
+        self.stats["rows"] += len(batch)
+        self.stats["batches"] += 1
+        if self.on_flushed:
+            try:
+                self.on_flushed(batch)
+            except Exception as e:
+                logger.warning(f"書き込み済みバッチの記録に失敗[{self.name}]: {e}")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> Dict[str, Any]:
+        """
+        残りのバッファを書き込み、全バッチの完了を待って統計を返す
+        """
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+                self._wait_inflight()
+                self._closed = True
+                self._executor.shutdown(wait=True)
+        logger.debug(f"ストリーミング書き込み[{self.name}]: {self.stats}")
+        return self.stats
+# **********************************************************************************
@@ -18,7 +18,9 @@ class UrlBuilder:
     - URL生成失敗時はエラーログ＆例外スロー
     """
     BASE_URL = "https://auctions.yahoo.co.jp/closedsearch/closedsearch"   # 検索ページのベースURL
-    URL_TEMPLATE = BASE_URL + "?p={kw}&va={kw}&b=1&n=50"                  # パラメータ埋め込み用テンプレ
+    URL_TEMPLATE = BASE_URL + "?p={kw}&va={kw}&b={b}&n={n}"               # パラメータ埋め込み用テンプレ（b=開始位置, n=件数）
+    DEFAULT_PAGE_SIZE = 50                                                # 従来の1ページ件数
+    MAX_PAGE_SIZE = 100                                                   # サイトが受け付ける1ページ最大件数
 
     # ------------------------------------------------------------------------------
     # 関数定義
@@ -28,12 +30,14 @@ class UrlBuilder:
 
     # ------------------------------------------------------------------------------
     # 関数定義
-    def build_url(self, keyword: str) -> str:
+    def build_url(self, keyword: str, offset: int = 1, per_page: int = DEFAULT_PAGE_SIZE) -> str:
         """
         1つの検索キーワードから、URLを生成して返す。
 
         Args:
             keyword (str): 検索ワード（日本語可）
+            offset (int): 結果の開始位置（b パラメータ、1始まり）
+            per_page (int): 1ページの件数（n パラメータ、最大MAX_PAGE_SIZE）
 
         Returns:
             str: 完成した検索用URL
@@ -50,7 +54,11 @@ class UrlBuilder:
             encoded_kw = quote(keyword)  # URLで安全に扱えるようエンコード（例：空白→%20、日本語→%E3%80%82等）
             logger.debug(f"キーワードをURLエンコード済み：\n{encoded_kw}")
 
-            url = self.URL_TEMPLATE.format(kw=encoded_kw)  # テンプレート文字列に埋め込む
+            if offset < 1:
+                raise ValueError(f"開始位置は1以上である必要があります（受信: {offset}）")
+            per_page = max(1, min(per_page, self.MAX_PAGE_SIZE))
+
+            url = self.URL_TEMPLATE.format(kw=encoded_kw, b=offset, n=per_page)  # テンプレート文字列に埋め込む
             # logger.info(f"URL生成完了：{url}")
             # logger.info("URL生成完了")
             return url  # 正常時は完成した検索URLを返す
@@ -59,6 +67,23 @@ class UrlBuilder:
             logger.error(f"URL生成に失敗しました（keyword: {keyword}）: {e}")
             raise  # 上位へ例外伝播
 
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def build_page_url(self, keyword: str, page_index: int, per_page: int = MAX_PAGE_SIZE) -> str:
+        """
+        0始まりのページ番号から、そのページの検索URLを生成して返す（b = page_index * per_page + 1）
+
+        Args:
+            keyword (str): 検索ワード
+            page_index (int): ページ番号（0始まり）
+            per_page (int): 1ページの件数
+
+        Returns:
+            str: 指定ページの検索用URL
+        """
+        per_page = max(1, min(per_page, self.MAX_PAGE_SIZE))
+        return self.build_url(keyword, offset=page_index * per_page + 1, per_page=per_page)
+
     # ------------------------------------------------------------------------------
     # 関数定義
     def build_urls_from_dataframe(self, df: pd.DataFrame, keyword_column: str = "keyword") -> List[str]:
@@ -25,6 +25,24 @@ class DateConverter:
         Returns:
             datetime.date: 年月日だけ（時刻情報は捨てる）
 
+        Raises:
+            ValueError: フォーマットに合致しなかった場合や変換失敗時
+        """
+        return DateConverter.convert_datetime(date_str).date()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def convert_datetime(date_str: str) -> datetime:
+        """
+        ヤフオク終了日時文字列から日時（datetime.datetime型、分単位）を抽出して返す
+
+        Args:
+            date_str (str): 終了日時の文字列（例: '06/27 22:13'や'7月15日（火）23時0分 終了'）
+
+        Returns:
+            datetime.datetime: 年月日＋時分
+
         Raises:
             ValueError: フォーマットに合致しなかった場合や変換失敗時
         """
@@ -37,7 +55,7 @@ class DateConverter:
                 year = datetime.now().year          # 年は今年で固定（未来日対応不要ならこれでOK）
                 dt = datetime(year, month, day, hour, minute)  # 日時オブジェクト生成
                 logger.info(f"終了日時パース: {date_str} → {dt}")  # 変換結果をログ出力
-                return dt.date()                    # 年月日部分だけ返す
+                return dt
 
             # パターン2: スラッシュ表記（例: "06/27 22:13"など）
             m2 = re.search(r"(\d{1,2})/(\d{1,2}) (\d{1,2}):(\d{1,2})", date_str)
@@ -46,7 +64,7 @@ class DateConverter:
                 year = datetime.now().year
                 dt = datetime(year, month, day, hour, minute)
                 logger.info(f"終了日時パース: {date_str} → {dt}")
-                return dt.date()
+                return dt
 
             # 上記どちらのパターンにも合致しなかった場合（不正なフォーマット）
             logger.error(f"終了日時パース失敗: {date_str}")
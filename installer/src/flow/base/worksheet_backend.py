@@ -0,0 +1,364 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import re                                       # A1表記の解析
+import json                                     # 1行分のセル値の保存形式
+import time                                     # 擬似レイテンシ
+import logging                                  # ログ出力用
+import os                                       # 保存先ディレクトリの作成
+import sqlite3                                  # シート内容の保存先（":memory:" も可）
+import threading                                # 複数スレッドからの同時アクセス制御
+from abc import ABC, abstractmethod             # ワークシートのインターフェース定義
+from collections import Counter                 # 呼び出し回数の集計
+from typing import Any, Dict, List, Optional, Tuple  # 型ヒント用
+
+from gspread.exceptions import WorksheetNotFound  # gspreadと同じ例外で「シート無し」を表す
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class WorksheetBackend(ABC):
+    """
+    書き込み・読み込み処理が使うワークシートのインターフェース
+    （gspread.Worksheet は継承していないが、このメソッド群をそのまま満たす。ローカル代替は LocalWorksheet）
+
+    - id / title / spreadsheet 属性
+    - col_values(col) / update(range_name, values, value_input_option) /
+      append_rows(values, value_input_option, insert_data_option, table_range) / get_all_records()
+    - spreadsheet 側は id / worksheet(title)
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @abstractmethod
+    def col_values(self, col: int) -> List[Any]:
+        ...
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @abstractmethod
+    def update(self, range_name: str, values: List[List[Any]], value_input_option: str = "RAW") -> Dict[str, Any]:
+        ...
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @abstractmethod
+    def append_rows(self, values: List[List[Any]], value_input_option: str = "RAW", insert_data_option: str = None,
+                    table_range: str = None) -> Dict[str, Any]:
+        ...
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @abstractmethod
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        ...
+
+
+# **********************************************************************************
+# class定義
+class LocalSheetsBackend:
+    """
+    Google Sheetsの代わりにSQLiteへ読み書きするローカルのバックエンド（gspread.Client の代替）
+
+    - open_by_key(ID) で LocalSpreadsheet を返す（SpreadsheetReader.use_backend で差し替える）
+    - API呼び出し1回ごとに latency 秒、読み書き1行ごとに per_row_latency 秒の擬似遅延を入れる
+    - 呼び出し回数（メソッド別）・書き込み行数を stats に集計する
+    - 数式（IMAGE関数など）は評価せず、送られた文字列をそのまま保存する
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS sheets (
+            spreadsheet_id TEXT NOT NULL,
+            sheet_id       INTEGER NOT NULL,
+            title          TEXT NOT NULL,
+            PRIMARY KEY (spreadsheet_id, sheet_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sheet_rows (
+            spreadsheet_id TEXT NOT NULL,
+            sheet_id       INTEGER NOT NULL,
+            row            INTEGER NOT NULL,
+            data           TEXT NOT NULL,
+            PRIMARY KEY (spreadsheet_id, sheet_id, row)
+        )
+        """,
+    )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, path: str = ":memory:", latency: float = 0.0, per_row_latency: float = 0.0, auto_create: bool = True):
+        """
+        コンストラクタ
+        :param path: SQLiteファイルのパス（":memory:" でメモリ上）
+        :param latency: API呼び出し1回あたりの擬似遅延（秒）
+        :param per_row_latency: 読み書き1行あたりの擬似遅延（秒）
+        :param auto_create: 存在しないシートを worksheet() で開いたとき自動作成するか（Falseなら WorksheetNotFound）
+        """
+        self.path = path
+        self.latency = latency
+        self.per_row_latency = per_row_latency
+        self.auto_create = auto_create
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {"calls": 0, "rows_written": 0, "rows_read": 0, "by_method": Counter()}
+        try:
+            directory = os.path.dirname(path)
+            if path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            # 並列実行では各プロセスが同じファイルへ追記するため、WALにしてロック中は最大30秒待つ
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+        except Exception as e:
+            logger.error(f"ローカルシートの保存先を開けません: {path} | {e}")
+            raise
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def open_by_key(self, spreadsheet_id: str) -> "LocalSpreadsheet":
+        """
+        スプレッドシートを開く（gspread.Client.open_by_key の代替）
+        """
+        self.simulate("open_by_key")
+        return LocalSpreadsheet(self, spreadsheet_id)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def simulate(self, method: str, rows: int = 0, written: bool = False) -> None:
+        """
+        1回のAPI呼び出しを記録し、擬似遅延を入れる
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["by_method"][method] += 1
+            self.stats["rows_written" if written else "rows_read"] += rows
+        delay = self.latency + self.per_row_latency * rows
+        if delay > 0:
+            time.sleep(delay)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def execute(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+        return rows
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def write_rows(self, spreadsheet_id: str, sheet_id: int, start_row: int, start_col: int, values: List[List[Any]]) -> None:
+        """
+        start_row行・start_col列（1始まり）から values を書き込む（既存セルは上書き）
+        """
+        with self._lock:
+            for offset, new_values in enumerate(values):
+                row = start_row + offset
+                current = self._conn.execute(
+                    "SELECT data FROM sheet_rows WHERE spreadsheet_id = ? AND sheet_id = ? AND row = ?",
+                    (spreadsheet_id, sheet_id, row)
+                ).fetchone()
+                cells = json.loads(current[0]) if current else []
+                if len(cells) < start_col - 1 + len(new_values):
+                    cells.extend([""] * (start_col - 1 + len(new_values) - len(cells)))
+                cells[start_col - 1:start_col - 1 + len(new_values)] = list(new_values)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sheet_rows (spreadsheet_id, sheet_id, row, data) VALUES (?, ?, ?, ?)",
+                    (spreadsheet_id, sheet_id, row, json.dumps(cells, ensure_ascii=False))
+                )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def read_rows(self, spreadsheet_id: str, sheet_id: int) -> Dict[int, List[Any]]:
+        """
+        シートの全行を {行番号: セル値リスト} で返す
+        """
+        rows = self.execute(
+            "SELECT row, data FROM sheet_rows WHERE spreadsheet_id = ? AND sheet_id = ? ORDER BY row",
+            (spreadsheet_id, sheet_id)
+        )
+        return {row: json.loads(data) for row, data in rows}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def log_stats(self) -> None:
+        """
+        呼び出し回数・行数をログ出力する
+        """
+        logger.info(
+            f"ローカルシート統計: 呼び出し={self.stats['calls']}回 | 書込={self.stats['rows_written']}行 | "
+            f"読込={self.stats['rows_read']}行 | 内訳={dict(self.stats['by_method'])}"
+        )
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# **********************************************************************************
+# class定義
+class LocalSpreadsheet:
+    """
+    LocalSheetsBackend上のスプレッドシート（gspread.Spreadsheet の代替）
+    """
+
+    A1_RANGE = re.compile(r"^(?:(?P<title>'(?:[^']|'')*'|[^!]+)!)?(?P<col>[A-Z]+)(?P<row>\d*)(?::(?P<end_col>[A-Z]+)(?P<end_row>\d*))?$")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, backend: LocalSheetsBackend, spreadsheet_id: str):
+        self.backend = backend
+        self.id = spreadsheet_id
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def worksheet(self, title: str) -> "LocalWorksheet":
+        """
+        シート名でシートを返す（無ければ auto_create に応じて作成、または WorksheetNotFound）
+        """
+        self.backend.simulate("worksheet")
+        return self._find(title, create=self.backend.auto_create)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def add_worksheet(self, title: str) -> "LocalWorksheet":
+        self.backend.simulate("add_worksheet")
+        return self._find(title, create=True)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _find(self, title: str, create: bool) -> "LocalWorksheet":
+        rows = self.backend.execute(
+            "SELECT sheet_id FROM sheets WHERE spreadsheet_id = ? AND title = ?", (self.id, title)
+        )
+        if rows:
+            return LocalWorksheet(self, rows[0][0], title)
+        if not create:
+            raise WorksheetNotFound(title)
+        next_id = self.backend.execute(
+            "SELECT COALESCE(MAX(sheet_id), -1) + 1 FROM sheets WHERE spreadsheet_id = ?", (self.id,)
+        )[0][0]
+        self.backend.execute(
+            "INSERT INTO sheets (spreadsheet_id, sheet_id, title) VALUES (?, ?, ?)", (self.id, next_id, title)
+        )
+        return LocalWorksheet(self, next_id, title)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def column_number(letters: str) -> int:
+        """
+        列記号（A, B, ..., AA）を1始まりの列番号にする
+        """
+        number = 0
+        for letter in letters:
+            number = number * 26 + ord(letter) - ord("A") + 1
+        return number
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def parse_range(self, range_name: str) -> Tuple[Optional[str], int, int, Optional[int], Optional[int]]:
+        """
+        A1表記を (シート名, 開始列, 開始行, 終了列, 終了行) にする（行省略時は開始行1・終了行None）
+        """
+        match = self.A1_RANGE.match(range_name)
+        if not match:
+            raise ValueError(f"解析できない範囲です: {range_name}")
+        title = match.group("title")
+        if title and title.startswith("'"):
+            title = title[1:-1].replace("''", "'")
+        start_row = int(match.group("row")) if match.group("row") else 1
+        end_col = self.column_number(match.group("end_col")) if match.group("end_col") else None
+        end_row = int(match.group("end_row")) if match.group("end_row") else None
+        return title, self.column_number(match.group("col")), start_row, end_col, end_row
+
+
+# **********************************************************************************
+# class定義
+class LocalWorksheet(WorksheetBackend):
+    """
+    LocalSheetsBackend上のワークシート（gspread.Worksheet の代替）
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, spreadsheet: LocalSpreadsheet, sheet_id: int, title: str):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _rows(self) -> Dict[int, List[Any]]:
+        return self.spreadsheet.backend.read_rows(self.spreadsheet.id, self.id)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def col_values(self, col: int) -> List[Any]:
+        """
+        指定列の値を最終の値がある行まで返す（空セルは ""）
+        """
+        stored = self._rows()
+        values = [stored.get(row, [])[col - 1] if len(stored.get(row, [])) >= col else ""
+                  for row in range(1, (max(stored) if stored else 0) + 1)]
+        while values and values[-1] in ("", None):
+            values.pop()
+        self.spreadsheet.backend.simulate("col_values", len(values))
+        return values
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def update(self, range_name: str, values: List[List[Any]], value_input_option: str = "RAW") -> Dict[str, Any]:
+        """
+        range_name（"A5" など）を左上として values を書き込む
+        """
+        _, start_col, start_row, _, _ = self.spreadsheet.parse_range(range_name)
+        self.spreadsheet.backend.write_rows(self.spreadsheet.id, self.id, start_row, start_col, values)
+        self.spreadsheet.backend.simulate("update", len(values), written=True)
+        return {"updatedRange": f"'{self.title}'!{range_name}", "updatedRows": len(values)}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def append_rows(self, values: List[List[Any]], value_input_option: str = "RAW", insert_data_option: str = None,
+                    table_range: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        値のある最終行の次から values を追記する（values.append と同じく、追記範囲を updatedRange で返す）
+        （最終行より下には行が無いため、insert_data_option による違いは無い）
+        """
+        start_row = self.spreadsheet.backend.execute(
+            "SELECT COALESCE(MAX(row), 0) + 1 FROM sheet_rows WHERE spreadsheet_id = ? AND sheet_id = ?",
+            (self.spreadsheet.id, self.id)
+        )[0][0]
+        self.spreadsheet.backend.write_rows(self.spreadsheet.id, self.id, start_row, 1, values)
+        self.spreadsheet.backend.simulate("append_rows", len(values), written=True)
+        end_row = start_row + len(values) - 1
+        width = max((len(row) for row in values), default=1)
+        end_col = ""
+        number = width
+        while number:
+            number, remainder = divmod(number - 1, 26)
+            end_col = chr(ord("A") + remainder) + end_col
+        return {"updates": {"updatedRange": f"'{self.title}'!A{start_row}:{end_col}{end_row}", "updatedRows": len(values)}}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        """
+        1行目をヘッダーとして、2行目以降を辞書のリストで返す
+        """
+        stored = self._rows()
+        header = stored.get(1, [])
+        records = []
+        for row in range(2, (max(stored) if stored else 0) + 1):
+            cells = stored.get(row, [])
+            records.append({key: cells[i] if i < len(cells) else "" for i, key in enumerate(header)})
+        self.spreadsheet.backend.simulate("get_all_records", len(records))
+        return records
+# **********************************************************************************
@@ -1,9 +1,17 @@
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
 # import
 import logging  # ロギング用。エラーや進捗の可視化・運用監視に必須
+from typing import Any, Callable, Dict, Optional  # 型ヒント用
 from installer.src.flow.base.number_calculator import PriceCalculator  # 1カラット単価計算ユーティリティ
 from installer.src.utils.text_utils import NumExtractor                # タイトルからカラット数を抽出するためのユーティリティ
 from installer.src.flow.base.utils import DateConverter               # 終了日時文字列をdate型へ変換するためのユーティリティ
+from installer.src.flow.base.selenium_manager import Selenium          # フォールバック時に使うSeleniumラッパー
+from installer.src.flow.base.http_fetcher import HttpFetcher           # HTTP(keep-alive)でのHTML取得
+from installer.src.flow.base.html_parser import HtmlParser             # lxmlによる詳細ページ解析
+from installer.src.flow.base.rate_limiter import HostRateLimiters        # ホスト単位のレート制御
+from installer.src.flow.base.auction_store import AuctionStore           # 抽出済み結果の保存先
+from installer.src.flow.base.page_archive import PageArchive             # 取得ページの保存・オフライン再生
+from installer.src.utils.text_utils import AuctionIdExtractor            # URLからオークションIDを抽出
 
 # ロガーのセットアップ（このモジュール用のロガー。上位でlevelなどの設定が必要）
 logger = logging.getLogger(__name__)
@@ -18,18 +26,48 @@ class DetailPageFlow:
     - Selenium WebDriverと各種抽出ユーティリティを内部に保持
     - 商品タイトル、価格、画像、カラット数、1ct単価、終了日などを一括で取得可能
     - スプレッドシート連携など、後段処理のための前処理にも適合
+    - HttpFetcher/HtmlParserを渡すとHTTP取得を優先し、必須項目が欠けた場合だけSeleniumで補完する
+    - AuctionStoreを渡すと抽出結果をオークションIDで保存し、次回以降はページを読まずに保存済みの結果を返す
     """
 
     # ------------------------------------------------------------------------------
     # 関数定義
-    def __init__(self, driver, selenium_util):
+    def __init__(
+        self,
+        driver=None,
+        selenium_util=None,
+        fetcher: Optional[HttpFetcher] = None,
+        parser: Optional[HtmlParser] = None,
+        driver_provider: Optional[Callable[[], Any]] = None,
+        collect_metrics: bool = False,
+        rate_limiters: Optional[HostRateLimiters] = None,
+        store: Optional[AuctionStore] = None,
+        force_refresh: bool = False,
+        archive: Optional[PageArchive] = None
+    ):
         """
         コンストラクタ
         :param driver: Selenium WebDriver インスタンス（ページ遷移等の実体）
         :param selenium_util: Seleniumのヘルパークラス（ページ要素取得等のラッパー）
+        :param fetcher: HTTP取得クライアント（指定時はHTTP取得を優先）
+        :param parser: HTML解析クラス（fetcher指定時に使用、省略時は新規生成）
+        :param driver_provider: driver未指定時、Seleniumが必要になった時点でドライバを返す関数
+        :param collect_metrics: Seleniumでのページ読込ごとに転送量・読込時間を計測するか
+        :param rate_limiters: Selenium遷移に使うホスト単位のレート制御（HTTP取得側と共有する）
+        :param store: 抽出結果の保存先（指定時は保存済みのオークションをページを読まずに返す）
+        :param force_refresh: Trueなら保存済みでもページから抽出し直して上書きする
+        :param archive: Seleniumで表示したページの保存先（再生モードならアーカイブから表示）
         """
         self.driver = driver  # 実際のページ操作を担うWebDriver
         self.selenium_util = selenium_util  # 各種取得メソッドを持つユーティリティ
+        self.fetcher = fetcher  # HTTP取得クライアント
+        self.parser = parser or (HtmlParser() if fetcher else None)  # HTML解析クラス
+        self.driver_provider = driver_provider  # フォールバック用ドライバの遅延取得関数
+        self.collect_metrics = collect_metrics  # ページ計測の有無
+        self.rate_limiters = rate_limiters  # ホスト単位のレート制御
+        self.store = store  # 抽出結果の保存先
+        self.force_refresh = force_refresh  # 保存済みを無視して再抽出するか
+        self.archive = archive  # 取得ページの保存・再生
         self.price_calculator = PriceCalculator()  # 1カラット単価計算インスタンス
         self.num_extractor = NumExtractor()        # カラット数抽出インスタンス
         self.date_converter = DateConverter()      # 日付変換インスタンス
@@ -42,23 +80,28 @@ class DetailPageFlow:
         :param url: 詳細ページのURL（例: "https://auctions.yahoo.co.jp/..."）
         :return: 商品データ辞書（date, title, price, ct, 1ct_price, image）
         """
+        # 保存済みのオークションならページを読まずに返す（終了済みなので内容は変わらない）
+        auction_id = AuctionIdExtractor.extract(url) if self.store else None
+        if auction_id and not self.force_refresh:
+            stored = self.store.get(auction_id)
+            if stored is not None:
+                logger.debug(f"保存済みの抽出結果を使用: {auction_id}")
+                return stored
+
         logger.info(f"詳細ページにアクセス: {url}")  # 開始ログ
 
         try:
-            # 詳細ページへ移動（driver.getでページ遷移）
-            self.driver.get(url)
-
-            # 商品タイトルを取得（h1などの要素をラッパー経由で抽出）
-            title = self.selenium_util.get_title()
-            logger.debug(f"件名取得: {title}")
-
-            # 商品価格を取得（価格要素からint型で取得）
-            price = self.selenium_util.get_price()
-            logger.debug(f"価格取得: {price}")
-
-            # 商品画像URLを取得（1枚目・最大解像度優先などの工夫をselenium_util側で実装）
-            image_url = self.selenium_util.get_image_url()
-            logger.debug(f"画像URL取得: {image_url}")
+            # HTTP取得を優先し、取れなかった必須項目だけSeleniumで補完
+            fields = self._fetch_fields_http(url) if self.fetcher else {}
+            missing = HtmlParser.missing_fields(fields)
+            if missing:
+                if self.fetcher:
+                    logger.info(f"HTTP取得で不足した項目をSeleniumで補完: {missing}")
+                fields.update(self._fetch_fields_selenium(url, missing))
+
+            title = fields["title"]
+            price = fields["price"]
+            image_url = fields["image_url"]
 
             # 商品タイトルからカラット数を抽出（正規表現ベースでタイトルから数値を抜き出し）
             ct = self.num_extractor.extract_ct_value(title)
@@ -69,8 +112,7 @@ class DetailPageFlow:
             logger.debug(f"1カラット単価計算: {price_per_ct}")
 
             # 終了日（落札日）取得（終了日時の要素テキスト→date型に変換）
-            end_date_str = self.selenium_util.get_detail_end_date()
-            date = self.date_converter.convert(end_date_str)
+            date = self.date_converter.convert(fields["end_date"])
             logger.debug(f"終了日取得: {date}")
 
             # スプレッドシート用の画像埋め込み用IMAGE関数（セル内で画像を表示するGoogle Sheets標準式）
@@ -87,9 +129,75 @@ class DetailPageFlow:
             }
 
             logger.info(f"抽出結果: {result}")  # 成功ログ
+            if auction_id:
+                self.store.put(auction_id, url, result)
             return result
 
         except Exception as e:
             # 例外発生時は詳細ログ（exc_infoでtracebackも出力）
             logger.error(f"詳細ページデータ抽出中にエラー: {e}", exc_info=True)
-            raise  # 例外をそのまま呼び出し元に伝播
\ No newline at end of file
+            raise  # 例外をそのまま呼び出し元に伝播
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _fetch_fields_http(self, url: str) -> Dict[str, Any]:
+        """
+        HTTPでHTMLを取得しlxmlで各項目を解析する（失敗時は空dictを返しSeleniumに任せる）
+        :return: {"title", "price", "image_url", "end_date"}（取れなかった項目はNone）
+        """
+        try:
+            html = self.fetcher.fetch(url)
+            return self.parser.parse_detail_page(html, base_url=url)
+        except Exception as e:
+            logger.warning(f"HTTP取得・解析に失敗したためSeleniumで取得します: {url} | {e}")
+            return {}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _ensure_driver(self) -> None:
+        """
+        Seleniumが必要になった時点でドライバを用意する（driver_providerから遅延取得）
+        """
+        if self.driver is None:
+            if self.driver_provider is None:
+                raise RuntimeError("Seleniumでの取得が必要ですがドライバが指定されていません")
+            self.driver = self.driver_provider()
+        if self.selenium_util is None:
+            self.selenium_util = Selenium(
+                self.driver,
+                collect_metrics=self.collect_metrics,
+                rate_limiters=self.rate_limiters,
+                archive=self.archive
+            )
+        elif self.selenium_util.chrome is not self.driver:
+            # 借り直したドライバへ切り替える（ページ待機・読込の統計はこのフローの間引き継ぐ）
+            self.selenium_util.use_driver(self.driver)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def detach_driver(self) -> None:
+        """
+        保持中のドライバを手放す（プールへ返却した後、次回必要時に再取得させる）
+        Seleniumユーティリティは残し、次のドライバでもページ待機・読込の統計を積み上げる
+        """
+        self.driver = None
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _fetch_fields_selenium(self, url: str, names) -> Dict[str, Any]:
+        """
+        ブラウザで詳細ページを開き、1回のスナップショット取得で全項目を取り出して指定項目だけ返す
+        """
+        self._ensure_driver()
+        # 詳細ページへ移動（Selenium.get経由で遷移を記録し、ロード待ちを遷移ごとに1回へ）
+        self.selenium_util.get(url)
+
+        # タイトル・価格・画像URL・終了日時を1回のスクリプト実行でまとめて取得
+        snapshot = self.selenium_util.get_detail_fields()
+        fields = {name: snapshot.get(name) for name in names}
+        missing = HtmlParser.missing_fields(snapshot)
+        missing = [name for name in missing if name in fields]
+        if missing:
+            raise ValueError(f"詳細ページから取得できない項目があります: {missing}")
+        logger.debug(f"Seleniumで取得: {fields}")
+        return fields
\ No newline at end of file
@@ -0,0 +1,194 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import time                                              # スループット計測用
+import queue                                             # ワーカー間で共有する処理待ちURLキュー
+import threading                                         # ワーカースレッド
+import logging                                           # ログ出力用
+from typing import Any, Callable, Dict, List, Optional, Tuple  # 型ヒント用
+from selenium.common.exceptions import WebDriverException  # ドライバ異常の判定用
+
+from installer.src.flow.base.driver_pool import DriverPool          # ドライバの貸出元
+from installer.src.flow.base.http_fetcher import HttpFetcher       # HTTP優先取得用クライアント
+from installer.src.flow.base.rate_limiter import HostRateLimiters    # ホスト単位のレート制御（全ワーカーで共有）
+from installer.src.flow.base.auction_store import AuctionStore       # 抽出済み結果の保存先（全ワーカーで共有）
+from installer.src.flow.base.page_archive import PageArchive         # 取得ページの保存・オフライン再生（全ワーカーで共有）
+from installer.src.flow.detail_page_flow import DetailPageFlow      # 1ページ分の抽出処理
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class DetailParallelFlow:
+    """
+    複数の詳細ページURLを、ワーカー数分のドライバで並行して抽出するフロークラス
+
+    - 各ワーカーはDetailPageFlowを1つだけ作って使い回し、Seleniumが必要になった時点で
+      DriverPoolからドライバを借りる（HTTP取得で完結する間はドライバを借りない）
+    - ドライバは1件ごとに返却する（プールの処理ページ数によるリサイクルを効かせ、一覧取得とも取り合えるように）
+    - 結果は URL → 抽出結果 の辞書で、入力URLの順番どおりに返却する（失敗したURLは結果から除外し、failuresに記録）
+      run(collect=False) なら結果を保持せず、on_result / on_failure へ1件ずつ渡すだけにする
+    - 1URLの失敗は他のURLに影響しない。ドライバ異常時はそのドライバだけリサイクルして続行
+    - 処理件数・経過秒・スループット（pages/sec）をstatsに保持しログ出力する
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        driver_pool: DriverPool,
+        workers: int = 2,
+        fetcher: Optional[HttpFetcher] = None,
+        collect_metrics: bool = False,
+        rate_limiters: Optional[HostRateLimiters] = None,
+        store: Optional[AuctionStore] = None,
+        force_refresh: bool = False,
+        archive: Optional[PageArchive] = None,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        on_failure: Optional[Callable[[str, str], None]] = None
+    ):
+        """
+        コンストラクタ
+        :param driver_pool: ドライバ貸出元のプール
+        :param workers: 同時に動かすワーカー数（プールのサイズ以下を推奨）
+        :param fetcher: HTTP優先取得用クライアント（Noneなら常にSeleniumで取得）
+        :param collect_metrics: Seleniumでのページ読込ごとに転送量・読込時間を計測するか
+        :param rate_limiters: 全ワーカーで共有するホスト単位のレート制御
+        :param store: 抽出結果の保存先（保存済みのオークションはページを読まない）
+        :param force_refresh: Trueなら保存済みでも抽出し直して上書きする
+        :param archive: Seleniumで表示したページの保存先（再生モードならアーカイブから表示）
+        :param on_result: 1件抽出するたびに (URL, 抽出結果) で呼ぶ関数（途中経過の記録用、ワーカースレッドから呼ばれる）
+        :param on_failure: 抽出に失敗するたびに (URL, エラー内容) で呼ぶ関数（ワーカースレッドから呼ばれる）
+        """
+        self.driver_pool = driver_pool
+        self.workers = max(1, workers)
+        self.fetcher = fetcher
+        self.collect_metrics = collect_metrics
+        self.rate_limiters = rate_limiters
+        self.store = store
+        self.force_refresh = force_refresh
+        self.archive = archive
+        self.on_result = on_result
+        self.on_failure = on_failure
+        self.failures: Dict[str, str] = {}  # 失敗URL → エラー内容
+        self.stats: Dict[str, Any] = {}     # 直近runの統計
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _worker(
+        self,
+        tasks: "queue.Queue[Tuple[int, str]]",
+        results: Optional[List[Optional[Dict[str, Any]]]],
+        lock: threading.Lock
+    ) -> None:
+        """
+        キューからURLを取り出して抽出し、結果を入力順のスロットへ格納するワーカー本体（resultsがNoneなら格納しない）
+        """
+        leased = []  # このワーカーが処理中の1件のために借りているドライバ（0〜1台）
+
+        def provide_driver():
+            # Seleniumへのフォールバックが必要になった時点でプールから借りる
+            driver = self.driver_pool.acquire()
+            leased.append(driver)
+            return driver
+
+        detail_flow = DetailPageFlow(
+            fetcher=self.fetcher,
+            driver_provider=provide_driver,
+            collect_metrics=self.collect_metrics,
+            rate_limiters=self.rate_limiters,
+            store=self.store,
+            force_refresh=self.force_refresh,
+            archive=self.archive
+        )
+        try:
+            while True:
+                try:
+                    pos, url = tasks.get_nowait()
+                except queue.Empty:
+                    break
+
+                try:
+                    record = detail_flow.extract_detail(url)
+                    if results is not None:
+                        results[pos] = record
+                    if leased:
+                        self.driver_pool.record_page(leased[0])
+                except Exception as e:
+                    with lock:
+                        self.failures[url] = str(e)
+                    logger.warning(f"詳細抽出失敗 {url}: {e}")
+                    if isinstance(e, WebDriverException) and leased:
+                        # ドライバ自体の異常なので返却（リサイクル）し、次に必要になった時点で借り直す
+                        self.driver_pool.release(leased.pop(), error=True)
+                        detail_flow.detach_driver()
+                    if self.on_failure:
+                        try:
+                            self.on_failure(url, str(e))
+                        except Exception as callback_error:
+                            logger.warning(f"抽出失敗の通知に失敗 {url}: {callback_error}")
+                    continue
+                finally:
+                    if leased:
+                        # 1件ごとに返却する（処理ページ数が上限に達したドライバはプール側でリサイクルされる）
+                        self.driver_pool.release(leased.pop())
+                        detail_flow.detach_driver()
+
+                if self.on_result:
+                    try:
+                        self.on_result(url, record)
+                    except Exception as e:
+                        # 途中経過の記録に失敗しても抽出結果は有効（再開時に取り直すだけ）
+                        logger.warning(f"抽出結果の記録に失敗 {url}: {e}")
+        finally:
+            if detail_flow.selenium_util is not None:
+                detail_flow.selenium_util.log_stats()
+            for driver in leased:
+                self.driver_pool.release(driver)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def run(self, urls: List[str], collect: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        URLリストを並行抽出し、成功した結果を入力順で返す
+        :param urls: 詳細ページURLのリスト
+        :param collect: Falseなら結果を保持せず空の辞書を返す（結果はon_resultで受け取る。件数はstatsに残す）
+        :return: URL → 抽出結果 の辞書（入力順、失敗分は除外）
+        """
+        self.failures = {}
+        if not urls:
+            self.stats = {"pages": 0, "failed": 0, "seconds": 0.0, "pages_per_sec": 0.0}
+            return {}
+
+        tasks: "queue.Queue[Tuple[int, str]]" = queue.Queue()
+        for pos, url in enumerate(urls):
+            tasks.put((pos, url))
+        results: Optional[List[Optional[Dict[str, Any]]]] = [None] * len(urls) if collect else None
+        lock = threading.Lock()
+
+        worker_count = min(self.workers, len(urls))
+        started = time.monotonic()
+        threads = [
+            threading.Thread(target=self._worker, args=(tasks, results, lock), name=f"detail-worker-{i+1}")
+            for i in range(worker_count)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - started
+
+        details = {url: result for url, result in zip(urls, results) if result is not None} if collect else {}
+        succeeded = len(urls) - len(self.failures)
+        self.stats = {
+            "pages": len(urls),
+            "failed": len(self.failures),
+            "seconds": elapsed,
+            "pages_per_sec": len(urls) / elapsed if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"詳細ページ並行抽出完了: {succeeded}/{len(urls)}件成功 | ワーカー={worker_count} | "
+            f"{elapsed:.1f}秒 | {self.stats['pages_per_sec']:.2f} pages/sec"
+        )
+        return details
+# **********************************************************************************
@@ -1,18 +1,36 @@
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
 # import
 import logging
-from typing import List, Dict, Any
-import pandas as pd
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
 
 from installer.src.flow.base.chrome import Chrome
+from installer.src.flow.base.driver_pool import DriverPool
 from installer.src.flow.base.spreadsheet_read import SpreadsheetReader
 from installer.src.flow.base.url_builder import UrlBuilder
-from installer.src.utils.text_utils import NumExtractor
+from installer.src.flow.base.paginator import Paginator
+from installer.src.utils.text_utils import AuctionIdExtractor, NumExtractor
 from installer.src.flow.base.utils import DateConverter
 from installer.src.flow.base.number_calculator import PriceCalculator
 from installer.src.flow.base.selenium_manager import Selenium
-from installer.src.flow.detail_page_flow import DetailPageFlow
+from installer.src.flow.base.http_fetcher import HttpFetcher
+from installer.src.flow.base.rate_limiter import HostRateLimiters
+from installer.src.flow.base.auction_store import AuctionStore
+from installer.src.flow.base.high_water_mark import HighWaterMarkStore
+from installer.src.flow.base.page_archive import PageArchive
+from installer.src.flow.base.checkpoint_store import CheckpointStore
+from installer.src.flow.base.html_parser import HtmlParser
+from installer.src.flow.base.field_parser import ListFieldParser
+from installer.src.flow.detail_parallel_flow import DetailParallelFlow
+from installer.src.flow.async_pipeline_flow import AsyncPipelineFlow
+from installer.src.flow.streaming_write_flow import StreamingWriteFlow
 from installer.src.flow.base.spreadsheet_write import SpreadsheetWriter
+from installer.src.flow.base.streaming_sink import StreamingSink
+from installer.src.flow.base.sheets_api import SheetsApiGate
+from installer.src.flow.base.worksheet_backend import LocalSheetsBackend
+from installer.src.flow.base.parquet_sink import ParquetSink
+from installer.src.flow.base.search_condition import SearchCondition
+from installer.src.flow.base.search_condition_cache import SearchConditionCache
 from installer.src.flow.write_gss_flow import WriteGssFlow
 from flow.base.image_downloader import ImageDownloader
 
@@ -30,6 +48,60 @@ class Config:
     SPREADSHEET_ID = "1nRJh0BqQazHe8qgT2YTZbMaZ9osPX835CbM3KkUjkcE"
     SEARCH_COND_SHEET = "Master"
     DATA_OUTPUT_SHEET = "1"
+    # Chromeドライバプールの設定（同時保持数、リサイクルまでの処理ページ数）
+    DRIVER_POOL_SIZE = 2
+    DRIVER_MAX_PAGES = 200
+    # 軽量モード（画像・フォント・広告計測のブロック、eager読み込み）でChromeを起動するか
+    LEAN_CHROME = True
+    # Seleniumでのページ読込ごとに転送バイト数・読込時間を計測してログ出力するか（計測用に1往復増える）
+    REPORT_PAGE_METRICS = False
+    # 詳細ページ並行抽出のワーカー数（DRIVER_POOL_SIZE以下を推奨）
+    DETAIL_WORKERS = 2
+    # HTTP(lxml)での取得を優先し、必須項目が欠けた場合だけSeleniumで取得する
+    USE_HTTP_ENGINE = True
+    # 一覧ページの1ページ件数（サイト上限は100）と同時取得ページ数
+    LIST_PAGE_SIZE = 100
+    LIST_PAGE_CONCURRENCY = 2
+    # 終了日より新しいページを二分探索で読み飛ばし、対象期間の先頭ページから巡回するか
+    LIST_SEEK = True
+    # ホスト単位のレート制御（リクエスト/秒）。正常応答ごとにINCREASEずつ加速し、エラー・ブロック検知でDECREASE倍に減速
+    RATE_INITIAL = 1.0
+    RATE_MIN = 0.2
+    RATE_MAX = 5.0
+    RATE_INCREASE = 0.1
+    RATE_DECREASE = 0.5
+    # 抽出済み詳細ページの保存先（Noneで無効）。FORCE_REFRESH=Trueなら保存済みも再抽出して上書き
+    AUCTION_STORE_PATH = "installer/data/auction_store.sqlite3"
+    AUCTION_STORE_FORCE_REFRESH = False
+    # 検索条件ごとの処理済み位置の保存先（Noneで無効＝毎回対象期間を全件巡回）
+    HIGH_WATER_MARK_PATH = "installer/data/crawl_state.sqlite3"
+    # 取得した一覧・詳細ページHTMLのzstd圧縮アーカイブ（Noneで無効）。REPLAY=Trueならネットワークの代わりにアーカイブから読む
+    ARCHIVE_DIR = None
+    ARCHIVE_REPLAY = False
+    # 途中経過（一覧巡回結果・抽出済みレコード・書き込み済み行数）の保存先。RESUME=Trueなら前回の続きから再開（main.pyの--resume）
+    CHECKPOINT_PATH = "installer/data/crawl_state.sqlite3"
+    RESUME = False
+    CHECKPOINT_RESTORE_CHUNK = 500  # 途中経過から抽出済みレコードを一度に復元する件数
+    # 検索条件を振り分けるワーカープロセス数（1なら従来どおり単一プロセス。各プロセスが自前のChrome・Sheetsクライアントを持つ）
+    PARALLEL_WORKERS = 1
+    # 一覧巡回・詳細抽出・書き込みを有界キューでつないで並行実行するか（Falseなら段階ごとに順番に実行）
+    PIPELINE_MODE = False
+    PIPELINE_DETAIL_QUEUE = 200   # 詳細キューの上限件数
+    PIPELINE_WRITE_QUEUE = 4      # 書き込み待ちの条件数の上限
+    # シートへの書き込みは抽出の途中でもマイクロバッチで順次行う（行数か経過秒数のどちらかに達したら書く）
+    WRITE_BATCH_ROWS = 100
+    WRITE_FLUSH_SECONDS = 5.0
+    # Sheets APIの1分あたり呼び出し予算（クォータ既定値: 1ユーザーあたり60回/分）と、429・5xx時の再試行回数
+    SHEETS_REQUESTS_PER_MINUTE = 60
+    SHEETS_MAX_RETRIES = 5
+    # 指定するとGoogle Sheetsの代わりにこのSQLiteファイルへ読み書きする（オフラインでの動作確認用。Noneなら本番）
+    LOCAL_SHEETS_PATH = None
+    LOCAL_SHEETS_LATENCY = 0.0  # ローカルシートのAPI呼び出し1回あたりの擬似遅延（秒）
+    # 指定するとシートへの書き込みと並行して、抽出結果を終了月・検索条件で分けたParquetへ追記する（Noneなら出力しない）
+    PARQUET_DIR = None
+    PARQUET_COMPACT = True  # 終了時に小さなParquetファイルをパーティションごとにまとめる（バッチごとに1ファイル書くため）
+    # 変換済みの検索条件をシート内容の指紋と一緒に保存し、内容が同じなら次回は日付変換をやり直さない（Noneで毎回変換する）
+    SEARCH_CONDITION_CACHE_PATH = "installer/data/crawl_state.sqlite3"
 
 # ------------------------------------------------------------------------------
 # class定義
@@ -38,6 +110,60 @@ class MainFlow:
         # コンストラクタ：設定情報を保持しロガーを初期化
         self.config = config
         self.logger = logger
+        # 全検索条件で共有するウォーム済みChromeドライバプール
+        self.driver_pool = DriverPool(
+            size=config.DRIVER_POOL_SIZE,
+            max_pages=config.DRIVER_MAX_PAGES,
+            driver_factory=partial(Chrome.get_driver, lean=config.LEAN_CHROME)
+        )
+        # 途中経過の記録（中断後に--resumeで再開できるように）。再開でなければ前回の経過を消して始める
+        self.checkpoint = CheckpointStore(config.CHECKPOINT_PATH) if config.CHECKPOINT_PATH else None
+        if self.checkpoint and not config.RESUME:
+            self.checkpoint.reset()
+        # 取得ページの保存・オフライン再生（セレクタ破損時の調査・パーサの再実行用）
+        self.archive = PageArchive(config.ARCHIVE_DIR, replay=config.ARCHIVE_REPLAY) if config.ARCHIVE_DIR else None
+        # 一覧・詳細・HTTP・Seleniumの全取得経路で共有するホスト単位のレート制御
+        self.rate_limiters = HostRateLimiters(
+            rate=config.RATE_INITIAL,
+            min_rate=config.RATE_MIN,
+            max_rate=config.RATE_MAX,
+            increase=config.RATE_INCREASE,
+            decrease=config.RATE_DECREASE
+        )
+        # HTTP優先取得用のkeep-aliveセッションとHTMLパーサ（無効時はNone）
+        self.http_fetcher = HttpFetcher(
+            pool_size=max(config.DETAIL_WORKERS, 1) * 2,
+            rate_limiters=self.rate_limiters,
+            archive=self.archive
+        ) if config.USE_HTTP_ENGINE else None
+        self.html_parser = HtmlParser()
+        # 一覧ページURLの組み立て用
+        self.url_builder = UrlBuilder()
+        # 抽出済み詳細ページの保存先（次回以降の実行で同じオークションのページ読込を省く）
+        self.auction_store = AuctionStore(config.AUCTION_STORE_PATH) if config.AUCTION_STORE_PATH else None
+        # 検索条件ごとの処理済み位置（次回は新しく終了したオークションだけ巡回する）
+        self.high_water_marks = HighWaterMarkStore(config.HIGH_WATER_MARK_PATH) if config.HIGH_WATER_MARK_PATH else None
+        # Sheets APIの呼び出し予算・再試行（プロセス内の全Sheets呼び出しで共有）
+        SheetsApiGate.configure(
+            requests_per_minute=config.SHEETS_REQUESTS_PER_MINUTE,
+            max_retries=config.SHEETS_MAX_RETRIES
+        )
+        if config.LOCAL_SHEETS_PATH:
+            # 検索条件の読み込み・結果の書き込みをローカルのSQLiteへ差し替える
+            SpreadsheetReader.use_backend(LocalSheetsBackend(config.LOCAL_SHEETS_PATH, latency=config.LOCAL_SHEETS_LATENCY))
+        # 分析用のParquet出力（シートのセル数上限を気にせず履歴を蓄積する）
+        self.parquet_sink = ParquetSink(config.PARQUET_DIR) if config.PARQUET_DIR else None
+        # 出力先シートへの書き込み（シートごとに values.append で追記し、API呼び出し回数を集計する）
+        self.sheet_writer = SpreadsheetWriter()
+        # 直近のurl_and_selenium_flowの集計（並列実行時は各プロセスの値を合算する）
+        self.summary = {
+            "conditions": 0,       # 一覧を巡回した条件数
+            "detail_urls": 0,      # 条件ごとの詳細URLの延べ件数
+            "unique_urls": 0,      # 重複除外後の詳細URL件数
+            "extracted": 0,        # 抽出できたレコード件数
+            "rows_written": 0,     # シートへ書き込んだ行数
+            "write_failures": 0,   # 書き込みに失敗した条件数
+        }
 
     # ------------------------------------------------------------------------------
     # カラット数抽出テスト関数
@@ -51,20 +177,27 @@ class MainFlow:
 
     # ------------------------------------------------------------------------------
     # スプレッドシートから検索条件を取得する関数
-    def load_search_conditions(self) -> List[Dict[str, Any]]:
-        # Googleスプレッドシートの指定シートから検索条件を辞書リスト形式で取得し、取得件数をログに出す
+    def load_search_conditions(self) -> List[SearchCondition]:
+        # Googleスプレッドシートの指定シートから検索条件を日付変換済みの形で取得し、取得件数をログに出す
+        # （シートの内容が前回と同じなら、保存済みの変換済み検索条件を使う）
+        cache = None
         try:
             reader = SpreadsheetReader(
                 spreadsheet_id=self.config.SPREADSHEET_ID,
                 worksheet_name=self.config.SEARCH_COND_SHEET
             )
             self.logger.info(f"スプレッドシート({self.config.SPREADSHEET_ID})から検索条件取得")
-            conditions = reader.get_search_conditions()
+            if self.config.SEARCH_CONDITION_CACHE_PATH:
+                cache = SearchConditionCache(self.config.SEARCH_CONDITION_CACHE_PATH)
+            conditions = reader.load_conditions(cache)
             self.logger.info(f"取得件数: {len(conditions)}件")
             return conditions
         except Exception as e:
             self.logger.error(f"スプレッドシート読込中エラー: {e}")
             return []
+        finally:
+            if cache:
+                cache.close()
 
     # ------------------------------------------------------------------------------
     # テストデータを指定ワークシートへ一括書き込みする関数
@@ -103,137 +236,421 @@ class MainFlow:
         return " ".join([str(row.get(f"search_{i}", "")) for i in range(1, 6)]).strip()
 
     # ------------------------------------------------------------------------------
-    # URL生成とSeleniumによるページ情報取得フロー
-    def url_and_selenium_flow(self, conditions: List[Dict[str, Any]]) -> None:
-        # 検索条件が空なら処理中断
-        if not conditions:
-            self.logger.warning("条件が空なのでURL生成処理スキップ")
-            return
-
-        url_builder = UrlBuilder()
-        df = pd.DataFrame(conditions)
-
-        # 取得した条件を1行ずつ処理
-        for idx, row in df.iterrows():
-            # 開始日・終了日をDateConverterで変換（日付型に）
-            try:
-                start_date = DateConverter.convert(row.get("start_date"))
-                end_date = DateConverter.convert(row.get("end_date"))
-            except Exception as e:
-                self.logger.error(f"{idx+1}行目: 開始・終了日変換失敗: {e}")
-                continue
-
-            # 検索ワードを連結してキーワード生成
-            keyword = self.extract_keyword(row)
-            if not keyword:
-                self.logger.warning(f"{idx+1}行目: キーワードなし。スキップ")
-                continue
-
-            # 検索用URL生成
-            search_url = url_builder.build_url(keyword)
-            self.logger.info(f"{idx+1}行目: キーワード={keyword} | URL={search_url}")
-
-            # Chromeドライバ起動
-            driver = Chrome.get_driver()
-            selenium_util = Selenium(driver)
-            driver.get(search_url)
-
-            detail_urls = []  # 対象期間内の詳細URLリスト
-
-            while True:
-                # 商品一覧から終了日時取得（日付変換し対象期間内判定）
-                try:
-                    end_times = selenium_util.get_auction_end_dates()
-                except Exception as e:
-                    self.logger.warning(f"{idx+1}行目: 終了日時取得失敗: {e}")
-                    break
-
-                # 対象商品の詳細URLを商品一覧から取得
-                try:
-                    urls = selenium_util.get_auction_urls()
-                except Exception as e:
-                    self.logger.warning(f"{idx+1}行目: 商品URL取得失敗: {e}")
-                    break
+    # 1検索条件分の一覧ページを巡回し、対象期間内の詳細URLを集める関数
+    def collect_detail_urls(self, idx, keyword: str, start_date, end_date, mark=None, on_page_urls=None) -> Dict[str, Any]:
+        # 開始位置(b)からページURLを直接組み立てて巡回し、対象期間内の詳細URLを集める
+        # mark（前回までの処理済み位置）を渡すと、そこに到達した時点で巡回を打ち切る
+        # on_page_urls を渡すと、一覧1ページごとにそのページで見つかった期間内URLのリストを渡して呼ぶ（後段を並行して進めるため）
+        # 戻り値: {"urls": 詳細URLリスト, "complete": 最後まで巡回できたか, "newest": 期間内で最新の商品カード|None,
+        #          "pages": 取得した一覧ページ数}
+        paginator = Paginator(
+            self.url_builder,
+            partial(self.load_list_page, idx),
+            per_page=self.config.LIST_PAGE_SIZE,
+            concurrency=self.config.LIST_PAGE_CONCURRENCY
+        )
 
-                # 取得した終了日時ごとに期間判定し、期間内の詳細URLを収集
-                period_matched = False
-                for end_time, url in zip(end_times, urls):
+        detail_urls = []  # 対象期間内の詳細URLリスト
+        newest = None     # 期間内で最新の商品カード（次回の処理済み位置の候補）
+        complete = False  # 開始日より古い商品・処理済み位置・最終ページのいずれかまで巡回できたか
+        try:
+            # 終了日より新しいページを読み飛ばし、対象期間の先頭ページへ直接移動
+            start_page = 0
+            if self.config.LIST_SEEK:
+                start_page = paginator.seek_first_page(
+                    keyword,
+                    lambda items: self.is_page_newer_than(items, end_date)
+                )
+
+            for page_index, items in paginator.iter_pages(keyword, start_page=start_page):
+                # 商品カードごとに終了日時で期間判定し、期間内の詳細URLを収集
+                reached_older = False
+                found = len(detail_urls)
+                for item in items:
                     try:
-                        end_date_only = DateConverter.convert(end_time)
+                        end_time = DateConverter.convert_datetime(item["end_time"])
                     except Exception as e:
                         self.logger.warning(f"{idx+1}行目: 日付変換失敗: {e}")
                         continue
+                    end_date_only = end_time.date()
 
                     if end_date_only < start_date:
-                        # 開始日より前なら処理終了（breakループ）
-                        period_matched = False
+                        # 開始日より前なら以降のページも全て対象外（終了日時の新しい順に並んでいるため）
+                        reached_older = True
                         break
                     elif end_date_only > end_date:
                         # 終了日より後ならスキップ（continue）
                         continue
+                    elif mark and (item.get("auction_id") == mark["auction_id"] or end_time < mark["end_time"]):
+                        # 前回までに処理済みの位置へ到達したので、以降は全て処理済み
+                        self.logger.info(f"{idx+1}行目: 処理済み位置({mark['end_time']})に到達したため巡回終了")
+                        reached_older = True
+                        break
                     else:
                         # 期間内なのでURLを追加
-                        detail_urls.append(url)
-                        period_matched = True
+                        detail_urls.append(item["url"])
+                        if newest is None:
+                            newest = {"end_time": end_time, "auction_id": item.get("auction_id")}
 
-                if not period_matched:
-                    # 期間内の商品が無ければ終了
+                if on_page_urls and len(detail_urls) > found:
+                    on_page_urls(detail_urls[found:])
+                if reached_older:
                     break
+            complete = True
+        except Exception as e:
+            self.logger.warning(f"{idx+1}行目: 一覧ページ取得失敗: {e}")
+
+        self.logger.info(f"{idx+1}行目: 一覧ページ{paginator.pages_fetched}ページ取得 | 対象{len(detail_urls)}件")
+        if not detail_urls:
+            self.logger.info(f"{idx+1}行目: 対象期間内の商品なし")
+        return {"urls": detail_urls, "complete": complete, "newest": newest, "pages": paginator.pages_fetched}
+
+    # ------------------------------------------------------------------------------
+    # 処理済み位置を更新する関数
+    def update_high_water_mark(self, keyword: str, ws_name: str, start_date, crawl: Dict[str, Any], mark=None) -> None:
+        # 一覧を最後まで巡回し、全件の抽出・書き込みが済んだ場合だけ呼ぶ
+        # 新しい商品が無ければ前回の位置のまま。前回の位置が有効なら処理済み範囲の開始日を引き継ぐ
+        if not self.high_water_marks or not crawl["complete"] or crawl["newest"] is None:
+            return
+        covered_from = min(start_date, mark["covered_from"]) if mark else start_date
+        self.high_water_marks.save(
+            keyword,
+            ws_name,
+            crawl["newest"]["end_time"],
+            crawl["newest"]["auction_id"],
+            covered_from
+        )
+
+    # ------------------------------------------------------------------------------
+    # 一覧ページの全商品が指定日より新しいか判定する関数
+    def is_page_newer_than(self, items: List[Dict[str, Any]], end_date) -> bool:
+        # ページ内で最も古い終了日が end_date より後ならTrue（日付が読めない場合は安全側のFalse）
+        dates = []
+        for item in items:
+            try:
+                dates.append(DateConverter.convert(item["end_time"]))
+            except Exception:
+                continue
+        return bool(dates) and min(dates) > end_date
 
-                # 「次へ」ボタンがあればクリックして次ページへ
+    # ------------------------------------------------------------------------------
+    # 一覧ページ1枚分の商品カードを取得する関数
+    def load_list_page(self, idx, page_url: str) -> List[Dict[str, Any]]:
+        # HTTP取得で全カードのURL・終了日時が揃えばそれを返し、揃わなければプールのドライバで一括取得する
+        # （Paginatorの先読みで複数スレッドから同時に呼ばれる）
+        if self.http_fetcher:
+            try:
+                parsed = self.html_parser.parse_list_items(self.http_fetcher.fetch(page_url), base_url=page_url)
+                items = parsed["items"]
+                if items and all(ListFieldParser.is_complete(item) for item in items):
+                    return items
+                self.logger.info(f"{idx+1}行目: HTTP取得の一覧に必須項目が無いためSeleniumで取得します")
+            except Exception as e:
+                self.logger.warning(f"{idx+1}行目: HTTP一覧取得失敗のためSeleniumで取得します: {e}")
+
+        with self.driver_pool.lease() as driver:
+            selenium_util = Selenium(
+                driver,
+                collect_metrics=self.config.REPORT_PAGE_METRICS,
+                rate_limiters=self.rate_limiters,
+                archive=self.archive
+            )
+            selenium_util.get(page_url)
+            self.driver_pool.record_page(driver)
+            # 最終ページの次など、カードが無いページは空リスト（Paginatorが巡回終了と判定）
+            return selenium_util.get_list_items(allow_empty=True)
+
+    # ------------------------------------------------------------------------------
+    # 詳細ページを並行抽出する関数
+    def extract_details(self, label, detail_urls: List[str], on_record=None, on_failure=None) -> int:
+        # ワーカープールで詳細情報を抽出し、1件ごとに on_record(URL, 抽出結果) / on_failure(URL, エラー内容) へ渡す
+        # 結果は保持しない（書き込み側が必要な間だけ持つ）。戻り値は抽出できた件数
+        def on_result(url: str, record: Dict[str, Any]) -> None:
+            if self.checkpoint:
                 try:
-                    has_next = selenium_util.click_next()
-                    if not has_next:
-                        break
+                    self.save_record_checkpoint(url, record)
                 except Exception as e:
-                    self.logger.warning(f"{idx+1}行目: 次へクリック失敗または次ページなし: {e}")
-                    break
+                    # 途中経過の記録に失敗しても抽出結果は有効（再開時に取り直すだけ）
+                    self.logger.warning(f"途中経過の記録に失敗 {url}: {e}")
+            if on_record:
+                on_record(url, record)
+
+        detail_flow = DetailParallelFlow(
+            self.driver_pool,
+            workers=self.config.DETAIL_WORKERS,
+            fetcher=self.http_fetcher,
+            collect_metrics=self.config.REPORT_PAGE_METRICS,
+            rate_limiters=self.rate_limiters,
+            store=self.auction_store,
+            force_refresh=self.config.AUCTION_STORE_FORCE_REFRESH,
+            archive=self.archive,
+            on_result=on_result,
+            on_failure=on_failure
+        )
+        detail_flow.run(detail_urls, collect=False)
+        succeeded = detail_flow.stats["pages"] - detail_flow.stats["failed"]
+        self.logger.info(
+            f"{label}: 詳細抽出 {succeeded}/{len(detail_urls)}件成功 "
+            f"({detail_flow.stats['pages_per_sec']:.2f} pages/sec)"
+        )
+        return succeeded
+
+    # ------------------------------------------------------------------------------
+    # 抽出済みレコードを1件ずつ途中経過に記録する関数
+    def save_record_checkpoint(self, url: str, record: Dict[str, Any]) -> None:
+        # 詳細抽出のワーカースレッドから1件ごとに呼ばれる（中断しても抽出済みの分は取り直さない）
+        self.checkpoint.save_record(self.dedup_key(url), url, record)
 
-            # 詳細URLリストが空なら次の行へ
-            if not detail_urls:
-                self.logger.info(f"{idx+1}行目: 対象期間内の商品なし")
-                driver.quit()
+    # ------------------------------------------------------------------------------
+    # 条件をまたいだ重複判定キーを返す関数
+    def dedup_key(self, url: str) -> str:
+        # 同じオークションはURL表記が違っても同じキーになるよう、オークションIDを優先する
+        return AuctionIdExtractor.extract(url) or url
+
+    # ------------------------------------------------------------------------------
+    # 検索条件1行分の処理計画を作る関数
+    def prepare_condition(self, idx, row) -> Optional[Dict[str, Any]]:
+        # 日付・キーワード・出力先・処理済み位置をまとめて返す（処理対象外の行はNone）
+        # row は SearchCondition（日付変換済み）。dictの行を渡された場合はここで変換する
+        # 戻り値: {"idx", "condition_key", "keyword", "ws_name", "start_date", "end_date", "mark"}
+        if not isinstance(row, SearchCondition):
+            row = SearchCondition.from_record(idx + 2, row)
+        # シャードに分けて渡された場合も元の行でログに出すよう、シート上の行番号から数え直す
+        idx = row.row_number - 2
+        if row.error:
+            self.logger.error(f"{idx+1}行目: 開始・終了日変換失敗: {row.error}")
+            return None
+        start_date = row.start_date
+        end_date = row.end_date
+
+        # 検索ワードを連結したキーワード
+        keyword = row.keyword
+        if not keyword:
+            self.logger.warning(f"{idx+1}行目: キーワードなし。スキップ")
+            return None
+        ws_name = row.ws_name if row.ws_name is not None else self.config.DATA_OUTPUT_SHEET
+
+        # 前回までの処理済み位置（検索条件＝キーワード＋出力先シートごと）
+        mark = self.high_water_marks.get(keyword, ws_name, start_date) if self.high_water_marks else None
+        return {
+            "idx": idx,
+            "condition_key": CheckpointStore.condition_key(keyword, ws_name, start_date, end_date),
+            "keyword": keyword,
+            "ws_name": ws_name,
+            "start_date": start_date,
+            "end_date": end_date,
+            "mark": mark,
+        }
+
+    # ------------------------------------------------------------------------------
+    # 検索条件1件分の一覧を巡回する関数
+    def crawl_plan(self, plan: Dict[str, Any], on_page_urls=None) -> Dict[str, Any]:
+        # 前回の実行で巡回済みならその結果を使い、一覧ページを取り直さない（collect_detail_urlsと同じ形式で返す）
+        idx = plan["idx"]
+        crawl = self.checkpoint.load_crawl(plan["condition_key"]) if self.checkpoint else None
+        if crawl is not None:
+            self.logger.info(f"{idx+1}行目: 途中経過から一覧巡回結果を復元（{len(crawl['urls'])}件）")
+            return crawl
+
+        # 検索用URL（1ページ目）をログ出力し、一覧ページを巡回して詳細URLを収集
+        keyword = plan["keyword"]
+        first_url = self.url_builder.build_page_url(keyword, 0, per_page=self.config.LIST_PAGE_SIZE)
+        self.logger.info(f"{idx+1}行目: キーワード={keyword} | URL={first_url}")
+        crawl = self.collect_detail_urls(
+            idx, keyword, plan["start_date"], plan["end_date"], mark=plan["mark"], on_page_urls=on_page_urls
+        )
+        if self.checkpoint and crawl["complete"]:
+            self.checkpoint.save_crawl(plan["condition_key"], crawl, crawl["pages"])
+        return crawl
+
+    # ------------------------------------------------------------------------------
+    # 全検索条件の一覧を巡回して実行計画を作る関数
+    def plan_conditions(self, conditions: List[SearchCondition]) -> List[Dict[str, Any]]:
+        # 条件ごとに prepare_condition の内容＋"crawl"（巡回結果）を返す（対象なしの条件も含む）
+        plans = []
+        for idx, row in enumerate(conditions):
+            plan = self.prepare_condition(idx, row)
+            if plan is None:
                 continue
+            plan["crawl"] = self.crawl_plan(plan)
+            plans.append(plan)
+        return plans
 
-            # DetailPageFlowで詳細情報を抽出しリストに格納
-            details = []
-            for detail_url in detail_urls:
+    # ------------------------------------------------------------------------------
+    # 検索条件1件分の書き込み先（ストリーミング書き込み）を開く関数
+    def open_plan_sink(self, plan: Dict[str, Any]) -> Optional[StreamingSink]:
+        # 行をマイクロバッチで順次書き込むシンクを返す（前回の実行で書き込み済みの条件ならNone）
+        idx = plan["idx"]
+        condition_key = plan["condition_key"]
+        if self.checkpoint and self.checkpoint.is_written(condition_key):
+            # 前回の実行で書き込み済み（二重に追記しない）
+            self.logger.info(f"{idx+1}行目: 前回の実行で書き込み済みのためスキップ")
+            return None
+        # 前回の実行でバッチ書き込みが済んだレコードは再開時に書かない
+        plan["written_keys"] = self.checkpoint.load_written(condition_key) if self.checkpoint else set()
+        plan["rows_added"] = 0
+        sheet: Dict[str, Any] = {}
+
+        def write_batch(items) -> None:
+            # 出力先シートは最初のバッチの書き込み時に開く（書く行が無い条件ではAPIを呼ばない）
+            if "worksheet" not in sheet:
+                reader = SpreadsheetReader(self.config.SPREADSHEET_ID, plan["ws_name"])
+                sheet["worksheet"] = reader.get_worksheet(plan["ws_name"])
+            try:
+                self.sheet_writer.append_rows([row for _, row, _ in items], sheet["worksheet"])  # ここにリストのリストを渡す
+            except Exception:
+                # シートの削除・改名に備え、次のバッチではキャッシュを使わずに開き直す
+                self.sheet_writer.discard(sheet["worksheet"])
+                SpreadsheetReader.invalidate(self.config.SPREADSHEET_ID, plan["ws_name"])
+                sheet.pop("worksheet", None)
+                raise
+
+        def on_flushed(items) -> None:
+            # Parquetへはシートに書けたバッチの行だけを同じ単位で書き出す
+            # （先に書き込み済みとして記録すると、中断・再開時にその行がParquetへ出力されないため）
+            if self.parquet_sink:
                 try:
-                    detail_flow = DetailPageFlow(driver, selenium_util)
-                    detail_data = detail_flow.extract_detail(detail_url)
-                    details.append(detail_data)
-                    self.logger.info(f"{idx+1}行目: 詳細抽出成功: {detail_url}")
+                    self.write_parquet(plan, [(key, detail) for key, _, detail in items])
                 except Exception as e:
-                    self.logger.warning(f"{idx+1}行目: 詳細抽出失敗 {detail_url}: {e}")
+                    self.logger.warning(f"{idx+1}行目: Parquet出力失敗: {len(items)}行 | {e}")
+            if self.checkpoint:
+                self.checkpoint.save_written(condition_key, [key for key, _, _ in items])
+
+        return StreamingSink(
+            write_batch,
+            batch_rows=self.config.WRITE_BATCH_ROWS,
+            flush_seconds=self.config.WRITE_FLUSH_SECONDS,
+            on_flushed=on_flushed,
+            name=f"{idx+1}行目:{plan['ws_name']}"
+        )
+
+    # ------------------------------------------------------------------------------
+    # 抽出結果1件をシンクへ渡す関数
+    def add_plan_row(self, plan: Dict[str, Any], sink: StreamingSink, key: str, detail: Dict[str, Any]) -> None:
+        plan["rows_added"] += 1
+        if key in plan["written_keys"]:
+            return
+        # 1行分のリストに変換（画像はIMAGE関数としてUSER_ENTEREDで書き込まれる）。抽出結果はParquet出力用に添える
+        sink.add((key, SpreadsheetWriter.record_row(detail), detail))
 
-            driver.quit()
+    # ------------------------------------------------------------------------------
+    # シートに書き込めた抽出結果をParquetへ書き出す関数
+    def write_parquet(self, plan: Dict[str, Any], items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for key, detail in items:
+            # 重複判定キーはオークションID（取れなかった場合はURL）
+            auction_id = AuctionIdExtractor.extract(key) if key.startswith("http") else key
+            self.parquet_sink.add(detail, auction_id, plan["keyword"], plan["ws_name"], plan["condition_key"])
+        self.parquet_sink.flush()
 
-# ここに追加↓
-            try:
-                # 書き込みたいカラムキーの順番を指定
-                keys = ["date", "title", "price", "ct", "1ct_price", "image"]
+    # ------------------------------------------------------------------------------
+    # 検索条件1件分の書き込みを完了させる関数
+    def finish_plan_sink(self, plan: Dict[str, Any], sink: StreamingSink) -> None:
+        # 残りのバッチを書き込み、全行書けた条件だけ書き込み完了・処理済み位置を記録する
+        idx = plan["idx"]
+        stats = sink.close()
+        self.summary["rows_written"] += stats["rows"]
+        if stats["failed_rows"]:
+            self.summary["write_failures"] += 1
+            self.logger.error(
+                f"{idx+1}行目: スプレッドシート書き込み失敗: {stats['failed_rows']}行"
+                f"（書き込み済み{stats['rows']}行は残し、再開時に未書き込み分だけ書きます）"
+            )
+            return
+        if plan["rows_added"] == 0:
+            return
+        self.logger.info(
+            f"{idx+1}行目: スプレッドシートに詳細情報を追記しました。件数: {stats['rows']}（{stats['batches']}バッチ）"
+        )
+        if self.checkpoint:
+            self.checkpoint.mark_written(plan["condition_key"], plan["rows_added"])
 
-                # 辞書リストをリストのリストに変換
-                list_of_lists = [[d.get(k, "") for k in keys] for d in details]
+        # 全件抽出・書き込みできた場合だけ処理済み位置を進める（失敗分を次回取り直せるように）
+        if plan["rows_added"] == len(plan["crawl"]["urls"]):
+            self.update_high_water_mark(plan["keyword"], plan["ws_name"], plan["start_date"], plan["crawl"], plan["mark"])
 
-                reader = SpreadsheetReader(self.config.SPREADSHEET_ID, row.get("ws_name", self.config.DATA_OUTPUT_SHEET))
-                worksheet = reader.get_worksheet(row.get("ws_name", self.config.DATA_OUTPUT_SHEET))
-                writer = SpreadsheetWriter(worksheet)
-                writer.append_rows(list_of_lists)  # ここにリストのリストを渡す
-                self.logger.info(f"{idx+1}行目: スプレッドシートに詳細情報を追記しました。件数: {len(details)}")
-            except Exception as e:
-                self.logger.error(f"{idx+1}行目: スプレッドシート書き込み失敗: {e}")
-# ここまで追加↑
-
-            # # 取得した詳細情報をSpreadsheetWriterでまとめて書き込み
-            # try:
-            #     reader = SpreadsheetReader(self.config.SPREADSHEET_ID, row.get("ws_name", self.config.DATA_OUTPUT_SHEET))
-            #     worksheet = reader.get_worksheet(row.get("ws_name", self.config.DATA_OUTPUT_SHEET))
-            #     writer = SpreadsheetWriter(worksheet)
-            #     writer.append_rows(details)
-            #     self.logger.info(f"{idx+1}行目: スプレッドシートに詳細情報を追記しました。件数: {len(details)}")
-            # except Exception as e:
-            #     self.logger.error(f"{idx+1}行目: スプレッドシート書き込み失敗: {e}")
+    # ------------------------------------------------------------------------------
+    # URL生成とSeleniumによるページ情報取得フロー
+    def url_and_selenium_flow(self, conditions: List[Dict[str, Any]]) -> None:
+        # 検索条件が空なら処理中断
+        if not conditions:
+            self.logger.warning("条件が空なのでURL生成処理スキップ")
+            return
+
+        # 条件ごとの起動待ちを無くすため、先にドライバを起動しておく
+        try:
+            self.driver_pool.warm_up()
+        except Exception as e:
+            self.logger.warning(f"ドライバプールの事前起動に失敗（必要時に起動します）: {e}")
+
+        # 1) 全検索条件の一覧を先に巡回し、条件ごとの詳細URLを集める（実行計画）
+        plans = self.plan_conditions(conditions)
+        if not plans:
+            return
+
+        # 2) 条件をまたいで同じオークションを1回だけ抽出する
+        unique_urls: Dict[str, str] = {}  # オークションID（取れなければURL）→ 代表URL
+        for plan in plans:
+            for url in plan["crawl"]["urls"]:
+                unique_urls.setdefault(self.dedup_key(url), url)
+        requested = sum(len(plan["crawl"]["urls"]) for plan in plans)
+        self.summary.update(conditions=len(plans), detail_urls=requested, unique_urls=len(unique_urls))
+        self.logger.info(
+            f"実行計画: {len(plans)}条件 | 詳細URL延べ{requested}件 → 重複除外後{len(unique_urls)}件"
+            f"（ページ読込{requested - len(unique_urls)}回を節約）"
+        )
+        if not unique_urls:
+            return
+
+        # 3) 抽出の前に各条件の書き込み先を開き、抽出結果が届くたびに、それを必要とする各条件へ詳細URL順で書き込む
+        #    （抽出結果は全条件が書き終えた時点で手放すため、実行全体の件数分をメモリに持たない）
+        writer = StreamingWriteFlow(self, plans)
+        writer.open()
+        try:
+            # 前回の実行で抽出済みのレコードは途中経過から少しずつ復元して渡し、残りだけ抽出する
+            keys = list(unique_urls)
+            restored = 0
+            pending = []
+            for start in range(0, len(keys), self.config.CHECKPOINT_RESTORE_CHUNK):
+                chunk = {key: unique_urls[key] for key in keys[start:start + self.config.CHECKPOINT_RESTORE_CHUNK]}
+                found = self.checkpoint.load_records(chunk) if self.checkpoint else {}
+                for key, record in found.items():
+                    writer.feed(key, record)
+                restored += len(found)
+                pending.extend(url for key, url in chunk.items() if key not in found)
+            if restored:
+                self.logger.info(f"途中経過から抽出済みレコードを復元: {restored}件")
+            extracted = 0
+            if pending:
+                extracted = self.extract_details(
+                    "全条件",
+                    pending,
+                    on_record=lambda url, record: writer.feed(self.dedup_key(url), record),
+                    on_failure=lambda url, error: writer.feed(self.dedup_key(url), None)
+                )
+            self.summary["extracted"] = restored + extracted
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------------------------
+    # 検索条件リストを処理する関数（段階実行とパイプライン実行の切り替え）
+    def process_conditions(self, conditions: List[Dict[str, Any]]) -> None:
+        # PIPELINE_MODEなら一覧・詳細・書き込みを並行実行し、そうでなければ段階ごとに実行する
+        if not self.config.PIPELINE_MODE:
+            self.url_and_selenium_flow(conditions)
+            return
+        if not conditions:
+            self.logger.warning("条件が空なのでURL生成処理スキップ")
+            return
+        try:
+            self.driver_pool.warm_up()
+        except Exception as e:
+            self.logger.warning(f"ドライバプールの事前起動に失敗（必要時に起動します）: {e}")
+        AsyncPipelineFlow(
+            self,
+            detail_queue_size=self.config.PIPELINE_DETAIL_QUEUE,
+            write_queue_size=self.config.PIPELINE_WRITE_QUEUE,
+            detail_workers=self.config.DETAIL_WORKERS
+        ).run(conditions)
 
     # ------------------------------------------------------------------------------
     # 日付変換テスト関数
@@ -268,6 +685,38 @@ class MainFlow:
             self.logger.error("ImageDownloaderテスト失敗", exc_info=True)
             print("画像ダウンロード失敗:", e)
 
+    # ------------------------------------------------------------------------------
+    # 後片付け関数
+    def close(self) -> None:
+        # ドライバプール・HTTPセッション・各種保存先を閉じ、統計をログ出力する
+        self.driver_pool.close()
+        self.driver_pool.log_stats()
+        self.rate_limiters.log_stats()
+        if self.http_fetcher:
+            self.http_fetcher.close()
+        if self.auction_store:
+            self.auction_store.log_stats()
+            self.auction_store.close()
+        if self.high_water_marks:
+            self.high_water_marks.close()
+        if self.archive:
+            self.archive.log_stats()
+            self.archive.close()
+        if self.checkpoint:
+            self.logger.info(f"途中経過: {self.checkpoint.summary()}")
+            self.checkpoint.close()
+        SpreadsheetReader.log_cache_stats()
+        self.sheet_writer.log_stats()
+        if self.parquet_sink:
+            self.parquet_sink.close()
+            if self.config.PARQUET_COMPACT:
+                try:
+                    self.parquet_sink.compact()
+                except Exception as e:
+                    self.logger.warning(f"Parquetのコンパクションに失敗（次回の終了時に再度まとめます）: {e}")
+            self.parquet_sink.log_stats()
+        SheetsApiGate.shared().log_stats()
+
     # ------------------------------------------------------------------------------
     # メイン処理実行関数
     def run(self) -> None:
@@ -291,8 +740,16 @@ class MainFlow:
         worksheet = reader.get_worksheet(self.config.DATA_OUTPUT_SHEET)
         self.write_test_data(worksheet)
 
-        # URL生成とSeleniumによるページ情報取得フローを実行
-        self.url_and_selenium_flow(conditions)
+        # URL生成とSeleniumによるページ情報取得フローを実行（終了時にドライバプールを片付けて統計出力）
+        # PARALLEL_WORKERS>1 なら出力先シート単位で条件を複数プロセスへ振り分けて実行
+        try:
+            if self.config.PARALLEL_WORKERS > 1:
+                from installer.src.flow.parallel_flow import ParallelFlow  # parallel_flowがMainFlowをimportするため循環import回避
+                ParallelFlow(self.config, workers=self.config.PARALLEL_WORKERS).run(conditions)
+            else:
+                self.process_conditions(conditions)
+        finally:
+            self.close()
 
         # 日付変換テストを実行し結果をログに出力
         self.test_date_converter("06/27 22:13")
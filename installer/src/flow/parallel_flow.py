@@ -0,0 +1,154 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import os                                                        # CPUコア数の取得
+import time                                                      # 経過時間計測用
+import logging                                                   # ログ出力用
+import multiprocessing                                           # ワーカープロセスの起動方式（spawn）
+from collections import OrderedDict                              # 出力先シートの出現順を保持
+from concurrent.futures import ProcessPoolExecutor               # ワーカープロセスのプール
+from typing import Any, Dict, List                               # 型ヒント用
+
+from installer.src.flow.main_flow import Config, MainFlow        # 各プロセスで動かすフロー本体
+from installer.src.flow.base.search_condition import SearchCondition  # シャードへ渡す検索条件（元の行番号を保持）
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def _config_values(config: Config) -> Dict[str, Any]:
+    """
+    Configの設定値（大文字の属性）を辞書にする（ワーカープロセスへ渡すため）
+    """
+    return {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def _run_shard(config_values: Dict[str, Any], conditions: List[SearchCondition]) -> Dict[str, Any]:
+    """
+    ワーカープロセスで1シャード分の検索条件を処理し、集計を返す（プロセス間で受け渡すためモジュール関数）
+    """
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO)
+    config = Config()
+    for name, value in config_values.items():
+        setattr(config, name, value)
+    flow = MainFlow(config)
+    try:
+        flow.process_conditions(conditions)
+    finally:
+        flow.close()
+    return dict(flow.summary)
+
+
+# **********************************************************************************
+# class定義
+class ParallelFlow:
+    """
+    検索条件を複数のワーカープロセスへ振り分けて処理するフロークラス
+
+    - 各プロセスが自前のChromeドライバプール・HTTPセッション・Sheetsクライアントを持つ
+    - 各プロセス内の処理は MainFlow.process_conditions（段階実行またはパイプライン実行）
+    - 同じ出力先シート（ws_name）の条件は必ず同じプロセスで元の順番どおりに処理するため、
+      シートごとの書き込み順は単一プロセス実行と同じになる
+    - 1プロセスの失敗は他のプロセスに影響しない（失敗したシャードのシート名を集計に残す）
+    - レート制御はプロセスごとに持つため、開始・上限速度をプロセス数で割ってサイト全体の負荷を保つ
+      （Sheets APIの1分あたり予算も同様にプロセス数で割る）
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, config: Config, workers: int = 0):
+        """
+        コンストラクタ
+        :param config: 各プロセスに渡す設定
+        :param workers: ワーカープロセス数（0以下ならCPUコア数）
+        """
+        self.config = config
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.summary: Dict[str, Any] = {}  # 直近runの合算集計
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def shard(self, conditions: List[Any]) -> List[List[SearchCondition]]:
+        """
+        出力先シート単位で条件をまとめ、件数が均等になるようワーカー数以下のシャードへ振り分ける
+        （シート内の条件順は維持し、同じ入力なら常に同じ振り分けになる）
+        dictの行は元の位置の行番号を付けた SearchCondition にしてから振り分ける（ログの「N行目」を元の行に合わせるため）
+        """
+        groups: "OrderedDict[str, List[SearchCondition]]" = OrderedDict()
+        for number, condition in enumerate(conditions, start=2):
+            if not isinstance(condition, SearchCondition):
+                condition = SearchCondition.from_record(number, condition)
+            ws_name = str(condition.get("ws_name", self.config.DATA_OUTPUT_SHEET))
+            groups.setdefault(ws_name, []).append(condition)
+
+        shard_count = min(self.workers, len(groups))
+        shards: List[List[SearchCondition]] = [[] for _ in range(shard_count)]
+        # 条件数の多いシートから、その時点で最も少ないシャードへ割り当てる（同数なら出現順・番号順）
+        ordered = sorted(enumerate(groups.values()), key=lambda pair: (-len(pair[1]), pair[0]))
+        for _, group in ordered:
+            target = min(range(shard_count), key=lambda i: (len(shards[i]), i))
+            shards[target].extend(group)
+        return [shard for shard in shards if shard]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _worker_values(self, shard_count: int) -> Dict[str, Any]:
+        """
+        ワーカープロセス用の設定値を作る
+        """
+        values = _config_values(self.config)
+        values["PARALLEL_WORKERS"] = 1        # ワーカー内で更に分割しない
+        values["RESUME"] = True               # 途中経過のリセットは親プロセスで1回だけ行う
+        values["PARQUET_COMPACT"] = False     # Parquetのコンパクションは全シャード終了後に親プロセスで1回だけ行う
+        values["RATE_INITIAL"] = self.config.RATE_INITIAL / shard_count
+        values["RATE_MAX"] = self.config.RATE_MAX / shard_count
+        values["RATE_MIN"] = min(self.config.RATE_MIN, values["RATE_INITIAL"])
+        # Sheets APIのクォータはプロセスをまたいで共通なので予算も分け合う
+        values["SHEETS_REQUESTS_PER_MINUTE"] = max(1, self.config.SHEETS_REQUESTS_PER_MINUTE // shard_count)
+        return values
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def run(self, conditions: List[Any]) -> Dict[str, Any]:
+        """
+        条件をシャードに分けて並列処理し、各プロセスの集計を合算して返す
+        :return: MainFlow.summaryの各項目の合計 ＋ {"shards", "failed_shards", "failed_sheets", "seconds"}
+        """
+        shards = self.shard(conditions)
+        summary: Dict[str, Any] = {"shards": len(shards), "failed_shards": 0, "failed_sheets": [], "seconds": 0.0}
+        if not shards:
+            self.summary = summary
+            return summary
+
+        values = self._worker_values(len(shards))
+        started = time.monotonic()
+        # fork後のChrome・SQLite接続の共有を避けるためspawnで起動する
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor:
+            futures = [executor.submit(_run_shard, values, shard) for shard in shards]
+            for number, (shard, future) in enumerate(zip(shards, futures), start=1):
+                sheets = sorted({str(c.get("ws_name", self.config.DATA_OUTPUT_SHEET)) for c in shard})
+                try:
+                    result = future.result()
+                except Exception as e:
+                    summary["failed_shards"] += 1
+                    summary["failed_sheets"].extend(sheets)
+                    logger.error(f"シャード{number}（シート={sheets}）の処理に失敗: {e}")
+                    continue
+                for name, value in result.items():
+                    summary[name] = summary.get(name, 0) + value
+                logger.info(f"シャード{number}（シート={sheets}）完了: {result}")
+
+        summary["seconds"] = time.monotonic() - started
+        self.summary = summary
+        logger.info(
+            f"並列実行完了: {len(shards)}プロセス | {summary['seconds']:.1f}秒 | 条件={summary.get('conditions', 0)}件 | "
+            f"抽出={summary.get('extracted', 0)}件 | 書込={summary.get('rows_written', 0)}行 | "
+            f"失敗シャード={summary['failed_shards']}件"
+        )
+        return summary
+# **********************************************************************************
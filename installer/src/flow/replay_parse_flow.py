@@ -0,0 +1,76 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import time                                                          # 処理時間計測用
+import logging                                                       # ログ出力用
+from collections import Counter                                      # 欠損項目の集計
+from typing import Any, Dict, Optional                               # 型ヒント用
+
+from installer.src.flow.base.page_archive import PageArchive         # 保存済みページの読み出し
+from installer.src.flow.base.html_parser import HtmlParser           # 一覧・詳細ページの解析
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class ReplayParseFlow:
+    """
+    ページアーカイブに保存済みのHTMLに対してパーサを再実行し、抽出結果と速度を集計するフロークラス
+
+    - ネットワーク・ブラウザを使わないため、数千ページでも数秒で回せる
+    - セレクタ変更時に、どの項目が何ページで取れなくなったか（欠損件数）を確認できる
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, archive: PageArchive, parser: Optional[HtmlParser] = None):
+        """
+        コンストラクタ
+        :param archive: 保存済みページを読み出すアーカイブ
+        :param parser: 再実行するパーサ（省略時は新規生成）
+        """
+        self.archive = archive
+        self.parser = parser or HtmlParser()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def run(self, kind: str = "detail") -> Dict[str, Any]:
+        """
+        指定種別の保存済みページを全件解析し、統計を返す
+        :param kind: "detail"（詳細ページ）または "list"（一覧ページ）
+        :return: {"pages", "seconds", "pages_per_sec", "missing": {項目名: 件数}, "failed"}
+        """
+        missing = Counter()
+        pages = 0
+        failed = 0
+        parse_seconds = 0.0
+        for url, html in self.archive.iter_pages(kind):
+            pages += 1
+            started = time.perf_counter()
+            try:
+                if kind == "detail":
+                    fields = self.parser.parse_detail_page(html, base_url=url)
+                    missing.update(HtmlParser.missing_fields(fields))
+                else:
+                    items = self.parser.parse_list_items(html, base_url=url)["items"]
+                    if not items:
+                        missing["items"] += 1
+            except Exception as e:
+                failed += 1
+                logger.warning(f"再解析失敗: {url} | {e}")
+            finally:
+                parse_seconds += time.perf_counter() - started
+
+        stats = {
+            "pages": pages,
+            "seconds": parse_seconds,
+            "pages_per_sec": pages / parse_seconds if parse_seconds > 0 else 0.0,
+            "missing": dict(missing),
+            "failed": failed,
+        }
+        logger.info(
+            f"アーカイブ再解析({kind}): {pages}ページ | {parse_seconds:.2f}秒 | "
+            f"{stats['pages_per_sec']:.1f} pages/sec | 欠損={stats['missing']} | 失敗={failed}件"
+        )
+        return stats
+# **********************************************************************************
@@ -0,0 +1,130 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import logging                                                   # ログ出力用
+import threading                                                 # 抽出ワーカーからの呼び出しを直列化
+from typing import Any, Dict, List, Optional, Set                # 型ヒント用
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+
+# **********************************************************************************
+# class定義
+class StreamingWriteFlow:
+    """
+    段階実行（PIPELINE_MODE=False）で、詳細の抽出結果が届くたびに各条件の出力先シートへ順次書き込むフロークラス
+
+    - 詳細抽出の前に全条件の書き込み先（MainFlow.open_plan_sink）を開き、条件ごとに詳細URL順の位置（カーソル）を持つ
+    - 抽出結果（または抽出失敗）が届くと、そのキーを参照する条件のカーソルを、解決済みのキーが続く限り進めて行を追加する
+      （条件内の行は詳細URL順のまま）
+    - 抽出結果は、参照する全条件のカーソルが通過した時点で手放す（保持するのは順番待ちの分だけ）
+    - 詳細抽出のワーカースレッドから呼ばれるため、状態の更新は1つのロックで直列化する
+    """
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(self, main_flow, plans: List[Dict[str, Any]]):
+        """
+        コンストラクタ
+        :param main_flow: 書き込み先の開閉・行の追加を提供するMainFlow
+        :param plans: MainFlow.plan_conditions の実行計画（"crawl" の詳細URL順に書き込む）
+        """
+        self.main_flow = main_flow
+        self.plans = plans
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []                # 書き込み中の条件（plan, sink, keys, cursor）
+        self._waiting: Dict[str, List[Dict[str, Any]]] = {}     # 重複判定キー → そのキーを参照する条件
+        self._refs: Dict[str, int] = {}                         # 重複判定キー → カーソルがまだ通過していない参照数
+        self._records: Dict[str, Dict[str, Any]] = {}           # 重複判定キー → 順番待ちの抽出結果
+        self._failed: Set[str] = set()                          # 抽出に失敗した（行を書かない）重複判定キー
+        self.stats = {"max_buffered": 0}
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def open(self) -> None:
+        """
+        全条件の書き込み先を開く（書き込み済み・準備に失敗した条件は書き込み対象にしない）
+        """
+        flow = self.main_flow
+        for plan in self.plans:
+            try:
+                sink = flow.open_plan_sink(plan)
+            except Exception as e:
+                flow.summary["write_failures"] += 1
+                flow.logger.error(f"{plan['idx']+1}行目: 書き込み準備失敗: {e}")
+                continue
+            if sink is None:
+                continue
+            entry = {"plan": plan, "sink": sink, "keys": [flow.dedup_key(url) for url in plan["crawl"]["urls"]], "cursor": 0}
+            self._entries.append(entry)
+            for key in entry["keys"]:
+                self._refs[key] = self._refs.get(key, 0) + 1
+                self._waiting.setdefault(key, []).append(entry)
+            # 抽出結果を待たずに書ける（詳細URLが無い）条件もあるため、先頭まで進めておく
+            self._advance(entry)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def feed(self, key: str, record: Optional[Dict[str, Any]]) -> None:
+        """
+        抽出結果1件を受け取り、そのキーを参照する条件を書ける所まで進める
+        :param record: 抽出結果（抽出に失敗した場合はNone。その行は書かずにカーソルを進める）
+        """
+        with self._lock:
+            if key not in self._refs:
+                return  # 書き込み対象の条件が参照していない（または全条件が通過済みの）キー
+            if record is None:
+                self._failed.add(key)
+            else:
+                self._records[key] = record
+            for entry in self._waiting.get(key, []):
+                self._advance(entry)
+            self.stats["max_buffered"] = max(self.stats["max_buffered"], len(self._records))
+            # 行が届かない条件の溜まった行も、経過時間でフラッシュさせる
+            for entry in self._entries:
+                entry["sink"].poll()
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _advance(self, entry: Dict[str, Any], force: bool = False) -> None:
+        """
+        カーソル位置のキーが解決済みである限り行を追加して進める（forceなら未解決のキーも失敗扱いで進める）
+        """
+        keys = entry["keys"]
+        while entry["cursor"] < len(keys):
+            key = keys[entry["cursor"]]
+            if key in self._records:
+                self.main_flow.add_plan_row(entry["plan"], entry["sink"], key, self._records[key])
+            elif key not in self._failed and not force:
+                break
+            entry["cursor"] += 1
+            self._release(key)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _release(self, key: str) -> None:
+        """
+        参照数を1つ減らし、全条件が通過したキーの抽出結果を手放す
+        """
+        self._refs[key] -= 1
+        if self._refs[key] == 0:
+            del self._refs[key]
+            self._waiting.pop(key, None)
+            self._records.pop(key, None)
+            self._failed.discard(key)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def close(self) -> None:
+        """
+        届かなかった抽出結果は失敗扱いで残りの行を追加し、全条件の書き込みを完了させる
+        """
+        with self._lock:
+            entries, self._entries = self._entries, []
+            for entry in entries:
+                try:
+                    self._advance(entry, force=True)
+                finally:
+                    self.main_flow.finish_plan_sink(entry["plan"], entry["sink"])
+        logger.debug(f"ストリーミング書き込みフロー: 順番待ちの抽出結果は最大{self.stats['max_buffered']}件")
+# **********************************************************************************
@@ -0,0 +1,180 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import time                                                          # 処理時間計測用
+import uuid                                                          # 計測ごとに別のスプレッドシートIDを使う
+import logging                                                       # ログ出力用
+from typing import Any, Dict, List                                   # 型ヒント用
+
+from installer.src.flow.base.worksheet_backend import LocalSheetsBackend  # 擬似遅延付きのローカルシート
+from installer.src.flow.base.spreadsheet_read import SpreadsheetReader    # シートの取得（バックエンド差し替え）
+from installer.src.flow.base.spreadsheet_write import SpreadsheetWriter   # 書き込み方式の本体
+from installer.src.flow.base.streaming_sink import StreamingSink          # マイクロバッチ書き込み
+from installer.src.flow.base.sheets_api import SheetsApiGate              # API呼び出しの予算・再試行制御
+
+logger = logging.getLogger(__name__)  # このモジュール専用のロガー
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# **********************************************************************************
+# class定義
+class WriteBenchmarkFlow:
+    """
+    ローカルシート（LocalSheetsBackend）に対して書き込み方式ごとの速度・API呼び出し数を計測するフロークラス
+
+    - Google Sheetsのクォータを使わずに、書き込み方式の比較・バッチ行数の調整ができる
+    - 遅延は latency（1呼び出しあたり）・per_row_latency（1行あたり）で本番に近づける
+    - 計測中はSheetsApiGateの予算を無制限にし、方式そのものの差だけを測る（終了後に元へ戻す）
+    - 計測前に差し替えられていた読み書き先（LOCAL_SHEETS_PATH など）も終了後に元へ戻す
+
+    方式:
+    - update_per_batch: バッチごとにA列を全件取得して末尾を求め、update で書く（従来のWriteGssFlow）
+    - append_per_batch: バッチごとに values.append 1回（SpreadsheetWriter.append_rows）
+    - streaming_sink: StreamingSinkで抽出と並行してマイクロバッチを書く（produce_seconds で抽出時間を模擬）
+    """
+
+    STRATEGIES = ("update_per_batch", "append_per_batch", "streaming_sink")
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def __init__(
+        self,
+        rows: int = 2000,
+        batch_rows: int = 100,
+        sheets: int = 4,
+        latency: float = 0.05,
+        per_row_latency: float = 0.0,
+        produce_seconds: float = 0.0
+    ):
+        """
+        コンストラクタ
+        :param rows: 方式ごとに書き込む総行数
+        :param batch_rows: 1バッチの行数
+        :param sheets: 書き込み先のシート数（総行数を均等に振り分ける）
+        :param latency: API呼び出し1回あたりの擬似遅延（秒）
+        :param per_row_latency: 読み書き1行あたりの擬似遅延（秒）
+        :param produce_seconds: 1行を用意するのにかかる時間（抽出処理の模擬。秒）
+        """
+        self.rows = rows
+        self.batch_rows = max(1, batch_rows)
+        self.sheets = max(1, sheets)
+        self.latency = latency
+        self.per_row_latency = per_row_latency
+        self.produce_seconds = produce_seconds
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def sample_rows(self) -> List[List[Any]]:
+        """
+        書き込み用の行を作る（本番と同じく record_row で日付・IMAGE関数を整形）
+        """
+        return [
+            SpreadsheetWriter.record_row({
+                "date": "06/27 22:13",
+                "title": f"天然ダイヤ ルース 0.{i % 1000:03d}ct",
+                "price": 50000 + i,
+                "ct": 0.5,
+                "1ct_price": 100000 + i,
+                "image": f"https://example.invalid/image/{i}.jpg",
+            })
+            for i in range(self.rows)
+        ]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _produce(self, count: int) -> None:
+        if self.produce_seconds > 0:
+            time.sleep(self.produce_seconds * count)
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _batches(self, rows: List[List[Any]]):
+        """
+        (シート番号, バッチ) を、シートを順に回しながら返す
+        """
+        for number, start in enumerate(range(0, len(rows), self.batch_rows)):
+            yield number % self.sheets, rows[start:start + self.batch_rows]
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def run(self, strategies: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        方式ごとに計測し、結果を返す
+        :return: {方式: {"rows", "seconds", "rows_per_sec", "calls", "calls_per_1000_rows", "by_method"}}
+        """
+        rows = self.sample_rows()
+        results = {}
+        previous_gate = SheetsApiGate.shared()
+        previous_backend = SpreadsheetReader.current_backend()
+        SheetsApiGate.configure(requests_per_minute=10 ** 9)
+        try:
+            for strategy in strategies or self.STRATEGIES:
+                results[strategy] = self._measure(strategy, rows)
+        finally:
+            SpreadsheetReader.use_backend(previous_backend)
+            SheetsApiGate.install(previous_gate)
+        return results
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    def _measure(self, strategy: str, rows: List[List[Any]]) -> Dict[str, Any]:
+        """
+        1方式を新しいローカルシートで計測する（シートを開くまでの呼び出しは計測に含めない）
+        """
+        backend = LocalSheetsBackend(latency=self.latency, per_row_latency=self.per_row_latency)
+        SpreadsheetReader.use_backend(backend)
+        spreadsheet_id = f"benchmark-{strategy}-{uuid.uuid4().hex[:8]}"
+        reader = SpreadsheetReader(spreadsheet_id, "bench_0")
+        worksheets = [reader.get_worksheet(f"bench_{i}") for i in range(self.sheets)]
+        for worksheet in worksheets:
+            worksheet.update("A1", [SpreadsheetWriter.RECORD_KEYS])  # ヘッダー行
+        calls_before = backend.stats["calls"]
+        by_method_before = dict(backend.stats["by_method"])
+
+        writer = SpreadsheetWriter()
+        started = time.perf_counter()
+        if strategy == "update_per_batch":
+            for sheet, batch in self._batches(rows):
+                self._produce(len(batch))
+                worksheet = worksheets[sheet]
+                start_row = len(worksheet.col_values(1)) + 1
+                worksheet.update(f"A{start_row}", batch, value_input_option="USER_ENTERED")
+        elif strategy == "append_per_batch":
+            for sheet, batch in self._batches(rows):
+                self._produce(len(batch))
+                writer.append_rows(batch, worksheets[sheet])
+        elif strategy == "streaming_sink":
+            sinks = [
+                StreamingSink(lambda items, ws=worksheet: writer.append_rows(items, ws), batch_rows=self.batch_rows, flush_seconds=0)
+                for worksheet in worksheets
+            ]
+            for sheet, batch in self._batches(rows):
+                for row in batch:
+                    self._produce(1)
+                    sinks[sheet].add(row)
+            for sink in sinks:
+                sink.close()
+        else:
+            raise ValueError(f"未知の書き込み方式です: {strategy}")
+        seconds = time.perf_counter() - started
+
+        calls = backend.stats["calls"] - calls_before
+        by_method = {
+            name: count - by_method_before.get(name, 0)
+            for name, count in backend.stats["by_method"].items()
+            if count - by_method_before.get(name, 0)
+        }
+        written = sum(len(ws.col_values(1)) - 1 for ws in worksheets)
+        result = {
+            "rows": written,
+            "seconds": seconds,
+            "rows_per_sec": written / seconds if seconds > 0 else 0.0,
+            "calls": calls,
+            "calls_per_1000_rows": calls * 1000 / written if written else 0.0,
+            "by_method": by_method,
+        }
+        logger.info(
+            f"書き込み計測[{strategy}]: {written}行 | {seconds:.2f}秒 | {result['rows_per_sec']:.0f} rows/sec | "
+            f"API呼び出し={calls}回（1000行あたり{result['calls_per_1000_rows']:.1f}回） | 内訳={by_method}"
+        )
+        backend.close()
+        return result
+# **********************************************************************************
@@ -2,6 +2,9 @@
 # import
 import logging  # ログ出力用（エラーや進捗管理、デバッグに必須）
 
+from installer.src.flow.base.spreadsheet_write import SpreadsheetWriter  # まとめ書き込み（USER_ENTERED）
+from installer.src.flow.base.sheets_api import SheetsApiGate            # API呼び出しの予算・再試行制御
+
 logger = logging.getLogger(__name__)  # このファイル専用のロガーを取得
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
 
@@ -20,14 +23,15 @@ class WriteGssFlow:
     def format_image_formula(self, url):
         # Google SheetsのIMAGE関数を作る（セルに画像を埋め込む用途。サイズ指定あり）
         # =IMAGE("画像URL", 4, 80, 80) → 4はカスタムサイズ指定、80x80px
-        return f'=IMAGE("{url}", 4, 80, 80)'
+        return SpreadsheetWriter.format_image_formula(url)
 
     # ------------------------------------------------------------------------------
     # 関数定義
     def find_first_empty_row(self):
+        # ※A列全体を取得するため書き込みでは使わない（runはappendで末尾に追記する）
         # シートのA列（1列目）を上から順にチェックし、最初に空になる行番号を返す
         # col_values(1)でA列の全値をリスト取得。既存行数+1が最初の空行
-        values = self.worksheet.col_values(1)
+        values = SheetsApiGate.shared().call("col_values", self.worksheet.col_values, 1)
         return len(values) + 1
 
     # ------------------------------------------------------------------------------
@@ -53,9 +57,9 @@ class WriteGssFlow:
         # このフローの実行本体。渡されたレコードリストをシートにまとめて書き込む
         logger.info("WriteGssFlow: データの書き込みフローを開始します")
         write_list = self.build_write_list(records)  # まずデータを2次元リストに変換
-        start_row = self.find_first_empty_row()      # 書き込み開始位置（A列の一番下）を特定
-        start_cell = f"A{start_row}"                 # "A5" のような開始セル文字列
-        # 指定セルから下に向かってwrite_listを書き込む（value_input_option="USER_ENTERED"で式も有効）
-        self.worksheet.update(start_cell, write_list, value_input_option="USER_ENTERED")
+        # シート末尾へ1回のAPI呼び出しで追記する（USER_ENTEREDで式も有効。末尾行の取得呼び出しは不要）
+        writer = SpreadsheetWriter(self.worksheet)
+        writer.append_rows(write_list)
+        writer.log_stats()
         logger.info(f"スプレッドシート書き込み成功: {len(write_list)}件")
 # **********************************************************************************
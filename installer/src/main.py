@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+import argparse
 
 # --------------------------------------------------------------
 # プロジェクトルートのパスをsys.pathへ追加
@@ -18,6 +19,9 @@ sys.path.insert(
 # Config  ：設定情報を保持するクラス
 # --------------------------------------------------------------
 from installer.src.flow.main_flow import MainFlow, Config
+# ReplayParseFlow：保存済みページに対してパーサだけを再実行するフロー（--replay-parse）
+from installer.src.flow.replay_parse_flow import ReplayParseFlow
+from installer.src.flow.base.page_archive import PageArchive
 
 # --------------------------------------------------------------
 # ログ出力の設定（INFO以上をコンソールに出力）
@@ -25,13 +29,60 @@ from installer.src.flow.main_flow import MainFlow, Config
 # --------------------------------------------------------------
 logging.basicConfig(level=logging.INFO)
 
-def main():
+def parse_args(argv=None):
+    """
+    コマンドライン引数を解析する
+    --resume: 前回中断した実行の途中経過（チェックポイント）から再開する
+    --workers: 検索条件を振り分けるワーカープロセス数（省略時はConfig.PARALLEL_WORKERS）
+    --replay-parse: 収集はせず、ページアーカイブの保存済みページをパーサで再解析して統計を出す
+    --archive-dir: 再解析するページアーカイブ（省略時はConfig.ARCHIVE_DIR、未設定ならPageArchiveの既定）
+    """
+    parser = argparse.ArgumentParser(description="Yahoo!オークション落札済み商品情報の収集")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="前回中断した実行の途中経過から再開する（巡回済み一覧・抽出済み詳細・書き込み済み条件を取り直さない）"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="検索条件を出力先シート単位で振り分けるワーカープロセス数（1なら単一プロセス）"
+    )
+    parser.add_argument(
+        "--replay-parse",
+        choices=["detail", "list"],
+        default=None,
+        help="収集はせず、保存済みの詳細（detail）/一覧（list）ページをパーサで再解析し、速度と欠損項目を出力する"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=None,
+        help="--replay-parse で読むページアーカイブのディレクトリ"
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Yahoo!オークション落札済み商品情報の
     収集フローを起動するエントリーポイント関数
     """
+    args = parse_args(argv)
     # 設定情報の取得（Configインスタンス生成）
     config = Config()
+    # 再解析指定があれば、ネットワーク・ブラウザを使わずにアーカイブだけを解析して終わる
+    if args.replay_parse:
+        archive_dir = args.archive_dir or config.ARCHIVE_DIR
+        archive = PageArchive(archive_dir, replay=True) if archive_dir else PageArchive(replay=True)
+        try:
+            ReplayParseFlow(archive).run(args.replay_parse)
+        finally:
+            archive.close()
+        return
+    # 再開指定があれば前回の途中経過を消さずに使う
+    config.RESUME = args.resume
+    if args.workers is not None:
+        config.PARALLEL_WORKERS = args.workers
     # 情報収集フローのインスタンス生成
     flow = MainFlow(config)
     # 情報収集フローを実行
@@ -2,6 +2,7 @@
 # import
 import re                           # 正規表現（ct直前の数値を抜き出すために使用）
 import logging                      # ログ出力（エラーや進捗を残す用途）
+from typing import Optional         # 型ヒント用
 logger = logging.getLogger(__name__) # このモジュール専用のロガーインスタンス取得
 # $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
 
@@ -48,4 +49,34 @@ class NumExtractor:
             # 何らかの例外時は詳細をログ出力し、再度例外として上位に伝播
             logger.error(f"ct数値抽出エラー: {e} | text='{text}'")
             raise
-# **********************************************************************************
\ No newline at end of file
+
+
+# **********************************************************************************
+# class定義
+class AuctionIdExtractor:
+    """
+    Yahoo!オークションの商品URLからオークションID（例: "x1234567890"）を抽出するユーティリティクラス
+    - 静的メソッドで提供
+    """
+
+    # 「/auction/」直後の英数字をIDとみなす（例: https://auctions.yahoo.co.jp/jp/auction/x1234567890）
+    PATTERN = re.compile(r'/auction/([A-Za-z0-9]+)')
+
+    # ------------------------------------------------------------------------------
+    # 関数定義
+    @staticmethod
+    def extract(url: str) -> Optional[str]:
+        """
+        商品URLからオークションIDを抽出して返す（見つからなければNone）
+
+        Args:
+            url (str): 商品詳細ページのURL
+
+        Returns:
+            Optional[str]: オークションID
+        """
+        if not url:
+            return None
+        match = AuctionIdExtractor.PATTERN.search(url)
+        return match.group(1) if match else None
+# **********************************************************************************
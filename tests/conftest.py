@@ -0,0 +1,8 @@
+import os
+import sys
+
+# --------------------------------------------------------------
+# プロジェクトルートのパスをsys.pathへ追加
+# （installer/src/main.py と同じく installer.src.flow... の形でimportできるようにする）
+# --------------------------------------------------------------
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,160 @@
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$%$$$$$$$$$$$$$$$$$$$
+# import
+import os                  # フィクスチャのパス解決
+import shutil              # Chrome本体の有無の確認
+
+import pytest              # テストランナー
+
+from installer.src.flow.base.html_parser import HtmlParser  # HTTP取得時のlxmlパーサ
+# $$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$
+
+# 保存済みの一覧・詳細ページHTML
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+LIST_URL = "https://auctions.yahoo.co.jp/closedsearch/closedsearch?p=%E3%83%80%E3%82%A4%E3%83%A4&b=1&n=50"
+DETAIL_URL = "https://auctions.yahoo.co.jp/jp/auction/x1000000001"
+FALLBACK_DETAIL_URL = "https://auctions.yahoo.co.jp/jp/auction/w2000000002"
+
+# 各フィクスチャでSeleniumの取得メソッド（get_list_items / get_detail_fields）が返す値
+# （リンク・画像URLはブラウザと同じくページURLで絶対URLに解決される。URLの無いカードは除外）
+EXPECTED_LIST_ITEMS = [
+    {
+        "url": "https://auctions.yahoo.co.jp/jp/auction/x1000000001",
+        "auction_id": "x1000000001",
+        "end_time": "06/27 22:13",
+        "title": "ダイヤモンド リング 1.02ct Pt900",
+        "price": 51700,
+    },
+    {
+        "url": "https://auctions.yahoo.co.jp/jp/auction/w2000000002",
+        "auction_id": "w2000000002",
+        "end_time": "06/26 21:05",
+        "title": "ダイヤ ネックレス 0.5ct K18",
+        "price": 12000,
+    },
+    {
+        "url": "https://auctions.yahoo.co.jp/jp/auction/b3000000003",
+        "auction_id": "b3000000003",
+        "end_time": "06/25 20:00",
+        "title": "ルース 0.3ct 鑑定書付",
+        "price": None,
+    },
+]
+EXPECTED_NEXT_URL = (
+    "https://auctions.yahoo.co.jp/closedsearch/closedsearch?p=%E3%83%80%E3%82%A4%E3%83%A4&b=51&n=50"
+)
+EXPECTED_DETAIL_FIELDS = {
+    "detail_page.html": {
+        "title": "ダイヤモンド リング 1.02ct Pt900",
+        "price": 51700,
+        "image_url": (
+            "https://auc-pctr.c.yimg.jp/i/auctions.c.yimg.jp/images.auctions.yahoo.co.jp/image/"
+            "dr000/auc0000/users/0000/i-img1200x900-1000000001.jpg"
+        ),
+        "end_date": "7月6日（日）22時8分 終了",
+    },
+    "detail_page_fallback_image.html": {
+        "title": "ダイヤ ネックレス 0.5ct K18",
+        "price": 1200000,
+        "image_url": "https://auctions.yahoo.co.jp/image/dr000/auc0000/users/0000/i-img600x450-2000000002.jpg",
+        "end_date": "6月26日（木）21時5分 終了",
+    },
+}
+DETAIL_PAGES = {"detail_page.html": DETAIL_URL, "detail_page_fallback_image.html": FALLBACK_DETAIL_URL}
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def load_fixture(name: str) -> str:
+    """
+    フィクスチャのHTMLを文字列で読み込む
+    """
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def test_parse_list_items_matches_selenium_fields():
+    parsed = HtmlParser().parse_list_items(load_fixture("list_page.html"), base_url=LIST_URL)
+    assert parsed["items"] == EXPECTED_LIST_ITEMS
+    assert parsed["next_url"] == EXPECTED_NEXT_URL
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def test_parse_list_page_pairs_end_dates_and_urls():
+    parsed = HtmlParser().parse_list_page(load_fixture("list_page.html"), base_url=LIST_URL)
+    # リンクの無いカードも終了日時は拾う（get_auction_end_dates / get_auction_urls と同じ）
+    assert parsed["end_dates"] == [item["end_time"] for item in EXPECTED_LIST_ITEMS] + ["06/24 19:00"]
+    assert parsed["urls"] == [item["url"] for item in EXPECTED_LIST_ITEMS]
+    assert parsed["next_url"] == EXPECTED_NEXT_URL
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+@pytest.mark.parametrize("name", sorted(DETAIL_PAGES))
+def test_parse_detail_page_matches_selenium_fields(name):
+    fields = HtmlParser().parse_detail_page(load_fixture(name), base_url=DETAIL_PAGES[name])
+    assert fields == EXPECTED_DETAIL_FIELDS[name]
+    assert HtmlParser.missing_fields(fields) == []
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def test_parse_detail_page_reports_missing_fields():
+    fields = HtmlParser().parse_detail_page("<html><body><h1>無関係なページ</h1></body></html>", base_url=DETAIL_URL)
+    assert HtmlParser.missing_fields(fields) == list(HtmlParser.REQUIRED_DETAIL_FIELDS)
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+def _chrome_available() -> bool:
+    return any(shutil.which(name) for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"))
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+@pytest.fixture
+def replay_selenium(tmp_path):
+    """
+    フィクスチャを保存したページアーカイブを再生モードで読むSelenium（ヘッドレスChrome）を返す
+    （再生時は元のURLを<base>に持つため、リンク・画像URLはHTTP取得時と同じURLで解決される）
+    """
+    from installer.src.flow.base.chrome import Chrome
+    from installer.src.flow.base.page_archive import PageArchive
+    from installer.src.flow.base.selenium_manager import Selenium
+
+    recorder = PageArchive(str(tmp_path))
+    recorder.save(LIST_URL, load_fixture("list_page.html"))
+    for name, url in DETAIL_PAGES.items():
+        recorder.save(url, load_fixture(name))
+    recorder.close()
+
+    archive = PageArchive(str(tmp_path), replay=True)
+    driver = Chrome.get_driver()
+    try:
+        yield Selenium(driver, archive=archive)
+    finally:
+        driver.quit()
+        archive.close()
+
+
+# ------------------------------------------------------------------------------
+# 関数定義
+@pytest.mark.skipif(not _chrome_available(), reason="Chromeがインストールされていない")
+def test_selenium_getters_match_parser(replay_selenium):
+    parser = HtmlParser()
+
+    replay_selenium.get(LIST_URL)
+    assert replay_selenium.get_list_items() == parser.parse_list_items(
+        load_fixture("list_page.html"), base_url=LIST_URL
+    )["items"] == EXPECTED_LIST_ITEMS
+
+    for name, url in DETAIL_PAGES.items():
+        replay_selenium.get(url)
+        fields = replay_selenium.get_detail_fields()
+        assert fields == parser.parse_detail_page(load_fixture(name), base_url=url) == EXPECTED_DETAIL_FIELDS[name]
+        # 項目ごとの取得メソッドも同じ値を返す
+        assert replay_selenium.get_item_info() == {key: fields[key] for key in ("title", "price", "image_url")}
+        assert replay_selenium.get_detail_end_date() == fields["end_date"]